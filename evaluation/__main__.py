@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from evaluation.benchmarks import BENCHMARKS, MEMORY_SIZES
+from evaluation.experiment_matrix import MATRIX_SPEC
+from evaluation.invocation_table import ARCHITECTURES, RUN_TYPES
+from evaluation.outliers import METHODS as OUTLIER_METHODS, NOISY_CI_WIDTH
+from evaluation.recommender import COLD_FRACTION, LATENCY_QUANTILE
+from evaluation.render_figures import FIGURE_FORMATS, FIGURE_JOBS, _run_job, configure_output, render_figures
+from evaluation.repetition_planner import CONFIG_DIR, MIN_DIFFERENCE, POWER
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _configure(args):
+    """Set up figure output; only the commands that render figures import matplotlib."""
+    if args.headless:
+        # Set before anything imports matplotlib.pyplot, so no interactive backend is ever loaded.
+        os.environ["MPLBACKEND"] = "Agg"
+        os.environ["EVALUATION_SHOW_FIGURES"] = "0"
+    os.environ["EVALUATION_FIGURE_FORMAT"] = args.format
+    os.environ["EVALUATION_FIGURE_DPI"] = str(args.dpi)
+    os.environ["EVALUATION_EXCLUDE_OUTLIERS"] = "1" if args.exclude_outliers else "0"
+    os.environ["EVALUATION_OUTLIER_METHOD"] = args.outlier_method
+    configure_output(args.format, args.dpi, args.benchmarks, not args.headless, args.exclude_outliers,
+                     args.outlier_method)
+
+
+def _selected_benchmarks(args):
+    return list(BENCHMARKS) if args.benchmarks is None else args.benchmarks
+
+
+def missing_inputs(input_root, benchmarks):
+    missing = []
+    for benchmark in benchmarks:
+        for arch in ARCHITECTURES:
+            missing.append(os.path.join(input_root, "perf", f"result_{arch}_{benchmark}.csv"))
+            missing.extend(
+                os.path.join(input_root, "cost", benchmark, arch, f"{run_type}_results_{memory}-processed.json")
+                for memory in MEMORY_SIZES[benchmark] for run_type in RUN_TYPES
+            )
+    return [path for path in missing if not os.path.exists(path)]
+
+
+def _invocation_table(args, benchmarks):
+    if args.input_archive is not None:
+        from evaluation.results_archive import archive_invocation_table
+        return archive_invocation_table(args.input_archive, benchmarks)
+
+    from evaluation.invocation_table import build_invocation_table
+    return build_invocation_table(os.path.join(args.input_root, "perf"), os.path.join(args.input_root, "cost"),
+                                  benchmarks)
+
+
+def ingest(args):
+    from evaluation.invocation_cache import ingest_cost_results
+    ingested = ingest_cost_results(os.path.join(args.input_root, "cost"), benchmarks=_selected_benchmarks(args))
+    return {"ingested": len(ingested)}
+
+
+def summarize(args):
+    from evaluation.summaries import write_summaries
+
+    benchmarks = _selected_benchmarks(args)
+    table = _invocation_table(args, benchmarks)
+    return {"tables": write_summaries(table, os.path.join(args.output_root, "tables"), benchmarks,
+                                      args.include_mislabelled, args.exclude_outliers, args.outlier_method)}
+
+
+def plot(args):
+    output_dir = os.path.join(args.output_root, "figures")
+    if args.headless:
+        timings = render_figures(output_dir, args.figures, args.workers, args.input_root, args.format, args.dpi,
+                                 args.benchmarks, args.exclude_outliers, args.outlier_method)
+    else:
+        # Interactive runs show every figure in turn, so they stay in this process.
+        os.makedirs(output_dir, exist_ok=True)
+        timings = dict(_run_job(job, args.input_root, output_dir)
+                       for job in FIGURE_JOBS if args.figures is None or job.name in args.figures)
+    return {"figures": {name: round(seconds, 3) for name, seconds in timings.items()}}
+
+
+def recommend(args):
+    from evaluation.recommender import recommendations
+
+    benchmarks = _selected_benchmarks(args)
+    table = _invocation_table(args, benchmarks)
+    ranked = recommendations(table, benchmarks, args.slo_ms, args.quantile, args.cold_fraction, args.total_cost)
+    path = os.path.join(args.output_root, "tables", "recommendations.csv")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    ranked.to_csv(path, index=False)
+    best = ranked[ranked["rank"] == 1]
+    return {"recommendations": path,
+            "best": {row.benchmark: f"{row.architecture} {row.memory} MB" + ("" if row.feasible else " (misses SLO)")
+                     for row in best.itertuples()}}
+
+
+def plan(args):
+    from evaluation.repetition_planner import plan_repetitions, write_plan
+
+    benchmarks = _selected_benchmarks(args)
+    table = _invocation_table(args, benchmarks)
+    repetitions = plan_repetitions(table, ci_width=args.ci_width, min_difference=args.min_difference,
+                                   power=args.power)
+    output_dir = os.path.join(args.output_root, "plan")
+    configs = write_plan(repetitions, output_dir, args.config_dir)
+    return {"plan": os.path.join(output_dir, "repetition_plan.csv"), "configs": len(configs),
+            "invocations": {"current": int(repetitions["current_repetitions"].sum()),
+                            "planned": int(repetitions["repetitions"].sum())}}
+
+
+def matrix(args):
+    from evaluation.experiment_matrix import estimate_matrix, load_measurements, load_spec, write_matrix
+
+    spec = load_spec(args.spec)
+    estimates = estimate_matrix(spec, load_measurements(spec, os.path.join(args.input_root, "perf"),
+                                                        os.path.join(args.input_root, "cost")))
+    output_dir = os.path.join(args.output_root, "matrix")
+    configs = write_matrix(spec, estimates, output_dir)
+    return {"estimates": os.path.join(output_dir, "estimates.csv"), "configs": len(configs),
+            "unestimated": int(estimates["cost_usd"].isna().sum()),
+            "total": {"wall_seconds": round(float(estimates["wall_seconds"].sum()), 1),
+                      "gb_seconds": round(float(estimates["gb_seconds"].sum()), 1),
+                      "cost_usd": round(float(estimates["cost_usd"].sum()), 4)}}
+
+
+def report(args):
+    results = {}
+    for step in [ingest, summarize, plot]:
+        start = time.perf_counter()
+        results[step.__name__] = step(args)
+        results[step.__name__]["seconds"] = round(time.perf_counter() - start, 3)
+
+    with open(os.path.join(args.output_root, "report.json"), "w") as f:
+        json.dump(dict(results, benchmarks=_selected_benchmarks(args), format=args.format), f, indent=2)
+    return results
+
+
+COMMANDS = {
+    "ingest": (ingest, "Cache the processed SeBS results as columnar arrays"),
+    "summarize": (summarize, "Write the summary tables"),
+    "plot": (plot, "Render the figures"),
+    "recommend": (recommend, "Rank architecture and memory options per benchmark under a latency SLO"),
+    "plan": (plan, "Plan the repetitions of every experiment cell and write per-memory-size SeBS configs"),
+    "matrix": (matrix, "Write the SeBS configs of an experiment matrix and estimate its time and cost"),
+    "report": (report, "Ingest, summarize and plot, then write report.json"),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m evaluation", description="Evaluate the ARM and x86 results.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, description) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=description, description=description)
+        subparser.add_argument("--headless", action="store_true",
+                               help="Never load an interactive backend or show figures; render in parallel")
+        subparser.add_argument("--input-root", default=EVALUATION_DIR,
+                               help="Directory containing the 'cost' and 'perf' results (default: %(default)s)")
+        subparser.add_argument("--output-root", default="evaluation-output",
+                               help="Directory tables and figures are written to (default: %(default)s)")
+        subparser.add_argument("--benchmarks", nargs="+", help="Only evaluate the given benchmarks")
+        if name in ("summarize", "recommend", "plan"):
+            subparser.add_argument("--input-archive",
+                                   help="Read the results from a SeBS results zip instead of --input-root, "
+                                        "without extracting it")
+        subparser.add_argument("--format", choices=FIGURE_FORMATS, default="pdf", help="Figure file format")
+        subparser.add_argument("--dpi", type=int, default=300, help="Resolution of raster figures")
+        if name in ("plot", "report"):
+            subparser.add_argument("--figures", nargs="+", choices=[job.name for job in FIGURE_JOBS],
+                                   help="Only render the given figures")
+            subparser.add_argument("--workers", type=int, default=None,
+                                   help="Number of worker processes in headless mode")
+        if name in ("summarize", "report"):
+            subparser.add_argument("--include-mislabelled", action="store_true",
+                                   help="Keep invocations whose cold/warm label contradicts their container's "
+                                        "lifecycle in the summaries")
+        if name in ("summarize", "plot", "report"):
+            subparser.add_argument("--exclude-outliers", action="store_true",
+                                   help="Leave invocations far from the rest of their cell out of the summaries "
+                                        "and figures")
+            subparser.add_argument("--outlier-method", choices=OUTLIER_METHODS, default="mad",
+                                   help="Median/MAD modified z-score or Tukey IQR fence")
+        if name == "recommend":
+            subparser.add_argument("--slo-ms", type=float, default=None, help="Client-time SLO in milliseconds")
+            subparser.add_argument("--quantile", type=float, default=LATENCY_QUANTILE,
+                                   help="Latency quantile the SLO applies to")
+            subparser.add_argument("--cold-fraction", type=float, default=COLD_FRACTION,
+                                   help="Share of invocations that are cold starts")
+            subparser.add_argument("--total-cost", action="store_true", help="Include the per-request fee")
+        if name == "plan":
+            subparser.add_argument("--ci-width", type=float, default=NOISY_CI_WIDTH,
+                                   help="Target width of the CI of each cell's mean, relative to the mean")
+            subparser.add_argument("--min-difference", type=float, default=MIN_DIFFERENCE,
+                                   help="Smallest relative ARM/x86 difference in means to detect")
+            subparser.add_argument("--power", type=float, default=POWER,
+                                   help="Probability of detecting that difference")
+            subparser.add_argument("--config-dir", default=CONFIG_DIR,
+                                   help="Directory of the SeBS configs used as templates (default: %(default)s)")
+        if name == "matrix":
+            subparser.add_argument("--spec", default=MATRIX_SPEC,
+                                   help="Experiment matrix spec (default: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.input_root = os.path.abspath(args.input_root)
+    args.output_root = os.path.abspath(args.output_root)
+    args.figures = getattr(args, "figures", None)
+    args.workers = getattr(args, "workers", None)
+    args.input_archive = getattr(args, "input_archive", None)
+    if args.input_archive is not None:
+        args.input_archive = os.path.abspath(args.input_archive)
+    if args.command == "recommend" and (not 0 <= args.cold_fraction <= 1 or not 0 < args.quantile < 1):
+        parser.error("--cold-fraction must be in [0, 1] and --quantile in (0, 1)")
+
+    if args.command in ("plot", "report"):
+        _configure(args)
+
+    unknown = set(args.benchmarks or []) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    if args.input_archive is not None:
+        from evaluation.results_archive import missing_archive_members
+
+        if not os.path.isfile(args.input_archive):
+            parser.error(f"No such archive: {args.input_archive}")
+        missing = missing_archive_members(args.input_archive, _selected_benchmarks(args), MEMORY_SIZES)
+        source = args.input_archive
+    else:
+        missing = [os.path.relpath(path, args.input_root)
+                   for path in missing_inputs(args.input_root, _selected_benchmarks(args))]
+        source = args.input_root
+    if missing:
+        print(f"Missing {len(missing)} input files in {source}:", file=sys.stderr)
+        for path in missing[:20]:
+            print(f"  {path}", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.output_root, exist_ok=True)
+    start = time.perf_counter()
+    result = COMMANDS[args.command][0](args)
+    print(json.dumps(result, indent=2, default=str))
+    print(f"{args.command} finished in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
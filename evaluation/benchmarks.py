@@ -0,0 +1,18 @@
+# Kept apart from utils so that reading the benchmark list does not import matplotlib.
+BENCHMARKS = {
+    "110.dynamic-html": "110_dynamic_html_python_3_8",
+    "120.uploader": "120_uploader_python_3_8",
+    "210.thumbnailer": "210_thumbnailer_python_3_8",
+    "220.video-processing": "220_video_processing_python_3_8",
+    "311.compression": "311_compression_python_3_8",
+    "501.graph-pagerank": "501_graph_pagerank_python_3_8"
+}
+
+MEMORY_SIZES = {
+    "110.dynamic-html": [128, 256, 512, 1024],
+    "120.uploader": [128, 256, 512, 1024],
+    "210.thumbnailer": [128, 256, 512, 1024],
+    "220.video-processing": [512, 1024, 2048, 4096],
+    "311.compression": [256, 512, 1024, 2048],
+    "501.graph-pagerank": [128, 256, 512, 1024]
+}
@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation.invocation_table import get_invocation_table
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+
+CELL_KEYS = ["benchmark", "architecture", "memory", "type"]
+# Intervals whose overlap is counted: as seen by the client and as run by the functions.
+SIDES = {"client": ("client_begin", "client_end"), "provider": ("function_begin", "function_end")}
+# A cell is suspected of throttling or burst queueing when latency rises with the concurrency an
+# invocation started into at least this strongly (Spearman rho), or when the functions never reach
+# this share of the client's peak concurrency while dispatch delay rises with it.
+PROVIDER_PEAK_SHARE = 0.8
+LATENCY_CORRELATION = 0.5
+
+
+def sweep(cells, begins, ends):
+    """Sweep-line over the intervals [begin, end) of every cell at once, in O(n log n).
+
+    Returns the concurrency each interval saw when it started (itself included) and, per cell, the
+    peak concurrency and the time integral of concurrency (in interval-seconds).
+    """
+    cells = np.asarray(cells, dtype=np.int64)
+    n = len(cells)
+    n_cells = cells.max() + 1 if n else 0
+    times = np.concatenate([begins, ends]).astype(float)
+    deltas = np.concatenate([np.ones(n, dtype=np.int64), -np.ones(n, dtype=np.int64)])
+    event_cells = np.concatenate([cells, cells])
+
+    # By cell, then time, with ends before starts at equal times so back-to-back intervals do not
+    # overlap. Every cell's events sum to zero, so one running sum serves all cells.
+    order = np.lexsort((deltas, times, event_cells))
+    running = np.cumsum(deltas[order])
+
+    at_start = np.empty(n, dtype=np.int64)
+    starts = order < n
+    at_start[order[starts]] = running[starts]
+
+    sorted_cells = event_cells[order]
+    sorted_times = times[order]
+    same_cell = np.concatenate([sorted_cells[1:] == sorted_cells[:-1], [False]])
+    durations = np.where(same_cell, np.diff(sorted_times, append=sorted_times[-1] if n else 0.0), 0.0)
+
+    peak = np.zeros(n_cells, dtype=np.int64)
+    np.maximum.at(peak, sorted_cells, running)
+    integral = np.bincount(sorted_cells, running * durations, minlength=n_cells)
+    return at_start, peak, integral
+
+
+def _grouped_rank_correlation(groups, x, y):
+    # Spearman correlation per group: Pearson correlation of within-group average ranks.
+    frame = pd.DataFrame({"group": groups, "x": x, "y": y})
+    ranks = frame.groupby("group")[["x", "y"]].rank()
+    ranks["group"] = groups
+    centered = ranks[["x", "y"]] - ranks.groupby("group")[["x", "y"]].transform("mean")
+    sums = pd.DataFrame({"xy": centered["x"] * centered["y"], "xx": centered["x"] ** 2, "yy": centered["y"] ** 2,
+                         "group": groups}).groupby("group").sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (sums["xy"] / np.sqrt(sums["xx"] * sums["yy"])).to_numpy()
+
+
+def invocation_concurrency(table):
+    """Per invocation with client and function timestamps: the client and provider concurrency at
+    its start and its dispatch delay (function begin minus client begin, in seconds)."""
+    selected = table.dropna(subset=[column for interval in SIDES.values() for column in interval])
+    cells = selected.groupby(CELL_KEYS, observed=True).ngroup().to_numpy()
+
+    result = selected[CELL_KEYS + ["client_time"]].copy()
+    for side, (begin, end) in SIDES.items():
+        result[f"{side}_concurrency"] = sweep(cells, selected[begin].to_numpy(), selected[end].to_numpy())[0]
+    result["dispatch_delay"] = selected["function_begin"] - selected["client_begin"]
+    result["cell"] = cells
+    return result
+
+
+def concurrency_summary(table):
+    """Achieved concurrency and throughput per (benchmark, architecture, memory, type) cell, and
+    how latency and dispatch delay move with the concurrency an invocation started into."""
+    selected = table.dropna(subset=[column for interval in SIDES.values() for column in interval])
+    grouped = selected.groupby(CELL_KEYS, observed=True)
+    cells = grouped.ngroup().to_numpy()
+    summary = grouped.agg(invocations=("client_time", "size"), first_begin=("client_begin", "min"),
+                          last_end=("client_end", "max"))
+    span = (summary["last_end"] - summary["first_begin"]).to_numpy()
+
+    concurrency = {}
+    for side, (begin, end) in SIDES.items():
+        at_start, peak, integral = sweep(cells, selected[begin].to_numpy(), selected[end].to_numpy())
+        concurrency[side] = at_start
+        summary[f"peak_{side}_concurrency"] = peak
+        summary[f"mean_{side}_concurrency"] = integral / np.where(span > 0, span, np.nan)
+
+    summary["span_seconds"] = span
+    summary["throughput_per_second"] = summary["invocations"] / np.where(span > 0, span, np.nan)
+    dispatch_delay = (selected["function_begin"] - selected["client_begin"]).to_numpy()
+    summary["mean_dispatch_delay"] = np.bincount(cells, dispatch_delay) / summary["invocations"].to_numpy()
+    summary["latency_concurrency_rho"] = _grouped_rank_correlation(cells, concurrency["client"],
+                                                                   selected["client_time"].to_numpy())
+    summary["dispatch_concurrency_rho"] = _grouped_rank_correlation(cells, concurrency["client"], dispatch_delay)
+    # Short functions rarely overlap even when the client sends a burst, so a low provider peak alone
+    # is not evidence; it needs dispatch delay that grows with the burst.
+    summary["throttling_suspected"] = (
+        ((summary["peak_provider_concurrency"] < PROVIDER_PEAK_SHARE * summary["peak_client_concurrency"]) &
+         (summary["dispatch_concurrency_rho"] > LATENCY_CORRELATION)) |
+        (summary["latency_concurrency_rho"] > LATENCY_CORRELATION)
+    )
+
+    summary = summary.drop(columns=["first_begin", "last_end"]).reset_index()
+    for column in ["benchmark", "architecture", "type"]:
+        summary[column] = summary[column].astype(str)
+    return summary
+
+
+def concurrency_timeline(begins, ends):
+    """Step function of the in-flight count of one cell: (times, concurrency from each time on)."""
+    times = np.concatenate([begins, ends]).astype(float)
+    deltas = np.concatenate([np.ones(len(begins)), -np.ones(len(ends))])
+    order = np.lexsort((deltas, times))
+    return times[order], np.cumsum(deltas[order])
+
+
+if __name__ == "__main__":
+    pd.set_option("display.width", 200)
+    print(concurrency_summary(get_invocation_table(PERF_DIR)).to_string(index=False))
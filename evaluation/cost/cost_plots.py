@@ -1,18 +1,19 @@
 import csv
+import os
 
 import matplotlib.pyplot as plt
 import numpy as np
 
 from evaluation.utils import (
-    BENCHMARKS, MEMORY_SIZES, LINE_COLORS, ALPHABET_LABELS,
+    BENCHMARKS, MEMORY_SIZES, LINE_COLORS, ALPHABET_LABELS, STYLE_PATH,
     get_benchmark_files, get_all_costs, calculate_bootstrap_ci,
     add_ggplot_title, setup_subplots, save_and_show_figure
 )
 
-plt.style.use("../scientific.mplstyle")
+plt.style.use(STYLE_PATH)
 
 
-def create_cost_plots(use_total_cost=False):
+def create_cost_plots(use_total_cost=False, cost_dir=".", output_dir=".", exclude_outliers=None):
     fig, axes = setup_subplots(2, 3)
 
     summary_data = [["Benchmark", "Memory Size", "ARM Cold Avg (USD)", "ARM Warm Avg (USD)",
@@ -27,7 +28,11 @@ def create_cost_plots(use_total_cost=False):
         is_arm_map = {"arm_cold": True, "arm_warm": True, "x86_cold": False, "x86_warm": False}
 
         for key, file_list in files.items():
-            raw_costs_per_mem = [get_all_costs(f, invocation_key, is_arm_map[key], use_total_cost) for f in file_list]
+            raw_costs_per_mem = [
+                get_all_costs(os.path.join(cost_dir, f), invocation_key, is_arm_map[key], use_total_cost,
+                              exclude_outliers=exclude_outliers)
+                for f in file_list
+            ]
             bootstrap_results = [calculate_bootstrap_ci(data) for data in raw_costs_per_mem]
             costs_means[key] = [res[0] for res in bootstrap_results]
             costs_cis[key] = [res[1] for res in bootstrap_results]
@@ -82,8 +87,8 @@ def create_cost_plots(use_total_cost=False):
     fig_name = f"{file_prefix}cost.pdf"
     csv_file = f"summary_{file_prefix}cost.csv"
 
-    save_and_show_figure(fig, fig_name)
-    with open(csv_file, mode="w", newline="") as f:
+    save_and_show_figure(fig, os.path.join(output_dir, fig_name))
+    with open(os.path.join(output_dir, csv_file), mode="w", newline="") as f:
         writer = csv.writer(f)
         writer.writerows(summary_data)
 
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation.benchmarks import BENCHMARKS
+from evaluation.invocation_table import get_invocation_table
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+
+CELL_KEYS = ["type", "benchmark", "memory", "architecture"]
+
+# Parts of an invocation's client time, in microseconds, in the order they are stacked. They sum to
+# client_time exactly:
+#   connect         HTTP connection setup on the client (times.http_startup)
+#   provider        provider initialization plus provider execution time outside the handler
+#   download        time the function spent downloading its input (measurement.download_time)
+#   compute         the benchmark's own compute (measurement.compute_time, or the whole handler
+#                   when the benchmark reports no measurements)
+#   upload          time spent uploading the output (measurement.upload_time)
+#   function_other  handler time not covered by the measurements
+#   client_residual rest of the client time: request transfer, response and client overhead
+COMPONENTS = ["connect", "provider", "download", "compute", "upload", "function_other", "client_residual"]
+COMPONENT_LABELS = {
+    "connect": "Network connect",
+    "provider": "Provider init/queueing",
+    "download": "Download",
+    "compute": "Compute",
+    "upload": "Upload",
+    "function_other": "Other function time",
+    "client_residual": "Client residual",
+}
+
+
+def _measurement(table, name):
+    column = f"measurement_{name}"
+    return table[column].to_numpy(dtype=float) if column in table else np.full(len(table), np.nan)
+
+
+def decompose(table):
+    """Per-invocation latency components (microseconds) next to the cell keys and client_time.
+
+    Invocations without a processed record (no init_time) are dropped.
+    """
+    table = table[table["init_time"].notna()]
+    client = table["client_time"].to_numpy(dtype=float)
+    benchmark = table["exec_time"].to_numpy(dtype=float)
+    execution = table["provider_time"].to_numpy(dtype=float)
+
+    download = np.nan_to_num(_measurement(table, "download_time"))
+    upload = np.nan_to_num(_measurement(table, "upload_time"))
+    compute = _measurement(table, "compute_time")
+    compute = np.where(np.isnan(compute), np.maximum(benchmark - download - upload, 0), compute)
+
+    components = pd.DataFrame({
+        "connect": table["connection_time"].to_numpy(dtype=float) * 1e6,
+        "provider": table["init_time"].to_numpy(dtype=float) + execution - benchmark,
+        "download": download,
+        "compute": compute,
+        "upload": upload,
+        "function_other": benchmark - download - compute - upload,
+    }, index=table.index)
+    components["client_residual"] = client - components.sum(axis=1)
+    return pd.concat([table[CELL_KEYS + ["client_time"]], components], axis=1)
+
+
+def decomposition_summary(table, benchmarks=None):
+    """Mean of every latency component per (type, benchmark, memory, architecture) cell, with its
+    share of the mean client time."""
+    benchmarks = list(BENCHMARKS) if benchmarks is None else list(benchmarks)
+    parts = decompose(table[table["benchmark"].isin(benchmarks)])
+    parts["benchmark"] = pd.Categorical(parts["benchmark"].astype(str), categories=benchmarks)
+
+    summary = parts.groupby(CELL_KEYS, observed=True)[["client_time"] + COMPONENTS].mean()
+    summary.columns = [f"mean_{column}" for column in summary.columns]
+    for component in COMPONENTS:
+        summary[f"share_{component}"] = summary[f"mean_{component}"] / summary["mean_client_time"]
+
+    summary = summary.reset_index()
+    for column in ["type", "benchmark", "architecture"]:
+        summary[column] = summary[column].astype(str)
+    return summary
+
+
+def handshake_summary(table, benchmarks=None):
+    """Mean client time per (type, benchmark, memory, architecture) cell with and without the HTTP
+    connection setup (times.http_startup), its share of the client time, the fraction of requests
+    sent over a reused connection, and the speedup (x86 mean over ARM mean) with and without it.
+
+    SeBS opens a connection per invocation, so its handshake is in every client time although it
+    does not depend on the function's architecture.
+    """
+    benchmarks = list(BENCHMARKS) if benchmarks is None else list(benchmarks)
+    selected = table[table["benchmark"].isin(benchmarks)]
+    client = selected["client_time"].to_numpy(dtype=float)
+    handshake = selected["connection_time"].to_numpy(dtype=float) * 1e6
+    parts = pd.DataFrame({"client_time": client, "handshake": handshake,
+                          "client_time_without_handshake": client - handshake,
+                          "connection_reused": selected["connection_reused"].to_numpy(dtype=float)},
+                         index=selected.index)
+    parts = pd.concat([selected[CELL_KEYS], parts], axis=1)
+    parts["benchmark"] = pd.Categorical(parts["benchmark"].astype(str), categories=benchmarks)
+
+    grouped = parts.groupby(CELL_KEYS, observed=True)
+    summary = grouped[["client_time", "handshake", "client_time_without_handshake"]].mean()
+    summary.columns = [f"mean_{column}" for column in summary.columns]
+    summary["share_handshake"] = summary["mean_handshake"] / summary["mean_client_time"]
+    summary["reused_fraction"] = grouped["connection_reused"].mean()
+
+    means = summary[["mean_client_time", "mean_client_time_without_handshake"]].unstack("architecture")
+    means = means.reindex(columns=pd.MultiIndex.from_product([means.columns.levels[0], ["ARM", "x86"]]))
+    speedup = pd.DataFrame({
+        "speedup": means[("mean_client_time", "x86")] / means[("mean_client_time", "ARM")],
+        "speedup_without_handshake": means[("mean_client_time_without_handshake", "x86")] /
+        means[("mean_client_time_without_handshake", "ARM")],
+    })
+    summary = summary.reset_index().join(speedup, on=["type", "benchmark", "memory"])
+    for column in ["type", "benchmark", "architecture"]:
+        summary[column] = summary[column].astype(str)
+    return summary
+
+
+if __name__ == "__main__":
+    pd.set_option("display.width", 200)
+    print(decomposition_summary(get_invocation_table(PERF_DIR)).to_string(index=False))
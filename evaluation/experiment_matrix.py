@@ -0,0 +1,165 @@
+import itertools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation.concurrency import concurrency_summary
+from evaluation.invocation_table import ARCHITECTURES, COST_DIR, PERF_DIR, build_invocation_table
+from evaluation.pricing import MB_MS_PER_GB_SECOND, default_pricing, total_cost
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+MATRIX_SPEC = os.path.join(os.path.dirname(EVALUATION_DIR), "config", "matrix.json")
+
+SEBS_ARCHITECTURES = {"arm": "arm64", "x86": "x86_64"}
+# The runtime and input size of the checked-in results, which every estimate is based on.
+MEASURED_RUNTIME = {"language": "python", "version": "3.8"}
+MEASURED_INPUT_SIZE = "test"
+CELL_KEYS = ["type", "benchmark", "memory", "architecture"]
+ESTIMATE_COLUMNS = ["config", "benchmark", "architecture", "runtime", "input_size", "memory", "type", "repetitions",
+                    "concurrent_invocations", "estimate_source", "wall_seconds", "gb_seconds", "cost_usd"]
+
+
+def load_spec(path=MATRIX_SPEC):
+    """The matrix spec at `path`, with its template config resolved relative to the spec."""
+    with open(path) as f:
+        spec = json.load(f)
+    spec["template"] = os.path.join(os.path.dirname(os.path.abspath(path)), spec["template"])
+    return spec
+
+
+def _memory_sizes(spec, benchmark):
+    sizes = spec["memory-sizes"]
+    return sizes if isinstance(sizes, list) else sizes.get(benchmark, sizes["default"])
+
+
+def _runtime_label(runtime):
+    return f"{runtime['language']}{runtime['version']}"
+
+
+def experiments(spec):
+    """Every config of the matrix as (file name, benchmark, arch, runtime, input size); SeBS runs each
+    for all memory sizes and run types listed in it. Runtimes and input sizes appear in the file
+    name only when the matrix has more than one of them."""
+    rows = []
+    for benchmark, arch, runtime, input_size in itertools.product(
+            spec["benchmarks"], spec["architectures"], spec["runtimes"], spec["input-sizes"]):
+        name = f"{benchmark}_{arch}"
+        if len(spec["runtimes"]) > 1:
+            name += f"_{_runtime_label(runtime)}"
+        if len(spec["input-sizes"]) > 1:
+            name += f"_{input_size}"
+        rows.append((f"{name}.json", benchmark, arch, runtime, input_size))
+    return rows
+
+
+def matrix_configs(spec):
+    """SeBS perf-cost configs of the matrix as {file name: config}, each a copy of the template."""
+    with open(spec["template"]) as f:
+        template = f.read()
+
+    configs = {}
+    for name, benchmark, arch, runtime, input_size in experiments(spec):
+        config = json.loads(template)
+        config["experiments"]["architecture"] = SEBS_ARCHITECTURES[arch]
+        config["experiments"]["runtime"] = dict(runtime)
+        config["experiments"]["perf-cost"].update({
+            "benchmark": benchmark,
+            "experiments": list(spec["experiments"]),
+            "input-size": input_size,
+            "repetitions": spec["repetitions"],
+            "concurrent-invocations": spec["concurrent-invocations"],
+            "memory-sizes": _memory_sizes(spec, benchmark),
+        })
+        configs[name] = config
+    return configs
+
+
+def measured_cells(table):
+    """Per measured (type, benchmark, memory, architecture) cell: mean SeBS _gb_seconds (MB-ms),
+    and the wall time of one batch of concurrent invocations (span of the cell over its batches)."""
+    cells = table.groupby(CELL_KEYS, observed=True).agg(invocations=("client_time", "size"),
+                                                        mb_ms=("gb_seconds", "mean")).reset_index()
+    concurrency = concurrency_summary(table)
+    for column in ["type", "benchmark", "architecture"]:
+        cells[column] = cells[column].astype(str)
+    cells = cells.merge(concurrency[CELL_KEYS + ["peak_client_concurrency", "span_seconds"]], on=CELL_KEYS, how="left")
+    batches = np.ceil(cells["invocations"] / cells["peak_client_concurrency"])
+    cells["batch_seconds"] = cells["span_seconds"] / batches
+    return cells.set_index(CELL_KEYS)
+
+
+def _nearest_cell(cells, run_type, benchmark, memory, architecture):
+    # The measured cell at the same or the closest memory size; its GB-seconds are scaled to
+    # `memory`, assuming the billed duration stays the same.
+    if (run_type, benchmark, memory, architecture) in cells.index:
+        return cells.loc[(run_type, benchmark, memory, architecture)], "measured", 1.0
+    try:
+        candidates = cells.xs((run_type, benchmark, architecture), level=["type", "benchmark", "architecture"])
+    except KeyError:
+        return None, "no measurements", np.nan
+    nearest = candidates.index[np.argmin(np.abs(np.log(candidates.index.to_numpy() / memory)))]
+    return candidates.loc[nearest], f"scaled from {nearest} MB", memory / nearest
+
+
+def estimate_matrix(spec, table, pricing=None):
+    """Predicted wall time (s), GB-seconds and cost (USD, compute plus requests) of every
+    (config, memory size, run type) of the matrix, from the measured cells of `table`.
+
+    A config's experiments run one batch of concurrent invocations at a time, each taking as long
+    as a batch of the measured cell. Runtimes and input sizes other than the measured ones reuse
+    its measurements, which `estimate_source` notes. Deployment and storage are not included.
+    """
+    pricing = pricing or default_pricing()
+    cells = measured_cells(table)
+    rows = []
+    for name, benchmark, arch, runtime, input_size in experiments(spec):
+        architecture = ARCHITECTURES[arch]
+        for memory, run_type in itertools.product(_memory_sizes(spec, benchmark), spec["experiments"]):
+            cell, source, scale = _nearest_cell(cells, run_type, benchmark, memory, architecture)
+            if runtime != MEASURED_RUNTIME or input_size != MEASURED_INPUT_SIZE:
+                source += f" ({_runtime_label(MEASURED_RUNTIME)} {MEASURED_INPUT_SIZE} results)"
+
+            repetitions, concurrency = spec["repetitions"], spec["concurrent-invocations"]
+            row = {"config": name, "benchmark": benchmark, "architecture": architecture,
+                   "runtime": _runtime_label(runtime), "input_size": input_size, "memory": memory, "type": run_type,
+                   "repetitions": repetitions, "concurrent_invocations": concurrency, "estimate_source": source}
+            if cell is not None:
+                mb_ms = np.full(repetitions, cell["mb_ms"] * scale)
+                row.update(wall_seconds=np.ceil(repetitions / concurrency) * cell["batch_seconds"],
+                           gb_seconds=mb_ms.sum() / MB_MS_PER_GB_SECOND,
+                           cost_usd=total_cost(pricing, arch, mb_ms).sum() / pricing.reported_invocations)
+            rows.append(row)
+    return pd.DataFrame(rows, columns=ESTIMATE_COLUMNS)
+
+
+def load_measurements(spec, perf_dir=PERF_DIR, cost_dir=COST_DIR):
+    """Invocation table of the matrix's benchmarks that have results under `perf_dir`."""
+    measured = [benchmark for benchmark in spec["benchmarks"]
+                if all(os.path.exists(os.path.join(perf_dir, f"result_{arch}_{benchmark}.csv"))
+                       for arch in ARCHITECTURES)]
+    return build_invocation_table(perf_dir, cost_dir, measured)
+
+
+def write_matrix(spec, estimates, output_dir):
+    """Write the configs and estimates.csv under `output_dir`; return the config paths."""
+    os.makedirs(os.path.join(output_dir, "configs"), exist_ok=True)
+    estimates.to_csv(os.path.join(output_dir, "estimates.csv"), index=False)
+    paths = []
+    for name, config in matrix_configs(spec).items():
+        path = os.path.join(output_dir, "configs", name)
+        with open(path, "w") as f:
+            json.dump(config, f, indent=2)
+            f.write("\n")
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    spec = load_spec()
+    estimates = estimate_matrix(spec, load_measurements(spec))
+    pd.set_option("display.width", 200)
+    print(estimates.groupby("config")[["wall_seconds", "gb_seconds", "cost_usd"]].sum().to_string())
+    print(f"Total: {estimates['wall_seconds'].sum():.0f} s, {estimates['gb_seconds'].sum():.1f} GB-s, "
+          f"{estimates['cost_usd'].sum():.4f} USD")
@@ -0,0 +1,267 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are not serialized, but each still stages in its own directory.
+    fcntl = None
+
+from evaluation.result_stream import get_field, iter_invocation_items
+
+CACHE_DIR_NAME = ".invocation_cache"
+MANIFEST_NAME = "manifest.json"
+CACHE_VERSION = 2
+
+MEASUREMENT_PREFIX = "output.result.measurement."
+
+# Fixed part of the flattened invocation record, as (column, dtype kind).
+INVOCATION_COLUMNS = [
+    ("request_id", "str"),
+    ("billing._billed_time", "float"),
+    ("billing._gb_seconds", "float"),
+    ("billing._memory", "float"),
+    ("provider_times.execution", "float"),
+    ("provider_times.initialization", "float"),
+    ("times.benchmark", "float"),
+    ("times.client", "float"),
+    ("times.client_begin", "datetime"),
+    ("times.client_end", "datetime"),
+    ("times.http_first_byte_return", "float"),
+    ("times.http_startup", "float"),
+    ("times.initialization", "float"),
+    ("times.connection_reused", "bool"),
+    ("stats.cold_start", "bool"),
+    ("stats.failure", "bool"),
+    ("stats.memory_used", "float"),
+    ("output.begin", "float"),
+    ("output.end", "float"),
+    ("output.is_cold", "bool"),
+    ("output.container_id", "str"),
+]
+
+
+def _to_array(values, kind):
+    if kind == "float":
+        return np.array([np.nan if v is None or v == "" else float(v) for v in values], dtype=np.float64)
+    if kind == "bool":
+        return np.array([bool(v) for v in values], dtype=bool)
+    if kind == "datetime":
+        return np.array([v if v else "NaT" for v in values], dtype="datetime64[us]")
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def flatten_invocations(records):
+    values = {column: [] for column, _ in INVOCATION_COLUMNS}
+    measurements = {}
+    count = 0
+
+    for record in records:
+        for column, _ in INVOCATION_COLUMNS:
+            values[column].append(get_field(record, column))
+
+        measurement = get_field(record, "output.result.measurement") or {}
+        for key in measurement:
+            # Fields first seen part-way through are back-filled as missing.
+            measurements.setdefault(MEASUREMENT_PREFIX + key, [None] * count)
+        for column, column_values in measurements.items():
+            column_values.append(measurement.get(column[len(MEASUREMENT_PREFIX):]))
+        count += 1
+
+    columns = {column: _to_array(values[column], kind) for column, kind in INVOCATION_COLUMNS}
+    for column, column_values in measurements.items():
+        columns[column] = _to_array(column_values, "float")
+    return columns
+
+
+def _iter_function_records(file_path, streaming):
+    if streaming:
+        items = iter_invocation_items(file_path)
+        for function, group in groupby(items, key=itemgetter(0)):
+            yield function, (record for _, _, record in group)
+        return
+
+    with open(file_path, "r") as f:
+        data = json.load(f)
+    for function, invocations in data.get("_invocations", {}).items():
+        yield function, invocations.values()
+
+
+def _partition_dir(file_path):
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, CACHE_DIR_NAME, os.path.splitext(filename)[0])
+
+
+def _file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_manifest(partition_dir):
+    try:
+        with open(os.path.join(partition_dir, MANIFEST_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(partition_dir, manifest):
+    # Written next to the manifest and renamed over it, so readers never see a partial file.
+    handle, path = tempfile.mkstemp(dir=partition_dir, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path, os.path.join(partition_dir, MANIFEST_NAME))
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+@contextmanager
+def _cache_lock(file_path):
+    # Serializes the processes building the cache of one source file.
+    partition_dir = _partition_dir(file_path)
+    os.makedirs(os.path.dirname(partition_dir), exist_ok=True)
+    with open(f"{partition_dir}.lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def is_cache_fresh(file_path):
+    partition_dir = _partition_dir(file_path)
+    manifest = _read_manifest(partition_dir)
+    if manifest is None or manifest.get("version") != CACHE_VERSION:
+        return False
+    # A cache whose column files went missing is rebuilt rather than failing every later load.
+    for invocation_key, function in manifest["functions"].items():
+        for column in function["columns"]:
+            if not os.path.exists(os.path.join(partition_dir, invocation_key, f"{column}.npy")):
+                return False
+
+    stat = os.stat(file_path)
+    source = manifest["source"]
+    if source["mtime_ns"] == stat.st_mtime_ns and source["size"] == stat.st_size:
+        return True
+
+    # Touched but unchanged sources (checkouts, copies) keep their cache.
+    if source["size"] == stat.st_size and source["sha256"] == _file_hash(file_path):
+        source["mtime_ns"] = stat.st_mtime_ns
+        _write_manifest(partition_dir, manifest)
+        return True
+    return False
+
+
+def _build_invocation_cache(file_path, streaming):
+    partition_dir = _partition_dir(file_path)
+    cache_dir, name = os.path.split(partition_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(dir=cache_dir, prefix=f"{name}.", suffix=".tmp")
+    try:
+        _write_partition(file_path, staging_dir, streaming)
+        # Move the old partition aside before renaming the new one into place, since a directory
+        # cannot be replaced by another in one step; its files stay readable until removed.
+        retired_dir = f"{staging_dir}.old"
+        try:
+            os.rename(partition_dir, retired_dir)
+        except FileNotFoundError:
+            retired_dir = None
+        os.rename(staging_dir, partition_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    if retired_dir is not None:
+        shutil.rmtree(retired_dir, ignore_errors=True)
+    return partition_dir
+
+
+def _write_partition(file_path, staging_dir, streaming):
+    functions = {}
+    for invocation_key, records in _iter_function_records(file_path, streaming):
+        columns = flatten_invocations(records)
+        rows = len(next(iter(columns.values())))
+        function_dir = os.path.join(staging_dir, invocation_key)
+        os.makedirs(function_dir)
+        for column, values in columns.items():
+            np.save(os.path.join(function_dir, f"{column}.npy"), values)
+        functions[invocation_key] = {"rows": rows, "columns": list(columns)}
+
+    stat = os.stat(file_path)
+    _write_manifest(staging_dir, {
+        "version": CACHE_VERSION,
+        "source": {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": _file_hash(file_path)},
+        "functions": functions
+    })
+
+
+def build_invocation_cache(file_path, streaming=False):
+    with _cache_lock(file_path):
+        return _build_invocation_cache(file_path, streaming)
+
+
+def ensure_invocation_cache(file_path, streaming=False):
+    if not is_cache_fresh(file_path):
+        with _cache_lock(file_path):
+            # Another process may have built the cache while this one waited for the lock.
+            if not is_cache_fresh(file_path):
+                _build_invocation_cache(file_path, streaming)
+    return _partition_dir(file_path)
+
+
+def load_invocation_columns(file_path, invocation_key, columns=None, streaming=False):
+    # A rebuild by another process can swap the partition out between the check and the loads;
+    # the second attempt then reads the new one.
+    for attempt in range(2):
+        partition_dir = ensure_invocation_cache(file_path, streaming)
+        try:
+            return _load_partition_columns(partition_dir, invocation_key, columns)
+        except FileNotFoundError:
+            if attempt == 1:
+                raise
+
+
+def _load_partition_columns(partition_dir, invocation_key, columns):
+    manifest = _read_manifest(partition_dir)
+    if manifest is None:
+        raise FileNotFoundError(os.path.join(partition_dir, MANIFEST_NAME))
+    function = manifest["functions"].get(invocation_key)
+    if function is None:
+        return {}
+
+    mmap_mode = "r" if function["rows"] > 0 else None
+    function_dir = os.path.join(partition_dir, invocation_key)
+    selected = function["columns"] if columns is None else [c for c in columns if c in function["columns"]]
+
+    return {
+        column: np.load(os.path.join(function_dir, f"{column}.npy"), mmap_mode=mmap_mode)
+        for column in selected
+    }
+
+
+def ingest_cost_results(cost_dir, streaming=False, benchmarks=None):
+    pattern = os.path.join(cost_dir, "*", "*", "*-processed.json")
+    file_paths = sorted(glob.glob(pattern))
+    if benchmarks is not None:
+        file_paths = [path for path in file_paths
+                      if os.path.basename(os.path.dirname(os.path.dirname(path))) in benchmarks]
+    for file_path in file_paths:
+        ensure_invocation_cache(file_path, streaming)
+    return file_paths
+
+
+if __name__ == "__main__":
+    cost_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "cost"))
+    ingested = ingest_cost_results(cost_dir)
+    print(f"Cached {len(ingested)} processed result files under {cost_dir}")
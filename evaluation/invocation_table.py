@@ -0,0 +1,172 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from evaluation.invocation_cache import MEASUREMENT_PREFIX, load_invocation_columns
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+COST_DIR = os.path.join(EVALUATION_DIR, "cost")
+
+ARCHITECTURES = {"arm": "ARM", "x86": "x86"}
+RUN_TYPES = ["cold", "warm"]
+
+# Narrow dtypes for the SeBS result.csv columns. Times are integer microseconds, and AWS Lambda
+# caps invocations at 15 minutes, well inside int32. Memory usage is reported in whole MB.
+RESULT_DTYPES = {
+    "memory": "int16",
+    "is_cold": "bool",
+    "exec_time": "int32",
+    "client_time": "int32",
+    "provider_time": "int32",
+    "mem_used": "float32",
+}
+
+
+def invocation_key(benchmark):
+    return benchmark.replace(".", "_").replace("-", "_") + "_python_3_8"
+
+
+def _discover_benchmarks(perf_dir):
+    benchmarks = set()
+    for filename in os.listdir(perf_dir):
+        if filename.startswith("result_") and filename.endswith(".csv"):
+            benchmarks.add(filename[len("result_"):-len(".csv")].split("_", 1)[1])
+    return sorted(benchmarks)
+
+
+def _read_results(perf_dir, arch, benchmark):
+    return _typed_results(pd.read_csv(os.path.join(perf_dir, f"result_{arch}_{benchmark}.csv")), arch, benchmark)
+
+
+def _typed_results(frame, arch, benchmark):
+    frame.columns = frame.columns.str.strip()
+    for column, dtype in RESULT_DTYPES.items():
+        if column in frame and not frame[column].isna().any():
+            frame[column] = frame[column].astype(dtype)
+    frame.insert(0, "architecture", ARCHITECTURES[arch])
+    frame.insert(0, "benchmark", benchmark)
+    return frame
+
+
+# Columns taken from the processed records, which result.csv does not carry: the billed
+# MB-milliseconds, provider initialization (us), the client's and the function's begin/end epoch
+# timestamps (s), the container that served the invocation and whether the request went over a
+# reused HTTP connection (1/0; SeBS always opens a new one).
+RECORD_COLUMNS = {
+    "request_id": "request_id",
+    "gb_seconds": "billing._gb_seconds",
+    "init_time": "provider_times.initialization",
+    "client_begin": "times.client_begin",
+    "client_end": "times.client_end",
+    "function_begin": "output.begin",
+    "function_end": "output.end",
+    "container_id": "output.container_id",
+    "connection_reused": "times.connection_reused",
+}
+
+
+def _epoch_seconds(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        # SeBS writes client timestamps in UTC without a zone, like the functions' epoch timestamps.
+        return (values - np.datetime64(0, "us")) / np.timedelta64(1, "s")
+    return values
+
+
+def _processed_columns(cost_dir, arch, benchmark):
+    # Loads the processed columns of one (memory, run type) cell, or None when the file is missing.
+    def load_columns(memory, run_type):
+        file_path = os.path.join(cost_dir, benchmark, arch, f"{run_type}_results_{memory}-processed.json")
+        if not os.path.exists(file_path):
+            return None
+        return load_invocation_columns(file_path, invocation_key(benchmark))
+    return load_columns
+
+
+def _archive_columns(loaded, arch, benchmark):
+    def load_columns(memory, run_type):
+        return loaded["invocations"].get((arch, benchmark, memory, run_type), {}).get(invocation_key(benchmark))
+    return load_columns
+
+
+def _attach_cost_columns(frame, load_columns):
+    for column in RECORD_COLUMNS:
+        frame[column] = None if column in ("request_id", "container_id") else np.nan
+    # Whether the function or the provider reported the invocation as a cold start.
+    frame["reported_cold"] = pd.array([pd.NA] * len(frame), dtype="boolean")
+
+    for (memory, run_type), positions in frame.groupby(["memory", "type"], sort=False).indices.items():
+        columns = load_columns(memory, run_type)
+        if columns is None:
+            continue
+
+        client = columns.get("times.client")
+        # SeBS writes result.csv rows in the same order as the processed records; only attach
+        # when the cell lines up exactly.
+        if client is None or len(client) != len(positions) or \
+                not np.array_equal(np.asarray(client), frame["client_time"].to_numpy()[positions]):
+            continue
+
+        for column, field in RECORD_COLUMNS.items():
+            values = _epoch_seconds(columns[field])
+            frame.iloc[positions, frame.columns.get_loc(column)] = \
+                values.astype(float) if values.dtype == bool else values
+        frame.iloc[positions, frame.columns.get_loc("reported_cold")] = \
+            np.asarray(columns["output.is_cold"]) | np.asarray(columns["stats.cold_start"])
+        for column, values in columns.items():
+            if column.startswith(MEASUREMENT_PREFIX):
+                name = "measurement_" + column[len(MEASUREMENT_PREFIX):]
+                if name not in frame:
+                    frame[name] = np.nan
+                frame.iloc[positions, frame.columns.get_loc(name)] = np.asarray(values)
+
+
+def build_invocation_table(perf_dir=PERF_DIR, cost_dir=COST_DIR, benchmarks=None):
+    frames = []
+    for benchmark in benchmarks or _discover_benchmarks(perf_dir):
+        for arch in ARCHITECTURES:
+            frame = _read_results(perf_dir, arch, benchmark)
+            _attach_cost_columns(frame, _processed_columns(cost_dir, arch, benchmark))
+            frames.append(frame)
+    return _categorize(frames)
+
+
+def build_archive_invocation_table(loaded, benchmarks=None):
+    """The invocation table of a campaign archive decoded by results_archive.load_archive, without
+    extracting it."""
+    frames = []
+    for benchmark in benchmarks or sorted({benchmark for _, benchmark in loaded["results"]}):
+        for arch in ARCHITECTURES:
+            frame = _typed_results(loaded["results"][(arch, benchmark)].copy(), arch, benchmark)
+            _attach_cost_columns(frame, _archive_columns(loaded, arch, benchmark))
+            frames.append(frame)
+    return _categorize(frames)
+
+
+def _categorize(frames):
+    table = pd.concat(frames, ignore_index=True)
+    table["benchmark"] = pd.Categorical(table["benchmark"], categories=list(dict.fromkeys(table["benchmark"])))
+    table["architecture"] = pd.Categorical(table["architecture"], categories=list(ARCHITECTURES.values()))
+    table["type"] = pd.Categorical(table["type"], categories=RUN_TYPES)
+    return table
+
+
+@lru_cache(maxsize=None)
+def _cached_invocation_table(perf_dir, cost_dir):
+    return build_invocation_table(perf_dir, cost_dir)
+
+
+def get_invocation_table(perf_dir=PERF_DIR, cost_dir=COST_DIR):
+    """One row per invocation for every benchmark, built on first use and shared for the session.
+
+    Callers must treat the returned frame as read-only.
+    """
+    return _cached_invocation_table(os.path.abspath(perf_dir), os.path.abspath(cost_dir))
+
+
+def benchmark_invocations(benchmark, perf_dir=PERF_DIR, cost_dir=COST_DIR):
+    table = get_invocation_table(perf_dir, cost_dir)
+    return table[table["benchmark"] == benchmark]
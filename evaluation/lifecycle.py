@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation.invocation_table import get_invocation_table
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+
+# One experiment is the cold and the warm run of a benchmark at one memory size on one
+# architecture; they share a deployment, so the warm run reuses the cold run's containers.
+EXPERIMENT_KEYS = ["benchmark", "architecture", "memory"]
+CONTAINER_KEYS = EXPERIMENT_KEYS + ["container_id"]
+
+# Why an invocation's cold/warm label disagrees with what its container did, checked in this order.
+COLD_IN_WARM = "cold start reported in warm run"
+NEW_CONTAINER_IN_WARM = "warm run on a new container"
+REUSED_IN_COLD = "cold run on a reused container"
+UNREPORTED_COLD = "cold run not reported as cold"
+
+
+def container_lifecycle(table):
+    """Lifecycle columns for every invocation that has a processed record, on the table's index.
+
+    Invocations are ordered by their function begin time within each experiment. `use_index` counts
+    earlier invocations on the same container (0 for its first use), `idle_gap` is the time in
+    seconds since that container last finished, and `mislabel_reason` says why the run type label is
+    suspect ("" when it is consistent).
+    """
+    columns = EXPERIMENT_KEYS + ["type", "container_id", "reported_cold", "init_time", "function_begin",
+                                 "function_end"]
+    lifecycle = table.loc[table["container_id"].notna(), columns].copy()
+    lifecycle = lifecycle.sort_values(EXPERIMENT_KEYS + ["function_begin"], kind="stable")
+
+    by_container = lifecycle.groupby(CONTAINER_KEYS, observed=True, sort=False)
+    lifecycle["use_index"] = by_container.cumcount()
+    lifecycle["idle_gap"] = lifecycle["function_begin"] - by_container["function_end"].shift()
+
+    warm = (lifecycle["type"] == "warm").to_numpy()
+    reported_cold = lifecycle["reported_cold"].fillna(False).to_numpy(dtype=bool) | \
+        (lifecycle["init_time"].fillna(0).to_numpy() > 0)
+    first_use = (lifecycle["use_index"] == 0).to_numpy()
+    lifecycle["mislabel_reason"] = np.select(
+        [warm & reported_cold, warm & first_use, ~warm & ~first_use, ~warm & ~reported_cold],
+        [COLD_IN_WARM, NEW_CONTAINER_IN_WARM, REUSED_IN_COLD, UNREPORTED_COLD], default="")
+    lifecycle["mislabelled"] = lifecycle["mislabel_reason"] != ""
+    return lifecycle.sort_index()
+
+
+def mislabelled_mask(table, lifecycle=None):
+    """Boolean Series on the table's index; invocations without a processed record are never flagged."""
+    lifecycle = container_lifecycle(table) if lifecycle is None else lifecycle
+    return lifecycle["mislabelled"].reindex(table.index, fill_value=False)
+
+
+def container_timelines(lifecycle):
+    """One row per container: first and last use, invocations served, reuse count and idle gaps."""
+    lifecycle = lifecycle.assign(cold_labelled=lifecycle["type"] == "cold")
+    timelines = lifecycle.groupby(CONTAINER_KEYS, observed=True).agg(
+        first_use=("function_begin", "min"),
+        last_use=("function_end", "max"),
+        invocations=("use_index", "size"),
+        cold_labelled=("cold_labelled", "sum"),
+        mean_idle_gap=("idle_gap", "mean"),
+        max_idle_gap=("idle_gap", "max"),
+        mislabelled=("mislabelled", "sum"),
+    ).reset_index()
+    timelines["reuse_count"] = timelines["invocations"] - 1
+    timelines["lifetime"] = timelines["last_use"] - timelines["first_use"]
+    return timelines
+
+
+def lifecycle_summary(lifecycle):
+    """Per experiment and run type: containers used, invocations per container, how often an
+    invocation landed on a container's first use, and how many labels are suspect."""
+    lifecycle = lifecycle.assign(new_container=lifecycle["use_index"] == 0)
+    summary = lifecycle.groupby(EXPERIMENT_KEYS + ["type"], observed=True).agg(
+        invocations=("use_index", "size"),
+        containers=("container_id", "nunique"),
+        new_container_rate=("new_container", "mean"),
+        median_idle_gap=("idle_gap", "median"),
+        mislabelled=("mislabelled", "sum"),
+    ).reset_index()
+    summary["invocations_per_container"] = summary["invocations"] / summary["containers"]
+    summary["mislabelled_share"] = summary["mislabelled"] / summary["invocations"]
+    for column in ["benchmark", "architecture", "type"]:
+        summary[column] = summary[column].astype(str)
+    return summary
+
+
+def mislabelled_invocations(lifecycle):
+    flagged = lifecycle[lifecycle["mislabelled"]].drop(columns="mislabelled")
+    for column in ["benchmark", "architecture", "type"]:
+        flagged[column] = flagged[column].astype(str)
+    return flagged
+
+
+if __name__ == "__main__":
+    lifecycle = container_lifecycle(get_invocation_table(PERF_DIR))
+    pd.set_option("display.width", 200)
+    print(lifecycle_summary(lifecycle).to_string(index=False))
+    print(f"{int(lifecycle['mislabelled'].sum())} of {len(lifecycle)} invocations have a suspect cold/warm label")
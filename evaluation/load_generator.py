@@ -0,0 +1,400 @@
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import ssl
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows: the open file limit is left as it is.
+    resource = None
+
+import numpy as np
+import pandas as pd
+
+from evaluation.invocation_cache import load_invocation_columns
+from evaluation.invocation_table import ARCHITECTURES, RUN_TYPES, invocation_key
+from evaluation.local_lambda import result_rows, sebs_record
+from evaluation.synthetic import sebs_experiment, sebs_timestamp
+
+PATTERNS = ("trace", "poisson", "diurnal", "bursty")
+DEFAULT_RATE = 100.0
+DEFAULT_DURATION = 10.0
+# The diurnal model's rate swings by +-amplitude around the mean over one period (s); the bursty
+# model sends `burst_size` requests within `burst_spread` seconds, with Poisson-arriving bursts.
+DEFAULT_PERIOD = 60.0
+DEFAULT_AMPLITUDE = 0.8
+DEFAULT_BURST_SIZE = 50
+DEFAULT_BURST_SPREAD = 0.0
+# Requests in flight at once, to stay within the open file limit; arrivals beyond it wait, and
+# their wait counts towards `times.arrival_lag`.
+DEFAULT_MAX_IN_FLIGHT = 1000
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_WORKERS = 1
+# Seconds the worker processes get to start before the first arrival is due.
+WORKER_START_DELAY = 2.0
+
+Target = namedtuple("Target", ["host", "port", "ssl", "path"])
+
+
+def trace_arrivals(file_path, benchmark, speed=1.0):
+    """Arrival offsets (s) of the invocations recorded in a SeBS processed JSON, from their
+    `times.client_begin`, replayed `speed` times faster."""
+    columns = load_invocation_columns(file_path, invocation_key(benchmark), ["times.client_begin"])
+    if "times.client_begin" not in columns:
+        raise ValueError(f"{file_path} has no client timestamps for {benchmark}")
+    begins = np.asarray(columns["times.client_begin"])
+    begins = np.sort(begins[~np.isnat(begins)])
+    return (begins - begins[0]) / np.timedelta64(1, "s") / speed
+
+
+def poisson_arrivals(rate, duration, rng=None):
+    """Arrival offsets (s) of a Poisson process of `rate` requests per second over `duration` seconds."""
+    rng = rng or np.random.default_rng()
+    return np.sort(rng.uniform(0, duration, rng.poisson(rate * duration)))
+
+
+def diurnal_arrivals(rate, duration, period=DEFAULT_PERIOD, amplitude=DEFAULT_AMPLITUDE, rng=None):
+    """Arrival offsets (s) of a Poisson process whose rate follows rate * (1 + amplitude * sin(2 pi t / period)),
+    by thinning a Poisson process at the peak rate."""
+    rng = rng or np.random.default_rng()
+    peak = rate * (1 + amplitude)
+    candidates = poisson_arrivals(peak, duration, rng)
+    accept = rate * (1 + amplitude * np.sin(2 * np.pi * candidates / period)) / peak
+    return candidates[rng.random(len(candidates)) < accept]
+
+
+def bursty_arrivals(rate, duration, burst_size=DEFAULT_BURST_SIZE, burst_spread=DEFAULT_BURST_SPREAD, rng=None):
+    """Arrival offsets (s) of bursts of `burst_size` requests spread uniformly over `burst_spread`
+    seconds, with the bursts arriving as a Poisson process so that the mean rate is `rate`."""
+    rng = rng or np.random.default_rng()
+    bursts = poisson_arrivals(rate / burst_size, duration, rng)
+    offsets = np.repeat(bursts, burst_size) + rng.uniform(0, burst_spread, len(bursts) * burst_size)
+    return np.sort(offsets[offsets < duration])
+
+
+def _target(url):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"unsupported URL {url}")
+    https = parts.scheme == "https"
+    return Target(parts.hostname, parts.port or (443 if https else 80), ssl.create_default_context() if https else None,
+                  parts.path or "/")
+
+
+def _request_bytes(host, path, payload, keep_alive=False):
+    # SeBS's HTTP trigger opens a connection per request, so unless connections are pooled the
+    # request asks the server to close it.
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + payload
+
+
+async def _read_response(reader, status_line):
+    # Status code, headers (lower-case names) and body of one HTTP/1.1 response after its status line.
+    if not status_line:
+        raise ConnectionResetError("connection closed before the response")
+    status = int(status_line.split(None, 2)[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return status, headers, b"".join(chunks)
+    if "content-length" in headers:
+        return status, headers, await reader.readexactly(int(headers["content-length"]))
+    return status, headers, await reader.read()
+
+
+def _reusable(headers):
+    # Whether the connection can carry another request after this response was read in full.
+    framed = "content-length" in headers or headers.get("transfer-encoding", "").lower() == "chunked"
+    return framed and headers.get("connection", "").lower() != "close"
+
+
+class ConnectionPool:
+    """HTTP/1.1 keep-alive connections to one endpoint. A request takes an idle connection or, when
+    none is idle, opens a new one; the number open is bounded by the requests in flight."""
+
+    def __init__(self, target, address):
+        self.target, self.address = target, address
+        self.idle = []
+
+    async def acquire(self):
+        """(reader, writer, reused) of a connection for one request."""
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        return (*await _open(self.target, self.address), False)
+
+    def release(self, reader, writer):
+        self.idle.append((reader, writer))
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+async def _open(target, address):
+    return await asyncio.open_connection(*address, ssl=target.ssl, server_hostname=target.host if target.ssl else None)
+
+
+async def _invoke(target, address, request, pool=None):
+    # One request, on a connection from `pool` or a fresh one to the resolved `address`, with the
+    # client timings SeBS records (seconds) and whether the connection was reused.
+    client_begin = time.time()
+    start = time.perf_counter()
+    reader, writer, reused = await pool.acquire() if pool else (*await _open(target, address), False)
+    keep = False
+    try:
+        http_startup = time.perf_counter() - start
+        writer.write(request)
+        status_line = await reader.readline()
+        if not status_line and reused:
+            # The server closed the idle connection in the meantime; retry once on a new one.
+            writer.close()
+            reader, writer = await _open(target, address)
+            reused = False
+            http_startup = time.perf_counter() - start
+            writer.write(request)
+            status_line = await reader.readline()
+        first_byte = time.perf_counter() - start
+        status, headers, body = await _read_response(reader, status_line)
+        keep = pool is not None and _reusable(headers)
+    finally:
+        if keep:
+            pool.release(reader, writer)
+        else:
+            writer.close()
+    client = time.perf_counter() - start
+    return status, body, {"client_begin": client_begin, "http_startup": http_startup,
+                          "http_first_byte_return": first_byte, "client": client, "connection_reused": reused}
+
+
+async def _replay_one(target, address, request, semaphore, timeout, pool):
+    # The raw response; records are built once the replay is over, to keep the event loop free for sending.
+    async with semaphore:
+        started = time.time()
+        try:
+            return await asyncio.wait_for(_invoke(target, address, request, pool), timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as error:
+            elapsed = time.time() - started
+            return None, repr(error), {"client_begin": started, "http_startup": elapsed,
+                                       "http_first_byte_return": elapsed, "client": elapsed,
+                                       "connection_reused": False}
+
+
+def _replay_record(status, body, timings, scheduled):
+    failure = status is None or status >= 400
+    if status is None:
+        body = {"error": body}
+    else:
+        try:
+            body = json.loads(body) if body else {}
+        except ValueError:
+            body, failure = {"result": body.decode("utf-8", "replace")}, True
+        if not isinstance(body, dict):
+            body = {"result": body}
+
+    record = sebs_record(body, timings)
+    record["stats"]["failure"] = record["stats"]["failure"] or failure
+    record["times"]["scheduled_begin"] = sebs_timestamp(scheduled)
+    record["times"]["arrival_lag"] = int(max(timings["client_begin"] - scheduled, 0) * 1e6)
+    return record
+
+
+async def replay(url, arrivals, event, max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=DEFAULT_TIMEOUT, start_time=None,
+                 keep_alive=False):
+    """POST `event` to `url` at every arrival offset (s) and return the SeBS processed records by request id.
+
+    Requests start when they are due, whether or not earlier ones have returned, so a slow endpoint
+    does not slow the arrival process down. Each record keeps its `times.scheduled_begin`, and
+    `times.arrival_lag` (us) is how late the request actually started, which shows when the
+    generator itself, or `max_in_flight`, could not keep up. The host name is resolved once.
+    Offsets count from `start_time` (epoch seconds), or from now.
+
+    With `keep_alive`, requests share a ConnectionPool instead of opening a connection each, so
+    only the first request on every connection pays the TCP/TLS handshake in `times.http_startup`;
+    `times.connection_reused` marks the others.
+    """
+    target = _target(url)
+    request = _request_bytes(target.host, target.path, json.dumps(event).encode(), keep_alive)
+    semaphore = asyncio.Semaphore(max_in_flight)
+    loop = asyncio.get_running_loop()
+    address = (await loop.getaddrinfo(target.host, target.port, type=socket.SOCK_STREAM))[0][4][:2]
+    pool = ConnectionPool(target, address) if keep_alive else None
+    wall_start = time.time() if start_time is None else start_time
+    start = loop.time() + wall_start - time.time()
+
+    tasks = []
+    for offset in np.asarray(arrivals, dtype=float):
+        delay = start + offset - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(loop.create_task(_replay_one(target, address, request, semaphore, timeout, pool)))
+    responses = await asyncio.gather(*tasks)
+    if pool:
+        pool.close()
+
+    records = [_replay_record(*response, wall_start + offset) for response, offset in zip(responses, arrivals)]
+    return dict(sorted((record["request_id"], record) for record in records))
+
+
+def _replay_worker(url, arrivals, event, max_in_flight, timeout, start_time, keep_alive):
+    _raise_open_file_limit()
+    return asyncio.run(replay(url, arrivals, event, max_in_flight, timeout, start_time, keep_alive))
+
+
+def replay_parallel(url, arrivals, event, workers=DEFAULT_WORKERS, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                    timeout=DEFAULT_TIMEOUT, keep_alive=False):
+    """`replay` from `workers` processes, each with its own event loop, for rates one core cannot
+    send. Arrivals are dealt out in turn, so every worker replays a thinned copy of the pattern,
+    and all of them count from the same start; `max_in_flight` and connection pools are per worker."""
+    arrivals = np.asarray(arrivals, dtype=float)
+    if workers <= 1:
+        _raise_open_file_limit()
+        return asyncio.run(replay(url, arrivals, event, max_in_flight, timeout, keep_alive=keep_alive))
+
+    start_time = time.time() + WORKER_START_DELAY
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        parts = pool.map(_replay_worker, itertools.repeat(url), [arrivals[i::workers] for i in range(workers)],
+                         itertools.repeat(event), itertools.repeat(max_in_flight), itertools.repeat(timeout),
+                         itertools.repeat(start_time), itertools.repeat(keep_alive))
+        records = {}
+        for part in parts:
+            records.update(part)
+    return dict(sorted(records.items()))
+
+
+def replay_summary(records):
+    """Requests sent, failures, requests on reused connections, achieved rate (requests per second
+    between the first and last request sent) and arrival lag percentiles (ms)."""
+    times = [record["times"] for record in records.values()]
+    begins = np.array([t["client_begin"] for t in times], dtype="datetime64[us]")
+    lags = np.array([t["arrival_lag"] for t in times]) / 1000
+    span = (begins.max() - begins.min()) / np.timedelta64(1, "s") if len(begins) else 0
+    return {"requests": len(records), "failures": sum(bool(record["stats"]["failure"]) for record in records.values()),
+            "reused": sum(bool(t.get("connection_reused")) for t in times),
+            "rate": len(records) / span if span > 0 else np.nan,
+            "lag_p50_ms": np.percentile(lags, 50) if len(lags) else np.nan,
+            "lag_p99_ms": np.percentile(lags, 99) if len(lags) else np.nan}
+
+
+def write_replay(output_root, benchmark, arch, memory, records, begin_time, end_time, run_type="warm"):
+    """Write the records as `cost/<benchmark>/<arch>/<run_type>_results_<memory>-processed.json` and
+    as the (memory, run type) cell of `perf/result_<arch>_<benchmark>.csv` under `output_root`,
+    keeping the other cells of that file; returns the written paths."""
+    cost_dir = os.path.join(output_root, "cost", benchmark, arch)
+    perf_dir = os.path.join(output_root, "perf")
+    os.makedirs(cost_dir, exist_ok=True)
+    os.makedirs(perf_dir, exist_ok=True)
+
+    json_path = os.path.join(cost_dir, f"{run_type}_results_{memory}-processed.json")
+    with open(json_path, "w") as f:
+        json.dump(sebs_experiment(benchmark, arch, records, begin_time, end_time), f, indent=2, sort_keys=True)
+    csv_path = os.path.join(perf_dir, f"result_{arch}_{benchmark}.csv")
+    rows = result_rows(records, memory, run_type)
+    if os.path.exists(csv_path):
+        existing = pd.read_csv(csv_path)
+        existing = existing[(existing["memory"] != memory) | (existing["type"] != run_type)]
+        # A stable sort keeps every cell's rows in the request id order of its processed JSON,
+        # which the invocation table matches them by.
+        rows = pd.concat([existing, rows], ignore_index=True).sort_values(["memory", "type"], kind="stable")
+    rows.to_csv(csv_path, index=False)
+    return [json_path, csv_path]
+
+
+def _raise_open_file_limit():
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an arrival pattern against an HTTP endpoint and record "
+                                                 "the invocations in the SeBS result layout.")
+    parser.add_argument("url", help="Endpoint to POST the event to, e.g. http://127.0.0.1:8000/invoke/<b>/<memory>")
+    parser.add_argument("output_root", help="Directory the 'cost' and 'perf' results are written to")
+    parser.add_argument("--benchmark", required=True, help="Benchmark the results are filed under")
+    parser.add_argument("--arch", choices=list(ARCHITECTURES), default="x86",
+                        help="Architecture the results are filed under")
+    parser.add_argument("--memory", type=int, required=True, help="Memory size (MB) the results are filed under")
+    parser.add_argument("--run-type", choices=RUN_TYPES, default="warm", help="Run type the results are filed under")
+    parser.add_argument("--event", default="{}", help="JSON event to send, or @<file> to read it from a file")
+    parser.add_argument("--pattern", choices=PATTERNS, default="poisson")
+    parser.add_argument("--trace", help="SeBS processed JSON whose client_begin timestamps are replayed")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay the trace this many times faster")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Mean requests per second")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds of arrivals")
+    parser.add_argument("--period", type=float, default=DEFAULT_PERIOD, help="Diurnal period in seconds")
+    parser.add_argument("--amplitude", type=float, default=DEFAULT_AMPLITUDE, help="Diurnal relative amplitude")
+    parser.add_argument("--burst-size", type=int, default=DEFAULT_BURST_SIZE)
+    parser.add_argument("--burst-spread", type=float, default=DEFAULT_BURST_SPREAD,
+                        help="Seconds over which a burst's requests are spread")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT, help="Per worker process")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Processes sending requests, for rates beyond one core")
+    parser.add_argument("--keep-alive", action="store_true",
+                        help="Reuse HTTP/1.1 connections instead of opening one per request")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds before a request fails")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.pattern == "trace":
+        if not args.trace:
+            parser.error("--pattern trace needs --trace")
+        arrivals = trace_arrivals(args.trace, args.benchmark, args.speed)
+    elif args.pattern == "poisson":
+        arrivals = poisson_arrivals(args.rate, args.duration, rng)
+    elif args.pattern == "diurnal":
+        arrivals = diurnal_arrivals(args.rate, args.duration, args.period, args.amplitude, rng)
+    else:
+        arrivals = bursty_arrivals(args.rate, args.duration, args.burst_size, args.burst_spread, rng)
+
+    if args.event.startswith("@"):
+        with open(args.event[1:]) as f:
+            event = json.load(f)
+    else:
+        event = json.loads(args.event)
+
+    begin_time = time.time()
+    records = replay_parallel(args.url, arrivals, event, args.workers, args.max_in_flight, args.timeout,
+                              args.keep_alive)
+    end_time = time.time()
+    written = write_replay(args.output_root, args.benchmark, args.arch, args.memory, records, begin_time, end_time,
+                           args.run_type)
+
+    summary = replay_summary(records)
+    print(f"{summary['requests']} requests ({summary['failures']} failed, {summary['reused']} on reused "
+          f"connections) at {summary['rate']:.1f}/s, "
+          f"arrival lag p50 {summary['lag_p50_ms']:.1f} ms, p99 {summary['lag_p99_ms']:.1f} ms")
+    print(f"Wrote {', '.join(written)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+import argparse
+import http.client
+import json
+import math
+import multiprocessing
+import os
+import platform
+import signal
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from evaluation.invocation_table import ARCHITECTURES, RUN_TYPES
+from evaluation.local_workloads import WORKLOADS, LocalObjectStore, prepare_input, serve_container
+from evaluation.synthetic import sebs_experiment, sebs_timestamp
+
+# Lambda gives a function one full vCPU at 1769 MB and CPU time in proportion to memory below that.
+# Containers with less are stopped and continued within every CPU_PERIOD seconds to match, like a
+# cgroup CPU quota.
+FULL_CPU_MEMORY = 1769
+CPU_PERIOD = 0.02
+DEFAULT_MEMORY_SIZES = [128, 256, 512, 1024]
+DEFAULT_REPETITIONS = 10
+DEFAULT_CONCURRENT_INVOCATIONS = 5
+RESULT_COLUMNS = ["memory", "type", "is_cold", "exec_time", "connection_time", "client_time", "provider_time",
+                  "mem_used"]
+LOCAL_ARCHITECTURES = {"aarch64": "arm", "arm64": "arm", "x86_64": "x86", "amd64": "x86"}
+
+
+@contextmanager
+def _cpu_quota(pid, share):
+    if share >= 1:
+        yield
+        return
+
+    done = threading.Event()
+
+    def throttle():
+        while not done.wait(CPU_PERIOD * share):
+            os.kill(pid, signal.SIGSTOP)
+            time.sleep(CPU_PERIOD * (1 - share))
+            os.kill(pid, signal.SIGCONT)
+
+    thread = threading.Thread(target=throttle, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+        os.kill(pid, signal.SIGCONT)
+
+
+class Container:
+    """One fresh interpreter process serving a function, one invocation at a time."""
+
+    def __init__(self, context, benchmark, memory, storage_root):
+        start = time.perf_counter()
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=serve_container, args=(child, benchmark, storage_root, memory),
+                                       daemon=True)
+        self.process.start()
+        self.container_id = self.connection.recv()
+        # Process start-up and handler import, in microseconds, as Lambda's init duration.
+        self.initialization = (time.perf_counter() - start) * 1e6
+        self.cpu_share = min(1.0, memory / FULL_CPU_MEMORY)
+        self.invocations = 0
+
+    def invoke(self, request_id, event):
+        start = time.perf_counter()
+        self.connection.send((request_id, event))
+        with _cpu_quota(self.process.pid, self.cpu_share):
+            output = self.connection.recv()
+        self.invocations += 1
+        return output, (time.perf_counter() - start) * 1e6
+
+    @property
+    def alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class FunctionHost:
+    """The containers of one (benchmark, memory size) function. An invocation takes an idle
+    container or, when none is idle, starts a new one: a cold start."""
+
+    def __init__(self, benchmark, memory, storage_root):
+        self.benchmark, self.memory, self.storage_root = benchmark, memory, storage_root
+        self.context = multiprocessing.get_context("spawn")
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def invoke(self, event):
+        with self.lock:
+            container = self.idle.pop() if self.idle else None
+        if container is None:
+            container = Container(self.context, self.benchmark, self.memory, self.storage_root)
+
+        initialization = container.initialization if container.invocations == 0 else 0
+        request_id = str(uuid.uuid4())
+        output, execution = container.invoke(request_id, event)
+        memory_used, failure = output.pop("memory_used"), output.pop("failure")
+        if container.alive:
+            with self.lock:
+                self.idle.append(container)
+
+        billed_time = math.ceil(execution / 1000)
+        provider = {"initialization": int(initialization), "execution": int(execution), "billed_time": billed_time,
+                    "memory": self.memory, "memory_used": memory_used, "cold_start": initialization > 0,
+                    "failure": failure}
+        return dict(output, provider=provider)
+
+    def reset(self):
+        """Discard every idle container, as updating the function does, so the next invocations start cold."""
+        with self.lock:
+            containers, self.idle = self.idle, []
+        for container in containers:
+            container.stop()
+
+
+class LocalLambda(ThreadingHTTPServer):
+    """HTTP stand-in for Lambda functions: POST /invoke/<benchmark>/<memory> with the JSON event
+    runs it and returns the function output with a `provider` block of the times and billing Lambda
+    would log; POST /reset/<benchmark>/<memory> forces cold starts."""
+
+    daemon_threads = True
+    # Lambda accepts every connection of a burst; socketserver's default backlog of 5 would drop
+    # SYNs and add retransmission timeouts to the connection time.
+    request_queue_size = 1024
+
+    def __init__(self, address, storage_root):
+        super().__init__(address, _LocalLambdaHandler)
+        self.storage_root = storage_root
+        self.functions = {}
+        self.functions_lock = threading.Lock()
+
+    def function(self, benchmark, memory):
+        with self.functions_lock:
+            key = (benchmark, memory)
+            if key not in self.functions:
+                self.functions[key] = FunctionHost(benchmark, memory, self.storage_root)
+            return self.functions[key]
+
+    def server_close(self):
+        super().server_close()
+        for function in self.functions.values():
+            function.reset()
+
+
+class _LocalLambdaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if len(parts) != 3 or parts[0] not in ("invoke", "reset") or parts[1] not in WORKLOADS \
+                or not parts[2].isdigit():
+            return self._respond(404, {"error": f"unknown function {self.path}"})
+
+        function = self.server.function(parts[1], int(parts[2]))
+        if parts[0] == "reset":
+            function.reset()
+            return self._respond(200, {})
+        return self._respond(200, function.invoke(json.loads(body or b"{}")))
+
+    def _respond(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(storage_root, host="127.0.0.1", port=0):
+    """Start a LocalLambda on a background thread; port 0 picks a free port (see server_address)."""
+    server = LocalLambda((host, port), storage_root)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _post(address, path, payload):
+    # One request on a fresh connection, as SeBS's HTTP trigger makes them, with its client timings.
+    client_begin = time.time()
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection(*address)
+    connection.connect()
+    http_startup = time.perf_counter() - start
+    connection.request("POST", path, json.dumps(payload), {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    first_byte = time.perf_counter() - start
+    body = json.loads(response.read())
+    client = time.perf_counter() - start
+    connection.close()
+    return body, {"client_begin": client_begin, "http_startup": http_startup, "http_first_byte_return": first_byte,
+                  "client": client}
+
+
+def sebs_record(body, timings):
+    """The SeBS processed record of one HTTP invocation, from the response body and the client's
+    timings (seconds), plus whether the request went over a reused connection. Endpoints other than
+    the stand-in, without its `provider` block or the function's begin/end, leave the billing,
+    provider and benchmark times empty."""
+    provider = body.pop("provider", {})
+    begin, end = body.get("begin"), body.get("end")
+    billed_time, memory = provider.get("billed_time"), provider.get("memory")
+    memory_used = provider.get("memory_used")
+    return {
+        "billing": {"_billed_time": billed_time,
+                    "_gb_seconds": None if billed_time is None or memory is None else billed_time * memory,
+                    "_memory": memory},
+        "output": body,
+        "provider_times": {"execution": provider.get("execution"), "initialization": provider.get("initialization")},
+        "request_id": body.get("request_id") or str(uuid.uuid4()),
+        "stats": {"cold_start": provider.get("cold_start", bool(body.get("is_cold"))),
+                  "failure": provider.get("failure", False),
+                  "memory_used": None if memory_used is None else round(memory_used, 1)},
+        "times": {
+            "benchmark": int((float(end) - float(begin)) * 1e6) if begin and end else None,
+            "client": int(timings["client"] * 1e6),
+            "client_begin": sebs_timestamp(timings["client_begin"]),
+            "client_end": sebs_timestamp(timings["client_begin"] + timings["client"]),
+            "connection_reused": timings.get("connection_reused", False),
+            "http_first_byte_return": round(timings["http_first_byte_return"], 6),
+            "http_startup": round(timings["http_startup"], 6),
+            "initialization": 0,
+        },
+    }
+
+
+def result_rows(records, memory, run_type):
+    """The result.csv rows SeBS writes for `records` of one (memory size, run type) cell, in their order."""
+    return pd.DataFrame([{
+        "memory": memory,
+        "type": run_type,
+        "is_cold": bool(record["output"].get("is_cold")),
+        "exec_time": record["times"]["benchmark"],
+        "connection_time": record["times"]["http_startup"],
+        "client_time": record["times"]["client"],
+        "provider_time": record["provider_times"]["execution"],
+        "mem_used": record["stats"]["memory_used"],
+    } for record in records.values()], columns=RESULT_COLUMNS)
+
+
+def run_cell(address, benchmark, memory, run_type, event, repetitions=DEFAULT_REPETITIONS,
+             concurrency=DEFAULT_CONCURRENT_INVOCATIONS):
+    """Invoke one function `repetitions` times in batches of `concurrency` simultaneous requests,
+    as SeBS perf-cost does, and return its processed records and result.csv rows in request id order.
+
+    Cold runs reset the function before every batch; warm runs first send one unrecorded batch.
+    """
+    path = f"/invoke/{benchmark}/{memory}"
+    records = {}
+    with ThreadPoolExecutor(concurrency) as pool:
+        if run_type == "warm":
+            list(pool.map(lambda _: _post(address, path, event), range(concurrency)))
+        while len(records) < repetitions:
+            if run_type == "cold":
+                _post(address, f"/reset/{benchmark}/{memory}", {})
+            batch = min(concurrency, repetitions - len(records))
+            for body, timings in pool.map(lambda _: _post(address, path, event), range(batch)):
+                record = sebs_record(body, timings)
+                records[record["request_id"]] = record
+
+    records = dict(sorted(records.items()))
+    return records, result_rows(records, memory, run_type)
+
+
+def run_campaign(output_root, benchmarks=None, memory_sizes=None, arch=None, repetitions=DEFAULT_REPETITIONS,
+                 concurrency=DEFAULT_CONCURRENT_INVOCATIONS, input_size="test"):
+    """Run the perf-cost experiments of `benchmarks` against a local stand-in and write
+    `cost/<benchmark>/<arch>/*-processed.json` and `perf/result_<arch>_<benchmark>.csv` under
+    `output_root`, in the layout the evaluation scripts read. Returns the written paths."""
+    benchmarks = list(WORKLOADS) if benchmarks is None else list(benchmarks)
+    memory_sizes = memory_sizes or DEFAULT_MEMORY_SIZES
+    arch = arch or LOCAL_ARCHITECTURES.get(platform.machine().lower(), "x86")
+    storage = LocalObjectStore(os.path.join(output_root, "storage"))
+    server = start_server(storage.root)
+    written = []
+    try:
+        os.makedirs(os.path.join(output_root, "perf"), exist_ok=True)
+        for benchmark in benchmarks:
+            event = prepare_input(benchmark, input_size, storage)
+            cost_dir = os.path.join(output_root, "cost", benchmark, arch)
+            os.makedirs(cost_dir, exist_ok=True)
+            frames = []
+            for memory in memory_sizes:
+                for run_type in RUN_TYPES:
+                    begin_time = time.time()
+                    records, rows = run_cell(server.server_address, benchmark, memory, run_type, event, repetitions,
+                                             concurrency)
+                    path = os.path.join(cost_dir, f"{run_type}_results_{memory}-processed.json")
+                    with open(path, "w") as f:
+                        json.dump(sebs_experiment(benchmark, arch, records, begin_time, time.time()), f, indent=2,
+                                  sort_keys=True)
+                    written.append(path)
+                    frames.append(rows)
+
+            path = os.path.join(output_root, "perf", f"result_{arch}_{benchmark}.csv")
+            pd.concat(frames).to_csv(path, index=False)
+            written.append(path)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run SeBS-style perf-cost experiments against local stand-in "
+                                                 "Lambda functions, or only serve them.")
+    parser.add_argument("output_root", help="Directory the 'cost', 'perf' and 'storage' data are written to")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(WORKLOADS), help="Benchmarks to run")
+    parser.add_argument("--memory-sizes", nargs="+", type=int, help="Memory sizes in MB")
+    parser.add_argument("--arch", choices=list(ARCHITECTURES), help="Architecture the results are filed under")
+    parser.add_argument("--repetitions", type=int, default=DEFAULT_REPETITIONS)
+    parser.add_argument("--concurrent-invocations", type=int, default=DEFAULT_CONCURRENT_INVOCATIONS)
+    parser.add_argument("--input-size", default="test", choices=["test", "small", "large"])
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="Only serve the functions on this port until interrupted")
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        storage = LocalObjectStore(os.path.join(args.output_root, "storage"))
+        for benchmark in args.benchmarks or WORKLOADS:
+            prepare_input(benchmark, args.input_size, storage)
+        server = LocalLambda(("127.0.0.1", args.serve), storage.root)
+        print(f"Serving {', '.join(args.benchmarks or WORKLOADS)} on http://127.0.0.1:{args.serve}/invoke/...")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    written = run_campaign(args.output_root, args.benchmarks, args.memory_sizes, args.arch, args.repetitions,
+                           args.concurrent_invocations, args.input_size)
+    print(f"Wrote {len(written)} files under {args.output_root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import html
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+try:
+    import resource
+except ImportError:  # Windows: memory usage is not reported, so the limit is not enforced.
+    resource = None
+
+import numpy as np
+
+GRAPH_EDGES_PER_NODE = 10
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-6
+# SeBS input sizes: list length for dynamic-html, nodes for the graphs, bytes per file and files
+# for compression.
+INPUT_SIZES = {
+    "110.dynamic-html": {"test": 10, "small": 1000, "large": 100000},
+    "311.compression": {"test": (2 ** 20, 4), "small": (2 ** 22, 8), "large": (2 ** 24, 16)},
+    "501.graph-pagerank": {"test": 10, "small": 10000, "large": 100000},
+    "502.graph-mst": {"test": 10, "small": 10000, "large": 100000},
+    "503.graph-bfs": {"test": 10, "small": 10000, "large": 100000},
+}
+INPUT_BUCKET = "input"
+OUTPUT_BUCKET = "output"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+  <head><title>Randomly generated data.</title></head>
+  <body>
+    <p>Welcome {username}!</p>
+    <p>Data generated at: {cur_time}!</p>
+    <p>Requested random numbers:</p>
+    <ul>
+{items}
+    </ul>
+  </body>
+</html>
+"""
+
+
+def _microseconds(start, stop):
+    return (stop - start) * 1e6
+
+
+class LocalObjectStore:
+    """Directory-backed stand-in for S3: bucket/key maps to <root>/<bucket>/<key>."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, bucket, key):
+        return os.path.join(self.root, bucket, key)
+
+    def keys(self, bucket, prefix=""):
+        directory = os.path.join(self.root, bucket)
+        return sorted(os.path.relpath(os.path.join(dirpath, name), directory)
+                      for dirpath, _, names in os.walk(directory) for name in names
+                      if os.path.relpath(os.path.join(dirpath, name), directory).startswith(prefix))
+
+    def upload(self, bucket, key, file_path):
+        target = self.path(bucket, key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(file_path, target)
+
+    def download(self, bucket, key, file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        shutil.copyfile(self.path(bucket, key), file_path)
+
+
+def dynamic_html(event, storage):
+    numbers = np.random.default_rng().integers(0, 1000000, event["random_len"])
+    items = "\n".join(f"      <li>{number}</li>" for number in numbers)
+    page = PAGE_TEMPLATE.format(username=html.escape(event["username"]), cur_time=time.strftime("%Y-%m-%d %H:%M:%S"),
+                                items=items)
+    return {"size": len(page)}
+
+
+def compression(event, storage):
+    prefix = event["object"]["key"]
+    with tempfile.TemporaryDirectory() as work_dir:
+        source_dir = os.path.join(work_dir, prefix)
+        start = time.perf_counter()
+        keys = storage.keys(event["bucket"]["input"], prefix)
+        for key in keys:
+            storage.download(event["bucket"]["input"], key, os.path.join(work_dir, key))
+        downloaded = time.perf_counter()
+        download_size = sum(os.path.getsize(os.path.join(work_dir, key)) for key in keys)
+
+        archive = shutil.make_archive(os.path.join(work_dir, "archive"), "zip", source_dir)
+        compressed = time.perf_counter()
+        storage.upload(event["bucket"]["output"], f"{prefix}.zip", archive)
+        uploaded = time.perf_counter()
+        upload_size = os.path.getsize(archive)
+
+    return {"measurement": {
+        "download_time": _microseconds(start, downloaded),
+        "download_size": download_size,
+        "compute_time": _microseconds(downloaded, compressed),
+        "upload_time": _microseconds(compressed, uploaded),
+        "upload_size": upload_size,
+    }}
+
+
+def barabasi_albert(nodes, edges_per_node, rng):
+    """Edges (sources, targets) of a Barabasi-Albert graph: every new node links to up to
+    `edges_per_node` existing nodes picked in proportion to their degree."""
+    sources, targets = [], []
+    # Every edge endpoint appears once in `endpoints`, so a uniform draw from it is degree-weighted.
+    endpoints = np.empty(2 * nodes * edges_per_node, dtype=np.int64)
+    filled = 0
+    for node in range(1, nodes):
+        if filled == 0:
+            picked = np.zeros(1, dtype=np.int64)
+        else:
+            picked = np.unique(endpoints[rng.integers(0, filled, min(edges_per_node, node))])
+        sources.append(np.full(len(picked), node))
+        targets.append(picked)
+        endpoints[filled:filled + len(picked)] = picked
+        endpoints[filled + len(picked):filled + 2 * len(picked)] = node
+        filled += 2 * len(picked)
+    if not sources:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(sources), np.concatenate(targets)
+
+
+def _undirected_csr(nodes, sources, targets):
+    heads = np.concatenate([sources, targets])
+    tails = np.concatenate([targets, sources])
+    order = np.argsort(heads, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(heads, minlength=nodes))])
+    return offsets, tails[order]
+
+
+def _generate_graph(event):
+    start = time.perf_counter()
+    rng = np.random.default_rng(event.get("seed"))
+    sources, targets = barabasi_albert(event["size"], GRAPH_EDGES_PER_NODE, rng)
+    return start, time.perf_counter(), sources, targets, rng
+
+
+def _graph_result(start, generated, computed, result):
+    return {"result": result, "measurement": {"graph_generating_time": _microseconds(start, generated),
+                                              "compute_time": _microseconds(generated, computed)}}
+
+
+def pagerank(event, storage):
+    start, generated, sources, targets, _ = _generate_graph(event)
+    nodes = event["size"]
+    heads, tails = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+    degree = np.bincount(heads, minlength=nodes).astype(float)
+    ranks = np.full(nodes, 1 / nodes)
+    for _ in range(100):
+        shares = np.where(degree > 0, ranks / np.maximum(degree, 1), 0)
+        dangling = ranks[degree == 0].sum()
+        updated = (1 - PAGERANK_DAMPING) / nodes + PAGERANK_DAMPING * (
+            np.bincount(tails, shares[heads], minlength=nodes) + dangling / nodes)
+        converged = np.abs(updated - ranks).sum() < PAGERANK_TOLERANCE
+        ranks = updated
+        if converged:
+            break
+    return _graph_result(start, generated, time.perf_counter(), float(ranks[0]))
+
+
+def mst(event, storage):
+    start, generated, sources, targets, rng = _generate_graph(event)
+    weights = rng.random(len(sources))
+    parent = np.arange(event["size"])
+
+    def root(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    tree = []
+    for edge in np.argsort(weights, kind="stable"):
+        a, b = root(sources[edge]), root(targets[edge])
+        if a != b:
+            parent[a] = b
+            tree.append(int(edge))
+    return _graph_result(start, generated, time.perf_counter(), len(tree))
+
+
+def bfs(event, storage):
+    start, generated, sources, targets, _ = _generate_graph(event)
+    offsets, neighbours = _undirected_csr(event["size"], sources, targets)
+    visited = np.zeros(event["size"], dtype=bool)
+    visited[0] = True
+    frontier, order = np.array([0]), [0]
+    while len(frontier):
+        reached = np.concatenate([neighbours[offsets[node]:offsets[node + 1]] for node in frontier])
+        frontier = np.unique(reached[~visited[reached]])
+        visited[frontier] = True
+        order.extend(frontier.tolist())
+    return _graph_result(start, generated, time.perf_counter(), len(order))
+
+
+# Handlers of the local Lambda stand-in, modelled on the SeBS benchmarks of the same name. Each takes
+# the event SeBS would send and an object store and returns the function's `result` the way the SeBS
+# wrappers report it, with `measurement` times in microseconds and sizes in bytes.
+WORKLOADS = {
+    "110.dynamic-html": dynamic_html,
+    "311.compression": compression,
+    "501.graph-pagerank": pagerank,
+    "502.graph-mst": mst,
+    "503.graph-bfs": bfs,
+}
+
+
+def serve_container(connection, benchmark, storage_root, memory):
+    """Entry point of a container process of the local Lambda stand-in.
+
+    Sends its container id once the handler is loaded, then answers every (request id, event)
+    message with the SeBS wrapper's `output` plus the peak memory used in MB, until it receives
+    None. Like Lambda, it exits after an invocation that used more than `memory` MB.
+    """
+    handler = WORKLOADS[benchmark]
+    storage = LocalObjectStore(storage_root)
+    container_id = uuid.uuid4().hex[:8]
+    connection.send(container_id)
+
+    cold = True
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        request_id, event = message
+        begin = time.time()
+        try:
+            result, failure = handler(event, storage), False
+        except Exception as error:
+            result, failure = {"error": repr(error)}, True
+        end = time.time()
+
+        memory_used = None if resource is None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        exceeded = memory_used is not None and memory_used > memory
+        connection.send({
+            "begin": f"{begin:.6f}", "end": f"{end:.6f}", "cold_start_var": "", "container_id": container_id,
+            "is_cold": cold, "request_id": request_id, "results_time": 0,
+            "result": {"error": "memory limit exceeded"} if exceeded else result,
+            "memory_used": memory_used, "failure": failure or exceeded,
+        })
+        cold = False
+        if exceeded:
+            break
+
+
+def prepare_input(benchmark, input_size, storage, seed=0):
+    """The event of one invocation; uploads the input objects to `storage` where the benchmark needs them."""
+    size = INPUT_SIZES[benchmark][input_size]
+    if benchmark == "110.dynamic-html":
+        return {"username": "testname", "random_len": size}
+    if benchmark == "311.compression":
+        file_size, files = size
+        prefix = f"compression-{input_size}"
+        rng = np.random.default_rng(seed)
+        with tempfile.TemporaryDirectory() as work_dir:
+            for i in range(files):
+                # Text-like data: a small alphabet with runs, so the archive compresses as real files do.
+                data = np.repeat(rng.integers(97, 123, file_size // 8, dtype=np.uint8), 8).tobytes()
+                path = os.path.join(work_dir, f"file-{i}.txt")
+                with open(path, "wb") as f:
+                    f.write(data[:file_size])
+                storage.upload(INPUT_BUCKET, f"{prefix}/file-{i}.txt", path)
+        return {"bucket": {"input": INPUT_BUCKET, "output": OUTPUT_BUCKET}, "object": {"key": prefix}}
+    return {"size": size, "seed": seed}
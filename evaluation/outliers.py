@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation.invocation_table import get_invocation_table
+from evaluation.resampling import bootstrap_mean_ci
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+
+CELL_KEYS = ["type", "benchmark", "memory", "architecture"]
+# An invocation is an outlier when any of these is far from the rest of its cell; connection_time
+# catches network stalls in the HTTP connection setup.
+OUTLIER_METRICS = ["client_time", "exec_time", "connection_time"]
+METHODS = ("mad", "iqr")
+# Modified z-score cut-off of Iglewicz and Hoaglin, and Tukey's "far out" fence in IQRs.
+MAD_THRESHOLD = 3.5
+IQR_FENCE = 3.0
+# Cells whose mean's CI is wider than this share of the mean need more repetitions.
+NOISY_CI_WIDTH = 0.1
+NOISY_METRICS = ["client_time", "exec_time"]
+
+
+def _robust_scores(values, groups, method):
+    # Distance of every value from its group's center in robust spread units; the flag threshold
+    # is MAD_THRESHOLD for "mad" and IQR_FENCE for "iqr".
+    series = pd.Series(values, dtype=float)
+    grouped = series.groupby(groups)
+    if method == "mad":
+        median = grouped.transform("median")
+        deviation = (series - median).abs()
+        mad = deviation.groupby(groups).transform("median")
+        # Where half the cell sits exactly on the median, fall back to the mean absolute deviation.
+        mean_deviation = deviation.groupby(groups).transform("mean")
+        scale = np.where(mad > 0, mad / 0.6745, mean_deviation * 1.2533)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(scale > 0, deviation / scale, 0.0)
+    if method == "iqr":
+        q1, q3 = grouped.transform(lambda x: x.quantile(0.25)), grouped.transform(lambda x: x.quantile(0.75))
+        iqr = (q3 - q1).to_numpy()
+        beyond = np.maximum(q1 - series, series - q3).clip(lower=0).to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(iqr > 0, beyond / iqr, np.where(beyond > 0, np.inf, 0.0))
+    raise ValueError(f"Unknown outlier method {method!r}, expected one of {METHODS}")
+
+
+def _threshold(method):
+    return MAD_THRESHOLD if method == "mad" else IQR_FENCE
+
+
+def outlier_mask(values, method="mad"):
+    """Boolean mask of the outliers in one sample."""
+    values = np.asarray(values, dtype=float)
+    return _robust_scores(values, np.zeros(len(values), dtype=int), method) > _threshold(method)
+
+
+def annotate_outliers(table, metrics=OUTLIER_METRICS, method="mad"):
+    """Outlier columns on the table's index: `outlier_<metric>` per metric, `outlier` when any of
+    them is set and `outlier_metrics` naming them ("" for regular invocations). Each value is
+    judged against the other invocations of its (type, benchmark, memory, architecture) cell."""
+    groups = table.groupby(CELL_KEYS, observed=True).ngroup().to_numpy()
+    threshold = _threshold(method)
+    flags = pd.DataFrame(index=table.index)
+    for metric in metrics:
+        flags[f"outlier_{metric}"] = _robust_scores(table[metric].to_numpy(), groups, method) > threshold
+
+    columns = [f"outlier_{metric}" for metric in metrics]
+    flags["outlier"] = flags[columns].any(axis=1)
+    flagged = flags[columns].to_numpy()
+    flags["outlier_metrics"] = [
+        ", ".join(metric for metric, flag in zip(metrics, row) if flag) for row in flagged
+    ]
+    return flags
+
+
+def outlier_summary(table, annotations):
+    """Invocations, outliers and outlier fraction per cell, overall and per metric."""
+    flags = [column for column in annotations if column.startswith("outlier") and column != "outlier_metrics"]
+    joined = table[CELL_KEYS].join(annotations[flags])
+    summary = joined.groupby(CELL_KEYS, observed=True)[flags].mean()
+    summary.columns = [f"{column}_fraction" for column in summary.columns]
+    summary.insert(0, "outliers", joined.groupby(CELL_KEYS, observed=True)["outlier"].sum())
+    summary.insert(0, "invocations", joined.groupby(CELL_KEYS, observed=True).size())
+    summary = summary.reset_index()
+    for column in ["type", "benchmark", "architecture"]:
+        summary[column] = summary[column].astype(str)
+    return summary
+
+
+def outlier_invocations(table, annotations):
+    flagged = annotations["outlier"]
+    invocations = table.loc[flagged, CELL_KEYS + OUTLIER_METRICS].join(annotations.loc[flagged, "outlier_metrics"])
+    for column in ["type", "benchmark", "architecture"]:
+        invocations[column] = invocations[column].astype(str)
+    return invocations
+
+
+def noisy_cells(table, metrics=NOISY_METRICS, max_ci_width=NOISY_CI_WIDTH):
+    """Cells whose bootstrap CI of the mean is wider than `max_ci_width` of the mean for any of
+    `metrics`, with the relative width of each; these are the configurations to rerun."""
+    rows = []
+    for key, cell in table.groupby(CELL_KEYS, observed=True, sort=True):
+        row = dict(zip(CELL_KEYS, map(str, key)), invocations=len(cell))
+        for metric in metrics:
+            mean, (lower, upper) = bootstrap_mean_ci(cell[metric].to_numpy())
+            row[f"relative_ci_width_{metric}"] = (upper - lower) / mean if mean else np.nan
+        rows.append(row)
+
+    widths = pd.DataFrame(rows, columns=CELL_KEYS + ["invocations"] +
+                          [f"relative_ci_width_{metric}" for metric in metrics])
+    noisy = (widths[[f"relative_ci_width_{metric}" for metric in metrics]] > max_ci_width).any(axis=1)
+    return widths[noisy].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    table = get_invocation_table(PERF_DIR)
+    pd.set_option("display.width", 200)
+    print(outlier_summary(table, annotate_outliers(table)).to_string(index=False))
+    print(noisy_cells(table).to_string(index=False))
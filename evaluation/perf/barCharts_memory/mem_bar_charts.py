@@ -6,12 +6,12 @@ import pandas as pd
 import seaborn as sns
 
 from evaluation.utils import (
-    BENCHMARKS, ALPHABET_LABELS, LINE_COLORS, MEMORY_SIZES,
+    BENCHMARKS, ALPHABET_LABELS, LINE_COLORS, MEMORY_SIZES, STYLE_PATH,
     load_benchmark_data, setup_subplots, save_and_show_figure, add_ggplot_title,
     calculate_bootstrap_ci
 )
 
-plt.style.use("../../scientific.mplstyle")
+plt.style.use(STYLE_PATH)
 
 
 def create_bar_plots(bar_data, output_dir):
@@ -112,12 +112,7 @@ def create_line_plots(line_data, output_dir):
     summary.to_csv(os.path.join(output_dir, "summary_memory_usage.csv"), index=False)
 
 
-def main():
-    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
-
-    os.makedirs(output_dir, exist_ok=True)
-
+def prepare_data(results_dir):
     data_frames = []
     for benchmark in BENCHMARKS.keys():
         df = load_benchmark_data(results_dir, benchmark)
@@ -125,7 +120,16 @@ def main():
         df["label"] = df["architecture"] + " " + df["type"]
         data_frames.append(df)
 
-    all_data = pd.concat(data_frames, ignore_index=True)
+    return pd.concat(data_frames, ignore_index=True)
+
+
+def main():
+    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    all_data = prepare_data(results_dir)
 
     create_bar_plots(all_data, output_dir)
     create_line_plots(all_data, output_dir)
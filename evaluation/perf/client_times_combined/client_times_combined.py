@@ -5,12 +5,12 @@ import numpy as np
 import seaborn as sns
 
 from evaluation.utils import (
-    BENCHMARKS, ALPHABET_LABELS, LINE_COLORS, MEMORY_SIZES,
+    BENCHMARKS, ALPHABET_LABELS, LINE_COLORS, MEMORY_SIZES, STYLE_PATH,
     load_benchmark_data, setup_subplots, set_scientific_notation,
     save_and_show_figure, add_ggplot_title, calculate_bootstrap_ci
 )
 
-plt.style.use("../../scientific.mplstyle")
+plt.style.use(STYLE_PATH)
 
 
 def create_cold_boxplots(data_combined, output_dir):
@@ -155,17 +155,23 @@ def create_lineplots(data_combined, output_dir):
     save_and_show_figure(fig_lineplot, os.path.join(output_dir, "combined_lineplots_client_time.pdf"))
 
 
-def main():
-    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
-    os.makedirs(output_dir, exist_ok=True)
-
+def prepare_data(results_dir):
     data_combined = {}
     for benchmark in BENCHMARKS.keys():
         df = load_benchmark_data(results_dir, benchmark)
         df["label"] = df["architecture"] + " " + df["type"]
         data_combined[benchmark] = df
 
+    return data_combined
+
+
+def main():
+    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    data_combined = prepare_data(results_dir)
+
     create_cold_boxplots(data_combined, output_dir)
     create_warm_boxplots(data_combined, output_dir)
     create_lineplots(data_combined, output_dir)
@@ -2,22 +2,55 @@ import os
 
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 import seaborn as sns
 
+from evaluation.resampling import bootstrap_two_sample_ci
 from evaluation.utils import (
-    BENCHMARKS, ALPHABET_LABELS, MEMORY_SIZES, LINE_COLORS,
+    BENCHMARKS, ALPHABET_LABELS, MEMORY_SIZES, LINE_COLORS, STYLE_PATH,
     load_benchmark_data, save_and_show_figure, add_ggplot_title,
-    setup_subplots, calculate_bootstrap_ci
+    setup_subplots
 )
 
-plt.style.use("../../scientific.mplstyle")
+plt.style.use(STYLE_PATH)
+
+# Cold and warm samples are compared quantile by quantile on this grid instead of pairing every cold
+# invocation with every warm one, so the box plots stay the same size whatever the repetitions.
+RATIO_QUANTILES = np.arange(1, 100) / 100
+# "mean" or "median"; the line plots show the cold-to-warm ratio of this statistic.
+RATIO_CENTER = "mean"
+
+
+def quantile_ratios(df, metric="client_time", quantiles=RATIO_QUANTILES):
+    """Ratio of the cold to the warm `metric` quantile at every point of `quantiles`, per memory
+    size and architecture."""
+    grouped = df.groupby(["memory", "architecture", "type"], observed=True)[metric]
+    values = grouped.quantile(quantiles).unstack("type").reindex(columns=["cold", "warm"])
+    values.columns.name = None
+    values["ratio"] = values["cold"] / values["warm"]
+    values.index = values.index.set_names("quantile", level=-1)
+    return values.dropna(subset=["ratio"]).reset_index()[["memory", "architecture", "quantile", "ratio"]]
+
+
+def ratio_estimates(df, metric="client_time", center=RATIO_CENTER):
+    """Cold-to-warm ratio of the mean (or median) `metric` with its bootstrap CI, per memory size
+    and architecture. Cells missing either run type are left out."""
+    rows = []
+    for (memory, architecture), cell in df.groupby(["memory", "architecture"], observed=True):
+        cold = cell.loc[cell["type"] == "cold", metric].to_numpy()
+        warm = cell.loc[cell["type"] == "warm", metric].to_numpy()
+        if len(cold) == 0 or len(warm) == 0:
+            continue
+        ratio, (lower, upper) = bootstrap_two_sample_ci(cold, warm, statistic="ratio", center=center)
+        rows.append((memory, architecture, ratio, lower, upper))
+    return pd.DataFrame(rows, columns=["memory", "architecture", "ratio", "ci_lower", "ci_upper"])
 
 
 def create_ratio_boxplots(data_combined, output_dir):
     fig_boxplot, axes_boxplot = setup_subplots(2, 3)
 
     for idx, benchmark in enumerate(BENCHMARKS.keys()):
-        merged_data = data_combined[benchmark]
+        ratios = quantile_ratios(data_combined[benchmark])
         mem_sizes = MEMORY_SIZES[benchmark]
         ax = axes_boxplot[idx]
 
@@ -25,7 +58,7 @@ def create_ratio_boxplots(data_combined, output_dir):
             x="memory",
             y="ratio",
             hue="architecture",
-            data=merged_data,
+            data=ratios,
             palette="Set2",
             order=mem_sizes,
             ax=ax
@@ -61,30 +94,19 @@ def create_ratio_lineplots(data_combined, output_dir):
 
     for idx, benchmark in enumerate(BENCHMARKS.keys()):
         mem_sizes = MEMORY_SIZES[benchmark]
-        df = data_combined[benchmark]
+        estimates = ratio_estimates(data_combined[benchmark])
         ax = axes_lineplot[idx]
         x_positions = np.arange(len(mem_sizes))
 
         for arch in ["ARM", "x86"]:
-            subset = df[df["architecture"] == arch]
+            subset = estimates[estimates["architecture"] == arch]
             if subset.empty:
                 continue
 
-            means = []
-            lowers = []
-            uppers = []
-
-            for mem in mem_sizes:
-                vals = subset[subset["memory"] == mem]["ratio"].values
-                if len(vals) > 0:
-                    mean, (lower, upper) = calculate_bootstrap_ci(vals)
-                    means.append(mean)
-                    lowers.append(lower)
-                    uppers.append(upper)
-                else:
-                    means.append(np.nan)
-                    lowers.append(np.nan)
-                    uppers.append(np.nan)
+            subset = subset.set_index("memory").reindex(mem_sizes)
+            means = subset["ratio"].to_numpy()
+            lowers = subset["ci_lower"].to_numpy()
+            uppers = subset["ci_upper"].to_numpy()
 
             color = LINE_COLORS[f"{arch} cold"]
             ax.plot(x_positions, means, marker='o', color=color, label=f"{arch} cold")
@@ -117,18 +139,7 @@ def prepare_data(results_dir):
 
     for benchmark in BENCHMARKS.keys():
         all_data = load_benchmark_data(results_dir, benchmark)
-
-        cold_data = all_data[all_data["type"] == "cold"]
-        warm_data = all_data[all_data["type"] == "warm"]
-
-        merged_data = cold_data.merge(
-            warm_data,
-            on=["memory", "architecture"],
-            suffixes=("_cold", "_warm")
-        )
-        merged_data["ratio"] = merged_data["client_time_cold"] / merged_data["client_time_warm"]
-
-        data_combined[benchmark] = merged_data
+        data_combined[benchmark] = all_data[["memory", "architecture", "type", "client_time"]]
 
     return data_combined
 
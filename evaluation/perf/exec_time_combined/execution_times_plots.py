@@ -5,12 +5,12 @@ import numpy as np
 import seaborn as sns
 
 from evaluation.utils import (
-    BENCHMARKS, ALPHABET_LABELS, MEMORY_SIZES, LINE_COLORS,
+    BENCHMARKS, ALPHABET_LABELS, MEMORY_SIZES, LINE_COLORS, STYLE_PATH,
     load_benchmark_data, set_scientific_notation, save_and_show_figure,
     add_ggplot_title, calculate_bootstrap_ci, setup_subplots
 )
 
-plt.style.use("../../scientific.mplstyle")
+plt.style.use(STYLE_PATH)
 
 
 def create_execution_time_boxplots(data_combined, output_dir):
@@ -0,0 +1,82 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from evaluation.throughput import DIRECTIONS, IO_BENCHMARKS, io_throughput, throughput_line_data, throughput_summary
+from evaluation.utils import (
+    BENCHMARKS, ALPHABET_LABELS, LINE_COLORS, MEMORY_SIZES, STYLE_PATH,
+    figure_invocation_table, save_and_show_figure, add_ggplot_title, setup_subplots
+)
+
+plt.style.use(STYLE_PATH)
+
+
+def create_throughput_lineplots(summary, output_dir):
+    # One panel per benchmark and direction that transfers data; 120.uploader downloads nothing.
+    panels = [(benchmark, direction) for direction in DIRECTIONS for benchmark in IO_BENCHMARKS
+              if benchmark in BENCHMARKS and
+              ((summary["benchmark"] == benchmark) & (summary["direction"] == direction)).any()]
+    if not panels:
+        # None of the selected benchmarks transfers data, so there is nothing to plot.
+        return
+    fig_lineplot, axes_lineplot = setup_subplots(2, 4)
+
+    for idx, (benchmark, direction) in enumerate(panels):
+        mem_sizes = MEMORY_SIZES[benchmark]
+        ax = axes_lineplot[idx]
+        x_positions = np.arange(len(mem_sizes))
+
+        for arch in ["ARM", "x86"]:
+            for type_ in ["cold", "warm"]:
+                line = throughput_line_data(summary, benchmark, direction, arch, type_)
+                if line["mean_mbps"].isna().all():
+                    continue
+
+                label = f"{arch} {type_}"
+                color = LINE_COLORS[label]
+                linestyle = '--' if type_ == "warm" else '-'
+                ax.plot(x_positions, line["mean_mbps"], marker='o', color=color, label=label, linestyle=linestyle)
+                ax.fill_between(x_positions, line["ci_lower"], line["ci_upper"], color=color, alpha=0.2)
+
+        ax.set_xticks(x_positions)
+        ax.set_xticklabels([str(m) for m in mem_sizes], rotation=45)
+
+        add_ggplot_title(ax, f"{ALPHABET_LABELS[idx]} {benchmark} {direction}", fontsize=14)
+        ax.set_xlabel("")
+        ax.set_ylabel("")
+
+        _, top = ax.get_ylim()
+        ax.set_ylim(bottom=0, top=top * 1.1)
+
+    for ax in axes_lineplot[len(panels):]:
+        ax.axis("off")
+
+    fig_lineplot.supxlabel("Memory Size (MB)", x=0.537, y=0.03)
+    fig_lineplot.supylabel("Throughput (MB/s)")
+    handles, labels = axes_lineplot[0].get_legend_handles_labels()
+    if handles:
+        fig_lineplot.legend(handles, labels, loc='lower center', bbox_to_anchor=(0.537, -0.08), frameon=True,
+                            edgecolor='black', ncol=len(handles))
+
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.2)
+
+    save_and_show_figure(fig_lineplot, os.path.join(output_dir, "combined_lineplots_io_throughput.pdf"))
+
+
+def prepare_data(results_dir):
+    table = figure_invocation_table(results_dir)
+    return throughput_summary(io_throughput(table, list(BENCHMARKS)))
+
+
+def main():
+    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    create_throughput_lineplots(prepare_data(results_dir), output_dir)
+
+
+if __name__ == "__main__":
+    main()
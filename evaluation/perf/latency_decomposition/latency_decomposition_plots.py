@@ -0,0 +1,81 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from matplotlib.patches import Patch
+
+from evaluation.decomposition import COMPONENT_LABELS, COMPONENTS, decomposition_summary
+from evaluation.utils import (
+    BENCHMARKS, ALPHABET_LABELS, MEMORY_SIZES, STYLE_PATH,
+    figure_invocation_table, set_scientific_notation, save_and_show_figure, add_ggplot_title, setup_subplots
+)
+
+plt.style.use(STYLE_PATH)
+
+BAR_WIDTH = 0.38
+ARCH_OFFSETS = {"ARM": -0.2, "x86": 0.2}
+ARCH_HATCHES = {"ARM": "", "x86": "//"}
+
+
+def create_decomposition_barplots(summary, output_dir, run_type):
+    fig_bar, axes_bar = setup_subplots(2, 3)
+    colors = dict(zip(COMPONENTS, sns.color_palette("Set2", len(COMPONENTS))))
+
+    for idx, benchmark in enumerate(BENCHMARKS.keys()):
+        mem_sizes = MEMORY_SIZES[benchmark]
+        df = summary[(summary["benchmark"] == benchmark) & (summary["type"] == run_type)]
+        ax = axes_bar[idx]
+        x_positions = np.arange(len(mem_sizes))
+
+        for arch, offset in ARCH_OFFSETS.items():
+            subset = df[df["architecture"] == arch].set_index("memory").reindex(mem_sizes)
+            bottom = np.zeros(len(mem_sizes))
+            for component in COMPONENTS:
+                heights = subset[f"mean_{component}"].fillna(0).to_numpy()
+                ax.bar(x_positions + offset, heights, BAR_WIDTH, bottom=bottom, color=colors[component],
+                       hatch=ARCH_HATCHES[arch], edgecolor="black", linewidth=0.5)
+                bottom += heights
+
+        ax.set_xticks(x_positions)
+        ax.set_xticklabels([str(m) for m in mem_sizes])
+
+        add_ggplot_title(ax, f"{ALPHABET_LABELS[idx]} {benchmark}")
+        ax.set_xlabel("")
+        ax.set_ylabel("")
+        set_scientific_notation(ax, scilimits=(4, 4))
+
+        _, top = ax.get_ylim()
+        ax.set_ylim(bottom=0, top=top * 1.1)
+
+    fig_bar.supxlabel("Memory Size (MB)", x=0.537, y=0.03)
+    fig_bar.supylabel(f"Mean {run_type.capitalize()} Client Time (μs)")
+    handles = [Patch(facecolor=colors[component], edgecolor="black", label=COMPONENT_LABELS[component])
+               for component in COMPONENTS]
+    handles += [Patch(facecolor="white", edgecolor="black", hatch=hatch, label=arch)
+                for arch, hatch in ARCH_HATCHES.items()]
+    fig_bar.legend(handles=handles, loc='lower center', bbox_to_anchor=(0.537, -0.17), frameon=True,
+                   edgecolor='black', ncol=3)
+
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.2)
+
+    save_and_show_figure(fig_bar, os.path.join(output_dir, f"combined_barplots_latency_decomposition_{run_type}.pdf"))
+
+
+def prepare_data(results_dir):
+    return decomposition_summary(figure_invocation_table(results_dir))
+
+
+def main():
+    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    summary = prepare_data(results_dir)
+    for run_type in ["cold", "warm"]:
+        create_decomposition_barplots(summary, output_dir, run_type)
+
+
+if __name__ == "__main__":
+    main()
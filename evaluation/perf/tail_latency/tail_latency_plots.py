@@ -0,0 +1,86 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.lines import Line2D
+
+from evaluation.quantile_sketch import TAIL_QUANTILES, quantile_label
+from evaluation.summaries import tail_summary
+from evaluation.utils import (
+    BENCHMARKS, ALPHABET_LABELS, MEMORY_SIZES, LINE_COLORS, STYLE_PATH,
+    figure_invocation_table, set_scientific_notation, save_and_show_figure, add_ggplot_title, setup_subplots
+)
+
+plt.style.use(STYLE_PATH)
+
+TAIL_METRIC = "client_time"
+QUANTILE_LINESTYLES = dict(zip(TAIL_QUANTILES, ["-", "--", ":"]))
+
+
+def create_tail_lineplots(summary, output_dir, metric=TAIL_METRIC):
+    fig_lineplot, axes_lineplot = setup_subplots(2, 3)
+
+    for idx, benchmark in enumerate(BENCHMARKS.keys()):
+        mem_sizes = MEMORY_SIZES[benchmark]
+        df = summary[summary["benchmark"] == benchmark]
+        ax = axes_lineplot[idx]
+        x_positions = np.arange(len(mem_sizes))
+
+        for arch in ["ARM", "x86"]:
+            subset = df[df["architecture"] == arch].set_index("memory").reindex(mem_sizes)
+            if subset[f"{quantile_label(TAIL_QUANTILES[0])}_{metric}"].isna().all():
+                continue
+
+            color = LINE_COLORS[f"{arch} warm"]
+            for quantile, linestyle in QUANTILE_LINESTYLES.items():
+                column = f"{quantile_label(quantile)}_{metric}"
+                ax.plot(x_positions, subset[column], marker='o', color=color, linestyle=linestyle)
+                ax.fill_between(x_positions, subset[f"{column}_ci_lower"], subset[f"{column}_ci_upper"],
+                                color=color, alpha=0.15)
+
+        ax.set_xticks(x_positions)
+        ax.set_xticklabels([str(m) for m in mem_sizes])
+
+        add_ggplot_title(ax, f"{ALPHABET_LABELS[idx]} {benchmark}")
+        ax.set_xlabel("")
+        ax.set_ylabel("")
+        set_scientific_notation(ax, scilimits=(4, 4))
+
+        _, top = ax.get_ylim()
+        ax.set_ylim(bottom=0, top=top * 1.1)
+
+    fig_lineplot.supxlabel("Memory Size (MB)", x=0.537, y=0.03)
+    fig_lineplot.supylabel("Warm Client Time (μs)")
+    handles = [Line2D([], [], color=LINE_COLORS[f"{arch} warm"], label=f"{arch} warm") for arch in ["ARM", "x86"]]
+    handles += [Line2D([], [], color="black", linestyle=linestyle, label=quantile_label(quantile))
+                for quantile, linestyle in QUANTILE_LINESTYLES.items()]
+    fig_lineplot.legend(handles=handles, loc='lower center', bbox_to_anchor=(0.537, -0.08), frameon=True,
+                        edgecolor='black', ncol=len(handles))
+
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.2)
+
+    save_and_show_figure(fig_lineplot, os.path.join(output_dir, "combined_lineplots_tail_latency.pdf"))
+
+
+def prepare_data(results_dir):
+    """Warm tail percentiles and their CIs for every benchmark, memory size and architecture."""
+    summary = tail_summary(figure_invocation_table(results_dir),
+                           list(BENCHMARKS), metrics=[TAIL_METRIC])
+    summary = summary.reset_index()
+    summary = summary[summary["type"] == "warm"]
+    summary["benchmark"] = summary["benchmark"].astype(str)
+    summary["architecture"] = summary["architecture"].astype(str)
+    return summary
+
+
+def main():
+    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    create_tail_lineplots(prepare_data(results_dir), output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,59 +3,42 @@ import os
 
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
+from evaluation.resampling import BOOTSTRAP_SEED, CI_LEVEL, N_BOOTSTRAPS, bootstrap_two_sample_ci
 from evaluation.utils import (
-    BENCHMARKS, LINE_COLORS, MEMORY_SIZES, ALPHABET_LABELS,
+    BENCHMARKS, LINE_COLORS, MEMORY_SIZES, ALPHABET_LABELS, STYLE_PATH,
     setup_subplots, save_and_show_figure, set_scientific_notation,
-    get_all_costs, add_ggplot_title
+    get_all_costs, add_ggplot_title, figure_invocation_table
 )
 
-plt.style.use("../../scientific.mplstyle")
+plt.style.use(STYLE_PATH)
 
+EVALUATION_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+COST_DIR = os.path.join(EVALUATION_DIR, "cost")
 
-def get_raw_client_times(benchmark, arch, memory, run_type):
-    results_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "perf"))
+
+def get_raw_client_times(benchmark, arch, memory, run_type, results_dir=PERF_DIR, cost_dir=COST_DIR):
     file_path = os.path.join(results_dir, f"result_{arch.lower()}_{benchmark}.csv")
     if not os.path.exists(file_path):
         return []
 
-    df = pd.read_csv(file_path)
-    df.columns = df.columns.str.strip()
-    filtered_df = df[(df['memory'] == memory) & (df['type'] == run_type)]
+    table = figure_invocation_table(results_dir, cost_dir)
+    filtered_df = table[(table["benchmark"] == benchmark) & (table["architecture"] == arch) &
+                        (table["memory"] == memory) & (table["type"] == run_type)]
     return filtered_df['client_time'].tolist()
 
 
-def bootstrap_ratio_of_means(data1, data2, n_bootstraps=1000, ci=95):
+def bootstrap_ratio_of_means(data1, data2, n_bootstraps=N_BOOTSTRAPS, ci=CI_LEVEL, method="percentile",
+                             seed=BOOTSTRAP_SEED):
     if not data1 or not data2:
         return 0, (0, 0)
 
-    data1 = np.asarray(data1)
-    data2 = np.asarray(data2)
-    bootstrapped_ratios = []
-
-    for _ in range(n_bootstraps):
-        sample1 = np.random.choice(data1, size=len(data1), replace=True)
-        sample2 = np.random.choice(data2, size=len(data2), replace=True)
-        mean1 = np.mean(sample1)
-        mean2 = np.mean(sample2)
-        if mean2 > 0:
-            bootstrapped_ratios.append(mean1 / mean2)
-
-    if not bootstrapped_ratios:
-        mean_ratio = np.mean(data1) / np.mean(data2) if np.mean(data2) != 0 else 0
-        return mean_ratio, (mean_ratio, mean_ratio)
-
-    mean_ratio = np.mean(data1) / np.mean(data2) if np.mean(data2) != 0 else 0
-    lower_percentile = (100 - ci) / 2
-    upper_percentile = 100 - lower_percentile
-    ci_lower = np.percentile(bootstrapped_ratios, lower_percentile)
-    ci_upper = np.percentile(bootstrapped_ratios, upper_percentile)
-
-    return mean_ratio, (ci_lower, ci_upper)
+    return bootstrap_two_sample_ci(data1, data2, statistic="ratio", n_bootstraps=n_bootstraps, ci=ci,
+                                   method=method, seed=seed)
 
 
-def calculate_all_ratios_with_ci(use_total_cost=False):
+def calculate_all_ratios_with_ci(use_total_cost=False, perf_dir=PERF_DIR, cost_dir=COST_DIR):
     all_ratios = {}
     for benchmark_name, invocation_key in BENCHMARKS.items():
         memory_sizes = MEMORY_SIZES[benchmark_name]
@@ -66,12 +49,11 @@ def calculate_all_ratios_with_ci(use_total_cost=False):
             for arch in ["ARM", "x86"]:
                 for run_type in ["cold", "warm"]:
                     label = f"{arch} {run_type}"
-                    client_times_raw = get_raw_client_times(benchmark_name, arch, mem, run_type)
+                    client_times_raw = get_raw_client_times(benchmark_name, arch, mem, run_type, perf_dir, cost_dir)
 
-                    cost_file_path = os.path.abspath(os.path.join(
-                        os.path.dirname(__file__), "..", "..", "cost",
-                        benchmark_name, arch.lower(), f"{run_type}_results_{mem}-processed.json"
-                    ))
+                    cost_file_path = os.path.join(
+                        cost_dir, benchmark_name, arch.lower(), f"{run_type}_results_{mem}-processed.json"
+                    )
 
                     costs_raw = []
                     if os.path.exists(cost_file_path):
@@ -184,21 +166,21 @@ def create_plots(ratios_data, memory_sizes_dict, output_dir, is_warm=False):
     save_and_show_figure(fig, filename)
 
 
-def main():
+def main(output_dir="..", perf_dir=PERF_DIR, cost_dir=COST_DIR):
     memory_sizes_dict = {name: sizes for name, sizes in MEMORY_SIZES.items()}
 
-    ratios_with_ci = calculate_all_ratios_with_ci(use_total_cost=False)
-    total_cost_ratios_with_ci = calculate_all_ratios_with_ci(use_total_cost=True)
+    ratios_with_ci = calculate_all_ratios_with_ci(use_total_cost=False, perf_dir=perf_dir, cost_dir=cost_dir)
+    total_cost_ratios_with_ci = calculate_all_ratios_with_ci(use_total_cost=True, perf_dir=perf_dir, cost_dir=cost_dir)
 
-    save_ratios_to_csv(ratios_with_ci, os.path.join("..", "performance_cost_ratios.csv"))
-    save_ratios_to_csv(total_cost_ratios_with_ci, os.path.join("..", "performance_total_cost_ratios.csv"))
+    save_ratios_to_csv(ratios_with_ci, os.path.join(output_dir, "performance_cost_ratios.csv"))
+    save_ratios_to_csv(total_cost_ratios_with_ci, os.path.join(output_dir, "performance_total_cost_ratios.csv"))
 
-    plot_combined_ratios(ratios_with_ci, memory_sizes_dict, os.path.join("..", "perf_to_cost_combined"))
+    plot_combined_ratios(ratios_with_ci, memory_sizes_dict, os.path.join(output_dir, "perf_to_cost_combined"))
     plot_combined_ratios(total_cost_ratios_with_ci, memory_sizes_dict,
-                         os.path.join("..", "perf_to_total_cost_combined"))
+                         os.path.join(output_dir, "perf_to_total_cost_combined"))
 
-    create_plots(ratios_with_ci, memory_sizes_dict, "..", is_warm=False)
-    create_plots(ratios_with_ci, memory_sizes_dict, "..", is_warm=True)
+    create_plots(ratios_with_ci, memory_sizes_dict, output_dir, is_warm=False)
+    create_plots(ratios_with_ci, memory_sizes_dict, output_dir, is_warm=True)
 
 
 if __name__ == "__main__":
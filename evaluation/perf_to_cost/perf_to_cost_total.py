@@ -1,27 +1,35 @@
 import csv
+import os
 
 import matplotlib.pyplot as plt
 import numpy as np
 
+from evaluation.recommender import (
+    COLD_FRACTION, benchmark_cells, frontier_legend_handles, plot_frontier, recommend
+)
 from evaluation.utils import (
-    BENCHMARKS, MEMORY_SIZES, LINE_COLORS, ALPHABET_LABELS,
-    get_benchmark_files, get_all_costs, calculate_bootstrap_ci,
+    BENCHMARKS, MEMORY_SIZES, LINE_COLORS, ALPHABET_LABELS, STYLE_PATH,
+    get_benchmark_files, get_all_costs, calculate_bootstrap_ci, figure_invocation_table,
     add_ggplot_title, setup_subplots, save_and_show_figure
 )
 
-plt.style.use("../scientific.mplstyle")
+plt.style.use(STYLE_PATH)
 
 
-def calculate_costs(files, invocation_key):
-    files_arm_cold = [f"../cost/{f}" for f in files["arm_cold"]]
-    files_arm_warm = [f"../cost/{f}" for f in files["arm_warm"]]
-    files_x86_cold = [f"../cost/{f}" for f in files["x86_cold"]]
-    files_x86_warm = [f"../cost/{f}" for f in files["x86_warm"]]
+def calculate_costs(files, invocation_key, cost_dir=os.path.join("..", "cost")):
+    files_arm_cold = [os.path.join(cost_dir, f) for f in files["arm_cold"]]
+    files_arm_warm = [os.path.join(cost_dir, f) for f in files["arm_warm"]]
+    files_x86_cold = [os.path.join(cost_dir, f) for f in files["x86_cold"]]
+    files_x86_warm = [os.path.join(cost_dir, f) for f in files["x86_warm"]]
 
-    arm_cold_raw = [get_all_costs(f, invocation_key, is_arm=True) for f in files_arm_cold]
-    arm_warm_raw = [get_all_costs(f, invocation_key, is_arm=True) for f in files_arm_warm]
-    x86_cold_raw = [get_all_costs(f, invocation_key, is_arm=False) for f in files_x86_cold]
-    x86_warm_raw = [get_all_costs(f, invocation_key, is_arm=False) for f in files_x86_warm]
+    arm_cold_raw = [get_all_costs(f, invocation_key, is_arm=True, use_total_cost=True)
+                    for f in files_arm_cold]
+    arm_warm_raw = [get_all_costs(f, invocation_key, is_arm=True, use_total_cost=True)
+                    for f in files_arm_warm]
+    x86_cold_raw = [get_all_costs(f, invocation_key, is_arm=False, use_total_cost=True)
+                    for f in files_x86_cold]
+    x86_warm_raw = [get_all_costs(f, invocation_key, is_arm=False, use_total_cost=True)
+                    for f in files_x86_warm]
 
     costs_means = {
         "arm_cold": [calculate_bootstrap_ci(data)[0] for data in arm_cold_raw],
@@ -78,8 +86,10 @@ def plot_benchmark(ax, memory_sizes, costs_means, costs_cis, alphabet_label, ben
     return lines
 
 
-def main():
+def main(cost_dir=os.path.join("..", "cost"), output_dir=".", slo_ms=None, cold_fraction=COLD_FRACTION):
     fig, axes = setup_subplots(2, 3)
+    # The recommender's cells pair the processed results with the result CSVs next to them.
+    table = figure_invocation_table(os.path.join(os.path.dirname(os.path.abspath(cost_dir)), "perf"), cost_dir)
 
     summary_data = [["Benchmark", "Memory Size", "ARM Cold Avg (USD)", "ARM Warm Avg (USD)",
                      "x86 Cold Avg (USD)", "x86 Warm Avg (USD)"]]
@@ -87,11 +97,14 @@ def main():
     for i, (benchmark_name, invocation_key) in enumerate(BENCHMARKS.items()):
         memory_sizes = MEMORY_SIZES[benchmark_name]
         files = get_benchmark_files(benchmark_name, memory_sizes)
-        costs_means, costs_cis = calculate_costs(files, invocation_key)
+        costs_means, costs_cis = calculate_costs(files, invocation_key, cost_dir)
         summary_data.extend(create_summary_data(benchmark_name, memory_sizes, costs_means))
 
         ax = axes[i]
         plot_benchmark(ax, memory_sizes, costs_means, costs_cis, ALPHABET_LABELS[i], benchmark_name)
+        ranked = recommend(benchmark_cells(table, benchmark_name, use_total_cost=True), slo_ms,
+                           cold_fraction=cold_fraction)
+        plot_frontier(ax, ranked, memory_sizes)
 
         _, top = ax.get_ylim()
         ax.set_ylim(bottom=0, top=top * 1.1)
@@ -99,15 +112,17 @@ def main():
     fig.supxlabel("Memory Size (MB)", x=0.537, y=0.03)
     fig.supylabel("Cost (USD)")
     handles, labels = axes[0].get_legend_handles_labels()
-    fig.legend(handles, labels, loc='lower center', ncol=4,
-               bbox_to_anchor=(0.537, -0.08), frameon=True, edgecolor='black')
+    handles += frontier_legend_handles()
+    labels += [handle.get_label() for handle in frontier_legend_handles()]
+    fig.legend(handles, labels, loc='lower center', ncol=3,
+               bbox_to_anchor=(0.537, -0.17), frameon=True, edgecolor='black')
 
     plt.tight_layout()
     plt.subplots_adjust(bottom=0.2)
 
-    save_and_show_figure(fig, "combined_cost_comparison_total.pdf")
+    save_and_show_figure(fig, os.path.join(output_dir, "combined_cost_comparison_total.pdf"))
 
-    csv_file = "summary_cost_table.csv"
+    csv_file = os.path.join(output_dir, "summary_total_cost_table.csv")
     with open(csv_file, mode="w", newline="") as f:
         writer = csv.writer(f)
         writer.writerows(summary_data)
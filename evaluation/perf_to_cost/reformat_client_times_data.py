@@ -12,7 +12,8 @@ def calculate_averages(input_file):
             benchmark = row['benchmark']
             memory = row['memory']
             architecture = row['architecture']
-            mean_client_time = float(row['mean_client_time'])
+            # Cells without invocations have an empty mean
+            mean_client_time = float(row['mean_client_time']) if row['mean_client_time'] else None
 
             # Build a unique key combining benchmark and memory size
             key = (benchmark, memory)
@@ -0,0 +1,352 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(EVALUATION_DIR)
+STATE_FILE = os.path.join(EVALUATION_DIR, ".pipeline_state.json")
+
+# Prices live in pricing.json, bootstrap parameters in resampling.py and the benchmarks and their memory
+# sizes in benchmarks.py, so they are inputs of every stage that prices invocations, computes confidence
+# intervals or iterates over the benchmarks.
+SHARED_INPUTS = [
+    "benchmarks.py", "utils.py", "resampling.py", "pricing.py", "pricing.json", "invocation_cache.py",
+    "invocation_table.py", "result_stream.py", "recommender.py", "quantile_sketch.py", "outliers.py",
+    "significance.py", "scientific.mplstyle"
+]
+# Result inputs are hashed once per benchmark ({benchmark} is filled in), so that refreshing the results of
+# one benchmark skips the stages that do not read it. A stage that does run still rebuilds all of its
+# benchmarks; see Stage below.
+COST_RESULTS = [os.path.join("cost", "{benchmark}", "*", "*-processed.json")]
+# The invocation table joins the SeBS result CSVs with the cached processed records.
+PERF_RESULTS = [os.path.join("perf", "result_*_{benchmark}.csv")] + COST_RESULTS
+
+
+def _result_benchmarks():
+    return sorted({os.path.basename(os.path.dirname(os.path.dirname(path)))
+                   for path in glob.glob(os.path.join(EVALUATION_DIR, "cost", "*", "*", "*-processed.json"))})
+
+
+def _plotted_benchmarks():
+    from evaluation.benchmarks import BENCHMARKS
+    return list(BENCHMARKS)
+
+
+def _io_benchmarks():
+    from evaluation.throughput import IO_BENCHMARKS
+    return [benchmark for benchmark in _plotted_benchmarks() if benchmark in IO_BENCHMARKS]
+
+
+# A stage either runs `script` in its own directory or calls `function` with the benchmarks whose inputs
+# changed (None when all of them are stale). Scripts always rebuild every benchmark, since their tables and
+# figures combine all of them (the significance corrections span every cell, each figure has a panel per
+# benchmark); for them the changed benchmarks are only reported. `after` lists stages that must finish first
+# even though no declared file connects them. `benchmarks` returns the benchmarks the stage reads results of.
+Stage = namedtuple("Stage", ["name", "inputs", "outputs", "script", "function", "after", "benchmarks"])
+
+
+def _stage(name, inputs, outputs, script=None, function=None, after=(), benchmarks=_plotted_benchmarks):
+    if script is not None:
+        inputs = [script] + inputs
+    return Stage(name, inputs, outputs, script, function, tuple(after), benchmarks)
+
+
+def _copy_client_time_summaries(benchmarks):
+    for run_type in ["cold", "warm"]:
+        filename = f"summary_table_{run_type}_runs.csv"
+        shutil.copyfile(os.path.join(EVALUATION_DIR, "perf", "client_times_combined", filename),
+                        os.path.join(EVALUATION_DIR, "perf_to_cost", filename))
+
+
+def _ingest_cost_results(benchmarks):
+    from evaluation.invocation_cache import ingest_cost_results
+    ingest_cost_results(os.path.join(EVALUATION_DIR, "cost"), benchmarks=benchmarks)
+
+
+STAGES = [
+    _stage("ingest", COST_RESULTS + ["invocation_cache.py", "result_stream.py"], [],
+           function=_ingest_cost_results, benchmarks=_result_benchmarks),
+    _stage("summaries", PERF_RESULTS + SHARED_INPUTS + ["decomposition.py", "throughput.py", "lifecycle.py",
+                                                         "concurrency.py"],
+           [os.path.join("perf", "client_times_combined", f"summary_table_{t}_runs.csv") for t in ["cold", "warm"]] +
+           [os.path.join("perf", "exec_time_combined", "summary_execution_time_with_advantage.csv"),
+            os.path.join("perf", "cold_start_ratios", "summary_cold_warm_ratio.csv")] +
+           [os.path.join("perf", "latency_decomposition", f"summary_latency_decomposition_{t}.csv")
+            for t in ["cold", "warm"]] +
+           [os.path.join("perf", "latency_decomposition", "summary_handshake.csv")] +
+           [os.path.join("perf", "io_throughput", name)
+            for name in ["summary_io_throughput.csv", "summary_io_memory_effect.csv"]] +
+           [os.path.join("perf", "container_lifecycle", name)
+            for name in ["summary_container_lifecycle.csv", "mislabelled_invocations.csv"]] +
+           [os.path.join("perf", "concurrency", "summary_concurrency.csv")] +
+           [os.path.join("perf", "outliers", name)
+            for name in ["summary_outliers.csv", "outlier_invocations.csv", "noisy_cells.csv"]],
+           script="summaries.py", after=["ingest"]),
+    _stage("copy_client_time_summaries",
+           [os.path.join("perf", "client_times_combined", f"summary_table_{t}_runs.csv") for t in ["cold", "warm"]],
+           [os.path.join("perf_to_cost", f"summary_table_{t}_runs.csv") for t in ["cold", "warm"]],
+           function=_copy_client_time_summaries),
+    _stage("merge_client_times",
+           [os.path.join("perf_to_cost", f"summary_table_{t}_runs.csv") for t in ["cold", "warm"]],
+           [os.path.join("perf_to_cost", "merged_client_times_data.csv")],
+           script=os.path.join("perf_to_cost", "reformat_client_times_data.py")),
+    _stage("cost_plots", COST_RESULTS + SHARED_INPUTS,
+           [os.path.join("cost", name) for name in
+            ["cost.pdf", "total_cost.pdf", "summary_cost.csv", "summary_total_cost.csv"]],
+           script=os.path.join("cost", "cost_plots.py"), after=["ingest"]),
+    _stage("client_time_figures", PERF_RESULTS + SHARED_INPUTS,
+           [os.path.join("perf", "client_times_combined", name) for name in
+            ["combined_boxplots_cold_client_time.pdf", "combined_boxplots_warm_client_time.pdf",
+             "combined_lineplots_client_time.pdf"]],
+           script=os.path.join("perf", "client_times_combined", "client_times_combined.py"), after=["ingest"]),
+    _stage("execution_time_figures", PERF_RESULTS + SHARED_INPUTS,
+           [os.path.join("perf", "exec_time_combined", name) for name in
+            ["combined_boxplots_execution_time.pdf", "combined_lineplots_execution_time.pdf"]],
+           script=os.path.join("perf", "exec_time_combined", "execution_times_plots.py"), after=["ingest"]),
+    _stage("memory_figures", PERF_RESULTS + SHARED_INPUTS,
+           [os.path.join("perf", "barCharts_memory", name) for name in
+            ["memory_usage_bar_charts.pdf", "memory_usage_line_plots.pdf", "summary_memory_usage.csv"]],
+           script=os.path.join("perf", "barCharts_memory", "mem_bar_charts.py"), after=["ingest"]),
+    _stage("cold_start_ratio_figures", PERF_RESULTS + SHARED_INPUTS,
+           [os.path.join("perf", "cold_start_ratios", name) for name in
+            ["combined_boxplots_cold_to_warm_ratio.pdf", "combined_lineplots_cold_to_warm_ratio.pdf"]],
+           script=os.path.join("perf", "cold_start_ratios", "cold_start_ratios.py"), after=["ingest"]),
+    _stage("tail_latency_figures", PERF_RESULTS + SHARED_INPUTS + ["summaries.py", "decomposition.py",
+                                                                    "throughput.py", "lifecycle.py", "concurrency.py"],
+           [os.path.join("perf", "tail_latency", "combined_lineplots_tail_latency.pdf")],
+           script=os.path.join("perf", "tail_latency", "tail_latency_plots.py"), after=["ingest"]),
+    _stage("latency_decomposition_figures", PERF_RESULTS + SHARED_INPUTS + ["decomposition.py"],
+           [os.path.join("perf", "latency_decomposition", f"combined_barplots_latency_decomposition_{t}.pdf")
+            for t in ["cold", "warm"]],
+           script=os.path.join("perf", "latency_decomposition", "latency_decomposition_plots.py"), after=["ingest"]),
+    _stage("io_throughput_figures", PERF_RESULTS + SHARED_INPUTS + ["throughput.py"],
+           [os.path.join("perf", "io_throughput", "combined_lineplots_io_throughput.pdf")],
+           script=os.path.join("perf", "io_throughput", "io_throughput_plots.py"), after=["ingest"],
+           benchmarks=_io_benchmarks),
+    _stage("perf_to_cost", PERF_RESULTS + SHARED_INPUTS,
+           [os.path.join("perf_to_cost", name) for name in
+            ["combined_cost_comparison.pdf", "summary_cost_table.csv"]],
+           script=os.path.join("perf_to_cost", "perf_to_cost.py"), after=["ingest"]),
+    _stage("perf_to_cost_total", PERF_RESULTS + SHARED_INPUTS,
+           [os.path.join("perf_to_cost", name) for name in
+            ["combined_cost_comparison_total.pdf", "summary_total_cost_table.csv"]],
+           script=os.path.join("perf_to_cost", "perf_to_cost_total.py"), after=["ingest"]),
+    _stage("perf_to_cost_ratios", PERF_RESULTS + SHARED_INPUTS,
+           [os.path.join("perf_to_cost", name) for name in
+            ["performance_cost_ratios.csv", "performance_total_cost_ratios.csv", "perf_to_cost_combined.pdf",
+             "perf_to_total_cost_combined.pdf", "perf_to_cost_cold.pdf", "perf_to_cost_warm.pdf"]],
+           script=os.path.join("perf_to_cost", "perf_to_cost", "perf_to_total_cost_pdf_combined.py"),
+           after=["ingest"]),
+]
+
+
+def stage_dependencies(stages):
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    dependencies = {}
+    for stage in stages:
+        upstream = {producers[path] for path in stage.inputs if path in producers}
+        upstream.update(stage.after)
+        upstream.discard(stage.name)
+        dependencies[stage.name] = upstream
+    return dependencies
+
+
+def _expand_inputs(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.join(EVALUATION_DIR, pattern)))
+        paths.extend(matches if matches else [os.path.join(EVALUATION_DIR, pattern)])
+    return paths
+
+
+class _Hasher:
+    """Content hashes of input files, re-hashing a file only when its mtime or size changed."""
+
+    def __init__(self, known):
+        self.known = known
+
+    def file_hash(self, path):
+        if not os.path.exists(path):
+            return "missing"
+        stat = os.stat(path)
+        relative = os.path.relpath(path, EVALUATION_DIR)
+        entry = self.known.get(relative)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.known[relative] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest.hexdigest()}
+        return digest.hexdigest()
+
+    def _inputs_hash(self, header, patterns):
+        digest = hashlib.sha256(json.dumps(header).encode())
+        for path in _expand_inputs(patterns):
+            digest.update(os.path.relpath(path, EVALUATION_DIR).encode())
+            digest.update(self.file_hash(path).encode())
+        return digest.hexdigest()
+
+    def stage_hash(self, stage):
+        """Hash of the inputs shared by all benchmarks and one hash per benchmark the stage reads."""
+        shared = [pattern for pattern in stage.inputs if "{benchmark}" not in pattern]
+        per_benchmark = [pattern for pattern in stage.inputs if "{benchmark}" in pattern]
+        benchmarks = stage.benchmarks() if per_benchmark else []
+        return {
+            "shared": self._inputs_hash([stage.name, stage.outputs, stage.script], shared),
+            "benchmarks": {
+                benchmark: self._inputs_hash(benchmark, [pattern.format(benchmark=benchmark)
+                                                         for pattern in per_benchmark])
+                for benchmark in benchmarks
+            }
+        }
+
+
+def _load_state():
+    try:
+        with open(STATE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}, "stages": {}}
+
+
+def _save_state(state):
+    with open(STATE_FILE, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def is_up_to_date(stage, stage_hash, state):
+    outputs_exist = all(os.path.exists(os.path.join(EVALUATION_DIR, path)) for path in stage.outputs)
+    return outputs_exist and state["stages"].get(stage.name) == stage_hash
+
+
+def changed_benchmarks(stage, stage_hash, state):
+    """Benchmarks whose inputs changed since the stage last ran, or None if everything is stale."""
+    previous = state["stages"].get(stage.name)
+    if not isinstance(previous, dict) or previous.get("shared") != stage_hash["shared"]:
+        return None
+    if not all(os.path.exists(os.path.join(EVALUATION_DIR, path)) for path in stage.outputs):
+        return None
+    benchmarks = set(previous["benchmarks"]) | set(stage_hash["benchmarks"])
+    return sorted(benchmark for benchmark in benchmarks
+                  if previous["benchmarks"].get(benchmark) != stage_hash["benchmarks"].get(benchmark))
+
+
+def _describe(benchmarks):
+    return "" if benchmarks is None else f" ({', '.join(benchmarks)} changed)"
+
+
+def _run_stage(stage, benchmarks):
+    start = time.perf_counter()
+    if stage.function is not None:
+        stage.function(benchmarks)
+    else:
+        script_path = os.path.join(EVALUATION_DIR, stage.script)
+        env = dict(os.environ, MPLBACKEND="Agg", EVALUATION_SHOW_FIGURES="0")
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_DIR, env.get("PYTHONPATH")]))
+        completed = subprocess.run([sys.executable, script_path], cwd=os.path.dirname(script_path), env=env,
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Stage '{stage.name}' failed:\n{completed.stderr}")
+    return time.perf_counter() - start
+
+
+def run_pipeline(stage_names=None, force=False, max_workers=None, dry_run=False):
+    stages = {stage.name: stage for stage in STAGES}
+    dependencies = stage_dependencies(STAGES)
+
+    selected = set(stage_names or stages)
+    # Selecting a stage pulls in everything upstream of it.
+    pending_closure = list(selected)
+    while pending_closure:
+        for upstream in dependencies[pending_closure.pop()]:
+            if upstream not in selected:
+                selected.add(upstream)
+                pending_closure.append(upstream)
+
+    state = _load_state()
+    hasher = _Hasher(state["files"])
+    done, failed, report = set(), set(), {}
+    pending = {name for name in stages if name in selected}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while pending or running:
+            waiting = len(pending)
+            for name in sorted(pending):
+                if dependencies[name] & failed:
+                    pending.discard(name)
+                    failed.add(name)
+                    report[name] = "skipped (upstream failed)"
+                    continue
+                if not dependencies[name] <= done:
+                    continue
+
+                pending.discard(name)
+                stage_hash = hasher.stage_hash(stages[name])
+                if not force and is_up_to_date(stages[name], stage_hash, state):
+                    done.add(name)
+                    report[name] = "up to date"
+                    continue
+                benchmarks = None if force else changed_benchmarks(stages[name], stage_hash, state)
+                if dry_run:
+                    done.add(name)
+                    report[name] = "would run" + _describe(benchmarks)
+                    continue
+                running[executor.submit(_run_stage, stages[name], benchmarks)] = name, benchmarks
+
+            if not running:
+                if pending and len(pending) == waiting:
+                    raise RuntimeError(f"Stages can never run: {', '.join(sorted(pending))}")
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, benchmarks = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as error:
+                    failed.add(name)
+                    report[name] = f"failed: {error}"
+                    continue
+                # Hash after running so that outputs feeding later stages are picked up fresh.
+                state["stages"][name] = hasher.stage_hash(stages[name])
+                done.add(name)
+                report[name] = f"ran in {seconds:.2f} s" + _describe(benchmarks)
+
+    if not dry_run:
+        _save_state(state)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally rebuild the evaluation tables and figures.")
+    parser.add_argument("stages", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--force", action="store_true", help="Re-run stages even if their inputs are unchanged")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which stages would run")
+    parser.add_argument("--workers", type=int, default=None, help="Number of stages run concurrently")
+    args = parser.parse_args()
+
+    unknown = set(args.stages) - {stage.name for stage in STAGES}
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    report = run_pipeline(args.stages, args.force, args.workers, args.dry_run)
+    for stage in STAGES:
+        if stage.name in report:
+            print(f"{stage.name}: {report[stage.name]}")
+    if any(status.startswith(("failed", "skipped")) for status in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+PRICING_PATH = os.environ.get("EVALUATION_PRICING",
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), "pricing.json"))
+
+# SeBS reports billing._gb_seconds as billed milliseconds times memory in MB.
+MB_PER_GB = 1024
+MS_PER_SECOND = 1000
+MB_MS_PER_GB_SECOND = MB_PER_GB * MS_PER_SECOND
+
+# `tiers` maps an architecture to (upper bounds in GB-seconds per month, USD per GB-second) arrays,
+# the last bound being infinite. Costs are reported for `reported_invocations` invocations, which at
+# the default 1,024,000 makes the compute cost of an invocation equal to its SeBS _gb_seconds value
+# times the GB-second price.
+PricingModel = namedtuple("PricingModel", ["region", "tiers", "request_price", "reported_invocations"])
+
+
+def _parse_tiers(tiers):
+    bounds = np.array([np.inf if tier["up_to_gb_seconds"] is None else tier["up_to_gb_seconds"] for tier in tiers],
+                      dtype=float)
+    prices = np.array([tier["price"] for tier in tiers], dtype=float)
+    if not np.all(np.diff(bounds) > 0) or not np.isinf(bounds[-1]):
+        raise ValueError("GB-second tiers must have increasing bounds and end with an unbounded tier")
+    return bounds, prices
+
+
+def load_pricing(path=PRICING_PATH, region=None):
+    with open(path, "r") as f:
+        config = json.load(f)
+
+    region = region or config["default_region"]
+    if region not in config["regions"]:
+        raise ValueError(f"No Lambda prices for region '{region}' in {path}")
+    prices = config["regions"][region]
+
+    return PricingModel(
+        region=region,
+        tiers={arch: _parse_tiers(tiers) for arch, tiers in prices["gb_second_tiers"].items()},
+        request_price=prices["request_price_per_million"] / 1e6,
+        reported_invocations=config["reported_invocations"],
+    )
+
+
+@lru_cache(maxsize=None)
+def default_pricing():
+    return load_pricing()
+
+
+def gb_seconds_from_billed_time(billed_time, memory):
+    """SeBS _gb_seconds (MB-milliseconds) of invocations billed `billed_time` ms at `memory` MB."""
+    return np.asarray(billed_time, dtype=float) * np.asarray(memory, dtype=float)
+
+
+def _block_rate(bounds, prices, start, volume):
+    # Average USD per GB-second of `volume` GB-seconds billed after `start` GB-seconds of the month.
+    if volume <= 0:
+        return prices[min(np.searchsorted(bounds, start, side="right"), len(prices) - 1)]
+    starts = np.concatenate([[0.0], bounds[:-1]])
+    used = np.clip(np.minimum(bounds, start + volume) - np.maximum(starts, start), 0, None)
+    return (used / volume * prices).sum()
+
+
+def compute_cost(model, arch, gb_seconds, monthly_gb_seconds=0.0):
+    """Compute cost of each invocation from its SeBS _gb_seconds, per `model.reported_invocations`.
+
+    All given invocations, each run `reported_invocations` times, are billed as one block of the
+    month on top of `monthly_gb_seconds` GB-seconds already used. Every invocation is charged the
+    block's average tiered rate, so costs do not depend on the order of the invocations. Scalars
+    give a scalar and arrays keep their shape.
+    """
+    bounds, prices = model.tiers[arch]
+    mb_ms = np.asarray(gb_seconds, dtype=float)
+    scale = model.reported_invocations / MB_MS_PER_GB_SECOND
+    rate = _block_rate(bounds, prices, monthly_gb_seconds, mb_ms.sum() * scale)
+    return mb_ms * rate * scale
+
+
+def request_cost(model):
+    return model.request_price * model.reported_invocations
+
+
+def total_cost(model, arch, gb_seconds, monthly_gb_seconds=0.0):
+    return compute_cost(model, arch, gb_seconds, monthly_gb_seconds) + request_cost(model)
@@ -0,0 +1,208 @@
+import numpy as np
+
+from evaluation.resampling import BOOTSTRAP_SEED, CI_LEVEL, MAX_CHUNK_ELEMENTS
+
+DEFAULT_COMPRESSION = 200
+TAIL_QUANTILES = [0.95, 0.99, 0.999]
+# Poisson bootstrap replicates kept per tail sketch; each is a full t-digest.
+N_TAIL_BOOTSTRAPS = 200
+
+
+def quantile_label(quantile):
+    return f"p{quantile * 100:g}"
+
+
+def _k_scale(q, compression, count):
+    # t-digest k2 scale function, normalized by the number of values: cluster sizes shrink in
+    # proportion to q(1 - q), so the extreme tails are kept almost value by value.
+    normalizer = 4 * np.log(np.maximum(count / compression, 1)) + 24
+    q = np.clip(q, 1e-12, 1 - 1e-12)
+    return compression / normalizer * np.log(q / (1 - q))
+
+
+def _group_starts(groups, n_groups):
+    return np.searchsorted(groups, np.arange(n_groups))
+
+
+class TDigest:
+    """Mergeable t-digests of `groups` independent samples, stored side by side.
+
+    Each group keeps on the order of `compression` centroids however many values it receives,
+    and all groups are compressed together with array operations, which is what makes keeping
+    one digest per cell and bootstrap replicate affordable.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, groups=1):
+        self.compression = compression
+        self.groups = groups
+        # Centroids sorted by group, then by mean.
+        self.centroid_groups = np.empty(0, dtype=np.int64)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.minimum = np.full(groups, np.inf)
+        self.maximum = np.full(groups, -np.inf)
+
+    def _compress(self, groups, means, weights):
+        keep = weights > 0
+        groups, means, weights = groups[keep], means[keep], weights[keep]
+        order = np.lexsort((means, groups))
+        groups, means, weights = groups[order], means[order], weights[order]
+
+        totals = np.bincount(groups, weights, minlength=self.groups)
+        cumulative = np.cumsum(weights)
+        offsets = np.concatenate([[0.0], cumulative])[_group_starts(groups, self.groups)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            q = (cumulative - weights - offsets[groups]) / totals[groups]
+        clusters = np.floor(_k_scale(q, self.compression, totals[groups]))
+
+        boundary = (groups[1:] != groups[:-1]) | (clusters[1:] != clusters[:-1])
+        starts = np.flatnonzero(np.concatenate([[True], boundary])) if len(groups) else np.empty(0, dtype=int)
+        merged_weights = np.add.reduceat(weights, starts) if len(starts) else np.empty(0)
+        merged_sums = np.add.reduceat(means * weights, starts) if len(starts) else np.empty(0)
+
+        self.centroid_groups = groups[starts]
+        self.weights = merged_weights
+        self.means = merged_sums / np.where(merged_weights > 0, merged_weights, 1)
+
+    def add(self, values, groups=None, weights=None):
+        """Add `values` to the digests of `groups` (default: group 0) with the given `weights`
+        (default: 1). All three are flat arrays of the same length."""
+        values = np.asarray(values, dtype=float)
+        groups = np.zeros(len(values), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+
+        present = weights > 0
+        np.minimum.at(self.minimum, groups[present], values[present])
+        np.maximum.at(self.maximum, groups[present], values[present])
+        self._compress(np.concatenate([self.centroid_groups, groups]), np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, weights]))
+        return self
+
+    def merge(self, other):
+        if other.groups != self.groups:
+            raise ValueError(f"Cannot merge a digest of {other.groups} groups into one of {self.groups}")
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self._compress(np.concatenate([self.centroid_groups, other.centroid_groups]),
+                       np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def count(self):
+        return np.bincount(self.centroid_groups, self.weights, minlength=self.groups)
+
+    def quantile(self, quantiles):
+        """Array of shape (groups, len(quantiles)), NaN for empty groups.
+
+        Ranks are placed on the 0..n-1 scale of np.quantile's default linear method, so a digest
+        that still holds every value as its own centroid answers exactly like np.quantile.
+        """
+        quantiles = np.atleast_1d(np.asarray(quantiles, dtype=float))
+        group_ids = np.arange(self.groups)
+        totals = self.count()
+        empty = totals == 0
+        last = totals - 1
+
+        cumulative = np.cumsum(self.weights)
+        offsets = np.concatenate([[0.0], cumulative])[_group_starts(self.centroid_groups, self.groups)]
+        centers = cumulative - offsets[self.centroid_groups] - (self.weights + 1) / 2
+
+        # Interpolate every group at once: group g occupies [2g, 2g + 1] on a shared axis, with its
+        # minimum and maximum at the ends and its centroids at their normalized ranks in between.
+        groups = np.concatenate([group_ids, self.centroid_groups, group_ids])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ranks = np.concatenate([np.zeros(self.groups), np.clip(centers / last[self.centroid_groups], 0, 1),
+                                    np.ones(self.groups)])
+        ranks = np.nan_to_num(ranks)
+        values = np.concatenate([np.where(empty, 0, self.minimum), self.means, np.where(empty, 0, self.maximum)])
+        ties = np.concatenate([np.zeros(self.groups), np.ones(len(self.means)), np.full(self.groups, 2)])
+        positions = 2 * groups + ranks
+        order = np.lexsort((ties, positions))
+
+        targets = 2 * group_ids[:, None] + quantiles[None, :]
+        result = np.interp(targets.ravel(), positions[order], values[order]).reshape(targets.shape)
+        result[empty] = np.nan
+        return result
+
+    def to_dict(self):
+        return {
+            "compression": self.compression,
+            "groups": self.groups,
+            "centroid_groups": self.centroid_groups.tolist(),
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "minimum": self.minimum.tolist(),
+            "maximum": self.maximum.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        digest = cls(state["compression"], state["groups"])
+        digest.centroid_groups = np.asarray(state["centroid_groups"], dtype=np.int64)
+        digest.means = np.asarray(state["means"], dtype=float)
+        digest.weights = np.asarray(state["weights"], dtype=float)
+        digest.minimum = np.asarray(state["minimum"], dtype=float)
+        digest.maximum = np.asarray(state["maximum"], dtype=float)
+        return digest
+
+
+class TailSketch:
+    """Tail quantiles with bootstrap confidence intervals for `cells` samples, in bounded memory.
+
+    Next to one t-digest per cell it keeps `n_bootstraps` replicate digests per cell, into which
+    every value enters with a Poisson(1) weight (the Poisson bootstrap). The replicates can thus be
+    built in one pass over data of any size, and sketches of disjoint parts of the same cells can
+    be merged.
+    """
+
+    def __init__(self, cells=1, n_bootstraps=N_TAIL_BOOTSTRAPS, compression=DEFAULT_COMPRESSION,
+                 seed=BOOTSTRAP_SEED, max_chunk_elements=MAX_CHUNK_ELEMENTS):
+        self.cells = cells
+        self.n_bootstraps = n_bootstraps
+        self.digest = TDigest(compression, cells)
+        self.replicates = TDigest(compression, cells * n_bootstraps)
+        self.rng = np.random.default_rng(seed)
+        self.max_chunk_elements = max_chunk_elements
+
+    def add(self, values, cells=None):
+        values = np.asarray(values, dtype=float)
+        cells = np.zeros(len(values), dtype=np.int64) if cells is None else np.asarray(cells, dtype=np.int64)
+        replicate_ids = np.arange(self.n_bootstraps)[:, None]
+
+        chunk = max(1, self.max_chunk_elements // self.n_bootstraps)
+        for start in range(0, len(values), chunk):
+            part, part_cells = values[start:start + chunk], cells[start:start + chunk]
+            self.digest.add(part, part_cells)
+            weights = self.rng.poisson(1.0, size=(self.n_bootstraps, len(part)))
+            self.replicates.add(np.broadcast_to(part, weights.shape).ravel(),
+                                (part_cells * self.n_bootstraps + replicate_ids).ravel(), weights.ravel())
+        return self
+
+    def merge(self, other):
+        if other.n_bootstraps != self.n_bootstraps:
+            raise ValueError("Cannot merge tail sketches with different numbers of bootstrap replicates")
+        self.digest.merge(other.digest)
+        self.replicates.merge(other.replicates)
+        return self
+
+    def quantiles(self, quantiles=TAIL_QUANTILES, ci=CI_LEVEL):
+        """(estimates, lower, upper), each of shape (cells, len(quantiles)); NaN for empty cells."""
+        quantiles = np.atleast_1d(quantiles)
+        estimates = self.digest.quantile(quantiles)
+        replicates = self.replicates.quantile(quantiles).reshape(self.cells, self.n_bootstraps, len(quantiles))
+
+        tail = (100 - ci) / 2
+        lower, upper = np.full_like(estimates, np.nan), np.full_like(estimates, np.nan)
+        filled = ~np.all(np.isnan(replicates), axis=(1, 2))
+        lower[filled], upper[filled] = np.nanpercentile(replicates[filled], [tail, 100 - tail], axis=1)
+        return estimates, lower, upper
+
+    def to_dict(self):
+        return {"n_bootstraps": self.n_bootstraps, "digest": self.digest.to_dict(),
+                "replicates": self.replicates.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state, seed=BOOTSTRAP_SEED):
+        sketch = cls(state["digest"]["groups"], state["n_bootstraps"], state["digest"]["compression"], seed)
+        sketch.digest = TDigest.from_dict(state["digest"])
+        sketch.replicates = TDigest.from_dict(state["replicates"])
+        return sketch
@@ -0,0 +1,222 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation.benchmarks import BENCHMARKS
+from evaluation.invocation_table import COST_DIR, PERF_DIR, get_invocation_table
+from evaluation.pricing import compute_cost, default_pricing, total_cost
+from evaluation.resampling import BOOTSTRAP_SEED, CI_LEVEL, N_BOOTSTRAPS
+
+LATENCY_QUANTILE = 0.95
+COLD_FRACTION = 0.0
+ARCHITECTURE_KEYS = {"ARM": "arm", "x86": "x86"}
+
+
+def _weighted_quantiles(values, weights, quantile):
+    # Row-wise quantile of weighted samples: the smallest value whose cumulative weight reaches it.
+    order = np.argsort(values, axis=-1)
+    values = np.take_along_axis(values, order, axis=-1)
+    cumulative = np.cumsum(np.take_along_axis(weights, order, axis=-1), axis=-1)
+    position = (cumulative < quantile * cumulative[..., -1:]).sum(axis=-1, keepdims=True)
+    return np.take_along_axis(values, np.minimum(position, values.shape[-1] - 1), axis=-1)[..., 0]
+
+
+def _mixture(cold, warm, cold_fraction):
+    """Values and weights of the invocation mix with `cold_fraction` cold starts. Either sample may
+    be empty when its weight is zero."""
+    parts = [(warm, 1 - cold_fraction), (cold, cold_fraction)]
+    parts = [(sample, weight) for sample, weight in parts if weight > 0 and sample.shape[-1] > 0]
+    values = np.concatenate([sample for sample, _ in parts], axis=-1)
+    weights = np.concatenate([np.full(sample.shape, weight / sample.shape[-1]) for sample, weight in parts], axis=-1)
+    return values, weights
+
+
+def _mixture_mean(cold, warm, cold_fraction):
+    means = [(sample.mean(axis=-1), weight) for sample, weight in [(warm, 1 - cold_fraction), (cold, cold_fraction)]
+             if weight > 0]
+    return sum(mean * weight for mean, weight in means)
+
+
+def _resample(rng, sample, n_bootstraps):
+    if len(sample) == 0:
+        return np.empty((n_bootstraps, 0))
+    return sample[rng.integers(0, len(sample), size=(n_bootstraps, len(sample)))]
+
+
+def cell_estimates(cells, quantile=LATENCY_QUANTILE, cold_fraction=COLD_FRACTION, n_bootstraps=N_BOOTSTRAPS,
+                   seed=BOOTSTRAP_SEED):
+    """Latency quantile (ms) and mean cost of the invocation mix of every (architecture, memory)
+    cell, with their bootstrap replicates.
+
+    `cells` maps (architecture, memory) to dicts of "cold"/"warm" (latency_us, cost) arrays.
+    """
+    rng = np.random.default_rng(seed)
+    estimates = {}
+    for key, samples in cells.items():
+        latency = {run_type: samples[run_type][0] / 1000 for run_type in samples}
+        cost = {run_type: samples[run_type][1] for run_type in samples}
+        if (cold_fraction < 1 and len(latency["warm"]) == 0) or (cold_fraction > 0 and len(latency["cold"]) == 0):
+            continue
+
+        values, weights = _mixture(latency["cold"], latency["warm"], cold_fraction)
+        point_latency = _weighted_quantiles(values, weights, quantile)
+        point_cost = _mixture_mean(cost["cold"], cost["warm"], cold_fraction)
+
+        resampled = {run_type: (_resample(rng, latency[run_type], n_bootstraps),
+                                _resample(rng, cost[run_type], n_bootstraps)) for run_type in ("cold", "warm")}
+        values, weights = _mixture(resampled["cold"][0], resampled["warm"][0], cold_fraction)
+        estimates[key] = {
+            "latency": point_latency,
+            "cost": point_cost,
+            "latency_replicates": _weighted_quantiles(values, weights, quantile),
+            "cost_replicates": _mixture_mean(resampled["cold"][1], resampled["warm"][1], cold_fraction),
+        }
+    return estimates
+
+
+def pareto_mask(latency, cost):
+    """True for points that no other point beats on both latency and cost. Works row-wise on 2-D
+    inputs, so bootstrap replicates are handled in one call."""
+    latency = np.atleast_2d(latency)
+    cost = np.atleast_2d(cost)
+    # Sort by cost, breaking ties by latency; a point is on the frontier when it is strictly faster
+    # than every cheaper point.
+    order = np.lexsort((latency, cost), axis=-1)
+    sorted_latency = np.take_along_axis(latency, order, axis=-1)
+    best_before = np.minimum.accumulate(sorted_latency, axis=-1)
+    best_before = np.concatenate([np.full(best_before.shape[:-1] + (1,), np.inf), best_before[..., :-1]], axis=-1)
+
+    mask = np.empty_like(latency, dtype=bool)
+    np.put_along_axis(mask, order, sorted_latency < best_before, axis=-1)
+    return mask
+
+
+def recommend(cells, slo_ms=None, quantile=LATENCY_QUANTILE, cold_fraction=COLD_FRACTION, ci=CI_LEVEL,
+              n_bootstraps=N_BOOTSTRAPS, seed=BOOTSTRAP_SEED):
+    """Ranked (architecture, memory) options for one benchmark.
+
+    A cell is feasible when its latency quantile is within `slo_ms` (every cell when no SLO is
+    given). Feasible cells come first, cheapest first; the rest follow by latency.
+    """
+    estimates = cell_estimates(cells, quantile, cold_fraction, n_bootstraps, seed)
+    if not estimates:
+        return pd.DataFrame()
+
+    keys = list(estimates)
+    latency = np.array([estimates[key]["latency"] for key in keys])
+    cost = np.array([estimates[key]["cost"] for key in keys])
+    latency_replicates = np.stack([estimates[key]["latency_replicates"] for key in keys], axis=-1)
+    cost_replicates = np.stack([estimates[key]["cost_replicates"] for key in keys], axis=-1)
+
+    tail = (100 - ci) / 2
+    latency_ci = np.percentile(latency_replicates, [tail, 100 - tail], axis=0)
+    cost_ci = np.percentile(cost_replicates, [tail, 100 - tail], axis=0)
+
+    table = pd.DataFrame({
+        "architecture": [key[0] for key in keys],
+        "memory": [key[1] for key in keys],
+        "cost": cost,
+        "cost_ci_lower": cost_ci[0],
+        "cost_ci_upper": cost_ci[1],
+        f"p{quantile * 100:g}_latency_ms": latency,
+        "latency_ci_lower": latency_ci[0],
+        "latency_ci_upper": latency_ci[1],
+        "on_frontier": pareto_mask(latency, cost)[0],
+        # Share of bootstrap replicates in which the cell is on the frontier.
+        "frontier_probability": pareto_mask(latency_replicates, cost_replicates).mean(axis=0),
+    })
+    if slo_ms is None:
+        table["feasible"] = True
+        table["slo_probability"] = 1.0
+    else:
+        table["feasible"] = latency <= slo_ms
+        table["slo_probability"] = (latency_replicates <= slo_ms).mean(axis=0)
+
+    table["sort_key"] = np.where(table["feasible"], table["cost"], np.inf)
+    table = table.sort_values(["sort_key", f"p{quantile * 100:g}_latency_ms"]).drop(columns="sort_key")
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table.reset_index(drop=True)
+
+
+def benchmark_cells(table, benchmark, use_total_cost=False, pricing=None):
+    """Per-(architecture, memory) cold and warm (client time, cost) samples of one benchmark."""
+    pricing = pricing or default_pricing()
+    price = total_cost if use_total_cost else compute_cost
+    selected = table[(table["benchmark"] == benchmark) & (table["gb_seconds"] > 0)]
+
+    cells = {}
+    for (architecture, memory), cell in selected.groupby(["architecture", "memory"], observed=True):
+        cells[(str(architecture), int(memory))] = {
+            run_type: (
+                cell.loc[cell["type"] == run_type, "client_time"].to_numpy(dtype=float),
+                price(pricing, ARCHITECTURE_KEYS[str(architecture)],
+                      cell.loc[cell["type"] == run_type, "gb_seconds"].to_numpy()),
+            )
+            for run_type in ("cold", "warm")
+        }
+    return cells
+
+
+def recommendations(table, benchmarks=None, slo_ms=None, quantile=LATENCY_QUANTILE, cold_fraction=COLD_FRACTION,
+                    use_total_cost=False, pricing=None):
+    frames = []
+    for benchmark in benchmarks or list(BENCHMARKS):
+        ranked = recommend(benchmark_cells(table, benchmark, use_total_cost, pricing), slo_ms, quantile,
+                           cold_fraction)
+        ranked.insert(0, "benchmark", benchmark)
+        frames.append(ranked)
+    return pd.concat(frames, ignore_index=True)
+
+
+def plot_frontier(ax, ranked, memory_sizes):
+    """Mark the Pareto-frontier cells of `ranked` on a cost-over-memory axis, with their cost CIs,
+    and star the top recommendation if it is feasible."""
+    frontier = ranked[ranked["on_frontier"] & ranked["memory"].isin(memory_sizes)]
+    x_positions = [memory_sizes.index(memory) for memory in frontier["memory"]]
+    ax.errorbar(x_positions, frontier["cost"],
+                yerr=[frontier["cost"] - frontier["cost_ci_lower"], frontier["cost_ci_upper"] - frontier["cost"]],
+                fmt="o", markersize=9, markerfacecolor="none", markeredgecolor="black", ecolor="black",
+                capsize=3, zorder=5)
+
+    best = ranked.iloc[0] if len(ranked) else None
+    if best is not None and best["feasible"] and best["memory"] in memory_sizes:
+        ax.plot(memory_sizes.index(best["memory"]), best["cost"], marker="*", markersize=14, color="black", zorder=6)
+
+
+def frontier_legend_handles():
+    from matplotlib.lines import Line2D
+
+    return [
+        Line2D([], [], marker="o", markersize=9, markerfacecolor="none", markeredgecolor="black", linestyle="none",
+               label="Pareto frontier"),
+        Line2D([], [], marker="*", markersize=14, color="black", linestyle="none", label="Recommended"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend the cheapest architecture and memory size under a "
+                                                 "latency SLO.")
+    parser.add_argument("--slo-ms", type=float, default=None, help="Client-time SLO in milliseconds")
+    parser.add_argument("--quantile", type=float, default=LATENCY_QUANTILE, help="Latency quantile the SLO applies to")
+    parser.add_argument("--cold-fraction", type=float, default=COLD_FRACTION,
+                        help="Share of invocations that are cold starts")
+    parser.add_argument("--total-cost", action="store_true", help="Include the per-request fee in the cost")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(PERF_DIR), "perf_to_cost",
+                                                         "recommendations.csv"))
+    args = parser.parse_args()
+
+    if not 0 <= args.cold_fraction <= 1 or not 0 < args.quantile < 1:
+        parser.error("--cold-fraction must be in [0, 1] and --quantile in (0, 1)")
+
+    table = recommendations(get_invocation_table(PERF_DIR, COST_DIR), args.benchmarks, args.slo_ms, args.quantile,
+                            args.cold_fraction, args.total_cost)
+    table.to_csv(args.output, index=False)
+    print(table[table["rank"] == 1].to_string(index=False))
+    print(f"Saved recommendations: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
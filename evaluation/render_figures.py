@@ -0,0 +1,213 @@
+import argparse
+import importlib.util
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from evaluation.outliers import METHODS
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FIGURE_FORMATS = ("pdf", "png", "svg")
+
+# `render(module, input_dir, output_dir)` draws the figure from the "cost" and "perf" results under
+# `input_dir`.
+FigureJob = namedtuple("FigureJob", ["name", "script", "render"])
+
+
+def _load_script(script):
+    path = os.path.join(EVALUATION_DIR, script)
+    module_name = "evaluation_figure_" + os.path.splitext(script)[0].replace(os.sep, "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _render_cost(module, input_dir, output_dir):
+    module.create_cost_plots(use_total_cost=False, cost_dir=os.path.join(input_dir, "cost"), output_dir=output_dir)
+
+
+def _render_total_cost(module, input_dir, output_dir):
+    module.create_cost_plots(use_total_cost=True, cost_dir=os.path.join(input_dir, "cost"), output_dir=output_dir)
+
+
+def _render_client_cold_boxplots(module, input_dir, output_dir):
+    module.create_cold_boxplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_client_warm_boxplots(module, input_dir, output_dir):
+    module.create_warm_boxplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_client_lineplots(module, input_dir, output_dir):
+    module.create_lineplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_execution_boxplots(module, input_dir, output_dir):
+    module.create_execution_time_boxplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_execution_lineplots(module, input_dir, output_dir):
+    module.create_execution_time_lineplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_memory_bar_charts(module, input_dir, output_dir):
+    module.create_bar_plots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_memory_line_plots(module, input_dir, output_dir):
+    module.create_line_plots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_ratio_boxplots(module, input_dir, output_dir):
+    module.create_ratio_boxplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_ratio_lineplots(module, input_dir, output_dir):
+    module.create_ratio_lineplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_tail_latency_lineplots(module, input_dir, output_dir):
+    module.create_tail_lineplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_decomposition_cold(module, input_dir, output_dir):
+    module.create_decomposition_barplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir, "cold")
+
+
+def _render_decomposition_warm(module, input_dir, output_dir):
+    module.create_decomposition_barplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir, "warm")
+
+
+def _render_io_throughput_lineplots(module, input_dir, output_dir):
+    module.create_throughput_lineplots(module.prepare_data(os.path.join(input_dir, "perf")), output_dir)
+
+
+def _render_perf_to_cost(module, input_dir, output_dir):
+    module.main(cost_dir=os.path.join(input_dir, "cost"), output_dir=output_dir)
+
+
+def _render_perf_to_cost_ratios(module, input_dir, output_dir):
+    module.main(output_dir=output_dir, perf_dir=os.path.join(input_dir, "perf"),
+                cost_dir=os.path.join(input_dir, "cost"))
+
+
+FIGURE_JOBS = [
+    FigureJob("cost", os.path.join("cost", "cost_plots.py"), _render_cost),
+    FigureJob("total_cost", os.path.join("cost", "cost_plots.py"), _render_total_cost),
+    FigureJob("client_time_cold_boxplots", os.path.join("perf", "client_times_combined", "client_times_combined.py"),
+              _render_client_cold_boxplots),
+    FigureJob("client_time_warm_boxplots", os.path.join("perf", "client_times_combined", "client_times_combined.py"),
+              _render_client_warm_boxplots),
+    FigureJob("client_time_lineplots", os.path.join("perf", "client_times_combined", "client_times_combined.py"),
+              _render_client_lineplots),
+    FigureJob("execution_time_boxplots", os.path.join("perf", "exec_time_combined", "execution_times_plots.py"),
+              _render_execution_boxplots),
+    FigureJob("execution_time_lineplots", os.path.join("perf", "exec_time_combined", "execution_times_plots.py"),
+              _render_execution_lineplots),
+    FigureJob("memory_usage_bar_charts", os.path.join("perf", "barCharts_memory", "mem_bar_charts.py"),
+              _render_memory_bar_charts),
+    FigureJob("memory_usage_line_plots", os.path.join("perf", "barCharts_memory", "mem_bar_charts.py"),
+              _render_memory_line_plots),
+    FigureJob("cold_to_warm_ratio_boxplots", os.path.join("perf", "cold_start_ratios", "cold_start_ratios.py"),
+              _render_ratio_boxplots),
+    FigureJob("cold_to_warm_ratio_lineplots", os.path.join("perf", "cold_start_ratios", "cold_start_ratios.py"),
+              _render_ratio_lineplots),
+    FigureJob("tail_latency_lineplots", os.path.join("perf", "tail_latency", "tail_latency_plots.py"),
+              _render_tail_latency_lineplots),
+    FigureJob("latency_decomposition_cold",
+              os.path.join("perf", "latency_decomposition", "latency_decomposition_plots.py"),
+              _render_decomposition_cold),
+    FigureJob("latency_decomposition_warm",
+              os.path.join("perf", "latency_decomposition", "latency_decomposition_plots.py"),
+              _render_decomposition_warm),
+    FigureJob("io_throughput_lineplots", os.path.join("perf", "io_throughput", "io_throughput_plots.py"),
+              _render_io_throughput_lineplots),
+    FigureJob("cost_comparison", os.path.join("perf_to_cost", "perf_to_cost.py"), _render_perf_to_cost),
+    FigureJob("cost_comparison_total", os.path.join("perf_to_cost", "perf_to_cost_total.py"), _render_perf_to_cost),
+    FigureJob("perf_to_cost_ratios",
+              os.path.join("perf_to_cost", "perf_to_cost", "perf_to_total_cost_pdf_combined.py"),
+              _render_perf_to_cost_ratios),
+]
+
+
+def configure_output(figure_format="pdf", dpi=300, benchmarks=None, show=False, exclude_outliers=False,
+                     outlier_method="mad"):
+    """Set how the figure scripts save their figures and whether they leave out outliers. Must run
+    before matplotlib.pyplot is imported when `show` is False, so that no interactive backend is ever
+    loaded."""
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+
+    from evaluation import utils
+    from evaluation.benchmarks import BENCHMARKS
+    utils.SHOW_FIGURES = show
+    utils.FIGURE_FORMAT = figure_format
+    utils.FIGURE_DPI = dpi
+    utils.EXCLUDE_OUTLIERS = exclude_outliers
+    utils.OUTLIER_METHOD = outlier_method
+    # The scripts import BENCHMARKS from utils when _load_script runs them, so rebinding it to a filtered
+    # copy selects their benchmarks; the configured list itself is never changed.
+    utils.BENCHMARKS = {name: key for name, key in BENCHMARKS.items() if benchmarks is None or name in benchmarks}
+
+
+def _run_job(job, input_dir, output_dir):
+    start = time.perf_counter()
+    module = _load_script(job.script)
+    job.render(module, input_dir, output_dir)
+    return job.name, time.perf_counter() - start
+
+
+def render_figures(output_dir, jobs=None, max_workers=None, input_dir=EVALUATION_DIR, figure_format="pdf", dpi=300,
+                   benchmarks=None, exclude_outliers=False, outlier_method="mad"):
+    """Render the selected figure jobs in worker processes and return their run times in seconds.
+
+    The invocation cache is built here first, so that the workers only ever read it.
+    """
+    from evaluation.invocation_cache import ingest_cost_results
+
+    selected = [job for job in FIGURE_JOBS if jobs is None or job.name in jobs]
+    os.makedirs(output_dir, exist_ok=True)
+    ingest_cost_results(os.path.join(input_dir, "cost"), benchmarks=benchmarks)
+
+    timings = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_output,
+                             initargs=(figure_format, dpi, benchmarks, False, exclude_outliers,
+                                       outlier_method)) as executor:
+        futures = [executor.submit(_run_job, job, input_dir, output_dir) for job in selected]
+        for future in as_completed(futures):
+            name, seconds = future.result()
+            timings[name] = seconds
+            print(f"{name}: {seconds:.2f} s")
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all evaluation figures in parallel without showing them.")
+    parser.add_argument("--output-dir", required=True, help="Directory the figures and side tables are written to")
+    parser.add_argument("--jobs", nargs="+", choices=[job.name for job in FIGURE_JOBS],
+                        help="Only render the given figure jobs")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--input-dir", default=EVALUATION_DIR,
+                        help="Directory containing the 'cost' and 'perf' results (default: %(default)s)")
+    parser.add_argument("--format", choices=FIGURE_FORMATS, default="pdf", help="Figure file format")
+    parser.add_argument("--dpi", type=int, default=300, help="Resolution of raster figures")
+    parser.add_argument("--benchmarks", nargs="+", help="Only plot the given benchmarks")
+    parser.add_argument("--exclude-outliers", action="store_true",
+                        help="Leave invocations far from the rest of their cell out of the figures")
+    parser.add_argument("--outlier-method", choices=METHODS, default="mad",
+                        help="Median/MAD modified z-score or Tukey IQR fence")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    timings = render_figures(os.path.abspath(args.output_dir), args.jobs, args.workers, os.path.abspath(args.input_dir),
+                             args.format, args.dpi, args.benchmarks, args.exclude_outliers, args.outlier_method)
+    print(f"Rendered {len(timings)} figure jobs in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
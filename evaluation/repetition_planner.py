@@ -0,0 +1,107 @@
+import json
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from evaluation.invocation_table import PERF_DIR, get_invocation_table
+from evaluation.outliers import NOISY_CI_WIDTH
+from evaluation.resampling import CI_LEVEL
+from evaluation.significance import ALPHA, PAIR_KEYS
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(os.path.dirname(EVALUATION_DIR), "config")
+
+CELL_KEYS = ["type", "benchmark", "memory", "architecture"]
+ARCHITECTURE_KEYS = {"ARM": "arm", "x86": "x86"}
+PLAN_METRIC = "client_time"
+# Smallest ARM/x86 difference in means, relative to their average, the plan should detect, and
+# the probability of detecting it.
+MIN_DIFFERENCE = 0.1
+POWER = 0.8
+MIN_REPETITIONS = 10
+MAX_REPETITIONS = 500
+
+
+def _required(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.ceil(numerator / denominator)
+
+
+def plan_repetitions(table, metric=PLAN_METRIC, ci_width=NOISY_CI_WIDTH, min_difference=MIN_DIFFERENCE,
+                     power=POWER, alpha=ALPHA):
+    """Repetitions every (type, benchmark, memory, architecture) cell needs, from its observed
+    mean and standard deviation of `metric`, using normal approximations:
+
+    * `ci_repetitions` brings the width of the CI of the mean below `ci_width` of the mean.
+    * `difference_repetitions` gives the ARM/x86 comparison of the cell `power` to detect a
+      relative difference in means of `min_difference`. Its significance level is `alpha` divided by
+      the number of comparisons, the first step of the Holm correction the summaries apply.
+
+    `repetitions` is the larger of the two, clipped to [MIN_REPETITIONS, MAX_REPETITIONS].
+    """
+    stats = table.groupby(CELL_KEYS, observed=True)[metric].agg(["size", "mean", "std"]).reset_index()
+    stats = stats.rename(columns={"size": "current_repetitions"})
+
+    normal = NormalDist()
+    z_ci = normal.inv_cdf(0.5 + CI_LEVEL / 200)
+    stats["ci_repetitions"] = _required((2 * z_ci * stats["std"]) ** 2, (ci_width * stats["mean"]) ** 2)
+
+    by_architecture = stats.set_index(PAIR_KEYS + ["architecture"])[["mean", "std"]].unstack("architecture")
+    pairs = by_architecture.reindex(columns=pd.MultiIndex.from_product([["mean", "std"], ["ARM", "x86"]])).dropna()
+    z_test = normal.inv_cdf(1 - alpha / max(len(pairs), 1) / 2) + normal.inv_cdf(power)
+    difference = min_difference * (pairs[("mean", "ARM")] + pairs[("mean", "x86")]) / 2
+    variance = pairs[("std", "ARM")] ** 2 + pairs[("std", "x86")] ** 2
+    repetitions = _required(z_test ** 2 * variance, difference ** 2).rename("difference_repetitions")
+    stats = stats.join(repetitions, on=PAIR_KEYS)
+
+    needed = stats[["ci_repetitions", "difference_repetitions"]].max(axis=1)
+    stats["repetitions"] = needed.fillna(MIN_REPETITIONS).clip(MIN_REPETITIONS, MAX_REPETITIONS).astype(int)
+    stats["saved_invocations"] = stats["current_repetitions"] - stats["repetitions"]
+    for column in ["type", "benchmark", "architecture"]:
+        stats[column] = stats[column].astype(str)
+    return stats.drop(columns=["mean", "std"])
+
+
+def planned_configs(plan, config_dir=CONFIG_DIR):
+    """SeBS perf-cost configs of the plan, one per benchmark, architecture, memory size and run type,
+    as {file name: config}. Each starts from config/<benchmark>_<arch>.json; benchmarks without one
+    are skipped. No batch invokes more functions than the cell needs."""
+    configs = {}
+    for row in plan.itertuples():
+        arch = ARCHITECTURE_KEYS[row.architecture]
+        template_path = os.path.join(config_dir, f"{row.benchmark}_{arch}.json")
+        if not os.path.exists(template_path):
+            continue
+        with open(template_path) as f:
+            config = json.load(f)
+
+        perf_cost = config["experiments"]["perf-cost"]
+        perf_cost["experiments"] = [row.type]
+        perf_cost["memory-sizes"] = [int(row.memory)]
+        perf_cost["repetitions"] = int(row.repetitions)
+        perf_cost["concurrent-invocations"] = min(perf_cost["concurrent-invocations"], int(row.repetitions))
+        configs[f"{row.benchmark}_{arch}_{row.memory}_{row.type}.json"] = config
+    return configs
+
+
+def write_plan(plan, output_dir, config_dir=CONFIG_DIR):
+    """Write repetition_plan.csv and the planned configs under `output_dir`; return the config paths."""
+    os.makedirs(os.path.join(output_dir, "configs"), exist_ok=True)
+    plan.to_csv(os.path.join(output_dir, "repetition_plan.csv"), index=False)
+    paths = []
+    for name, config in planned_configs(plan, config_dir).items():
+        path = os.path.join(output_dir, "configs", name)
+        with open(path, "w") as f:
+            json.dump(config, f, indent=2)
+            f.write("\n")
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    pd.set_option("display.width", 200)
+    plan = plan_repetitions(get_invocation_table(PERF_DIR))
+    print(plan.to_string(index=False))
+    print(f"{int(plan['current_repetitions'].sum())} invocations ran, {int(plan['repetitions'].sum())} planned")
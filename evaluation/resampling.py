@@ -0,0 +1,179 @@
+from statistics import NormalDist
+
+import numpy as np
+
+BOOTSTRAP_SEED = 42
+N_BOOTSTRAPS = 1000
+CI_LEVEL = 95
+
+# Upper bound on the number of resampled indices held in memory at once.
+MAX_CHUNK_ELEMENTS = 2 ** 22
+
+TWO_SAMPLE_STATISTICS = ("ratio", "difference")
+CENTERS = ("mean", "median")
+CI_METHODS = ("percentile", "bca")
+
+
+def _resampled_means(rng, data, n_bootstraps, max_chunk_elements, center="mean"):
+    n = len(data)
+    rows_per_chunk = max(1, max_chunk_elements // n)
+    means = np.empty(n_bootstraps)
+    reduce = np.median if center == "median" else np.mean
+
+    for start in range(0, n_bootstraps, rows_per_chunk):
+        stop = min(start + rows_per_chunk, n_bootstraps)
+        indices = rng.integers(0, n, size=(stop - start, n))
+        means[start:stop] = reduce(data[indices], axis=1)
+
+    return means
+
+
+def _jackknife_means(data):
+    n = len(data)
+    return (data.sum() - data) / (n - 1)
+
+
+def _jackknife_medians(data):
+    # Leaving out the i-th smallest value shifts every order statistic at or above i down by one,
+    # so all leave-one-out medians come from the sorted sample in linear time.
+    ordered = np.sort(data)
+    removed = np.arange(len(ordered))
+    remaining = len(ordered) - 1
+
+    def order_statistic(k):
+        return np.where(removed > k, ordered[k], ordered[k + 1])
+
+    if remaining % 2:
+        return order_statistic(remaining // 2)
+    return (order_statistic(remaining // 2 - 1) + order_statistic(remaining // 2)) / 2
+
+
+def _jackknife(data, center):
+    return _jackknife_medians(data) if center == "median" else _jackknife_means(data)
+
+
+def _combine(statistic, mean1, mean2):
+    if statistic == "ratio":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return mean1 / mean2
+    return mean1 - mean2
+
+
+def _percentile_interval(replicates, ci):
+    lower_percentile = (100 - ci) / 2
+    upper_percentile = 100 - lower_percentile
+    ci_lower, ci_upper = np.percentile(replicates, [lower_percentile, upper_percentile])
+    return ci_lower, ci_upper
+
+
+def _bca_interval(replicates, estimate, jackknife, ci):
+    proportion_below = np.mean(replicates < estimate)
+    if proportion_below <= 0 or proportion_below >= 1:
+        return _percentile_interval(replicates, ci)
+
+    normal = NormalDist()
+    z0 = normal.inv_cdf(proportion_below)
+
+    deviations = jackknife.mean() - jackknife
+    denominator = 6 * np.sum(deviations ** 2) ** 1.5
+    acceleration = np.sum(deviations ** 3) / denominator if denominator > 0 else 0.0
+
+    alpha = (100 - ci) / 200
+    adjusted = []
+    for z_alpha in (normal.inv_cdf(alpha), normal.inv_cdf(1 - alpha)):
+        shifted = z0 + z_alpha
+        adjusted.append(normal.cdf(z0 + shifted / (1 - acceleration * shifted)) * 100)
+
+    ci_lower, ci_upper = np.percentile(replicates, adjusted)
+    return ci_lower, ci_upper
+
+
+def _interval(replicates, estimate, jackknife, ci, method):
+    if method == "bca":
+        return _bca_interval(replicates, estimate, jackknife, ci)
+    return _percentile_interval(replicates, ci)
+
+
+def _check_method(method):
+    if method not in CI_METHODS:
+        raise ValueError(f"Unknown CI method '{method}', expected one of {CI_METHODS}")
+
+
+def bootstrap_mean_ci(data, n_bootstraps=N_BOOTSTRAPS, ci=CI_LEVEL, method="percentile", seed=BOOTSTRAP_SEED,
+                      max_chunk_elements=MAX_CHUNK_ELEMENTS):
+    """Mean of a sample and its bootstrap confidence interval.
+
+    All resamples are drawn as one index matrix per chunk from a generator seeded with `seed`,
+    so the same input always produces the same interval. An empty sample has no mean: it gives
+    NaN and a NaN interval.
+    """
+    _check_method(method)
+    data = np.asarray(data, dtype=float)
+    if len(data) == 0:
+        return np.nan, (np.nan, np.nan)
+    mean = np.mean(data)
+
+    rng = np.random.default_rng(seed)
+    replicates = _resampled_means(rng, data, n_bootstraps, max_chunk_elements)
+
+    jackknife = None
+    if method == "bca" and len(data) > 1:
+        jackknife = _jackknife_means(data)
+    elif method == "bca":
+        method = "percentile"
+
+    return mean, _interval(replicates, mean, jackknife, ci, method)
+
+
+def bootstrap_two_sample_ci(data1, data2, statistic="ratio", n_bootstraps=N_BOOTSTRAPS, ci=CI_LEVEL,
+                            method="percentile", seed=BOOTSTRAP_SEED, max_chunk_elements=MAX_CHUNK_ELEMENTS,
+                            center="mean"):
+    """Ratio or difference of two sample means (or medians) and its bootstrap confidence interval.
+
+    Both samples are resampled independently from child streams of `seed`. For ratios, replicates
+    whose resampled denominator is not positive are discarded. If either sample is empty, the
+    estimate and its interval are NaN.
+    """
+    _check_method(method)
+    if statistic not in TWO_SAMPLE_STATISTICS:
+        raise ValueError(f"Unknown statistic '{statistic}', expected one of {TWO_SAMPLE_STATISTICS}")
+    if center not in CENTERS:
+        raise ValueError(f"Unknown center '{center}', expected one of {CENTERS}")
+
+    data1 = np.asarray(data1, dtype=float)
+    data2 = np.asarray(data2, dtype=float)
+    if len(data1) == 0 or len(data2) == 0:
+        return np.nan, (np.nan, np.nan)
+    reduce = np.median if center == "median" else np.mean
+    mean1 = reduce(data1)
+    mean2 = reduce(data2)
+
+    if statistic == "ratio":
+        estimate = mean1 / mean2 if mean2 != 0 else 0
+    else:
+        estimate = mean1 - mean2
+
+    seed_sequence = np.random.SeedSequence(seed)
+    rng1, rng2 = (np.random.default_rng(child) for child in seed_sequence.spawn(2))
+    means1 = _resampled_means(rng1, data1, n_bootstraps, max_chunk_elements, center)
+    means2 = _resampled_means(rng2, data2, n_bootstraps, max_chunk_elements, center)
+
+    if statistic == "ratio":
+        valid = means2 > 0
+        means1, means2 = means1[valid], means2[valid]
+        if len(means2) == 0:
+            return estimate, (estimate, estimate)
+
+    replicates = _combine(statistic, means1, means2)
+
+    jackknife = None
+    if method == "bca" and len(data1) > 1 and len(data2) > 1:
+        jackknife = np.concatenate([
+            _combine(statistic, _jackknife(data1, center), mean2),
+            _combine(statistic, mean1, _jackknife(data2, center))
+        ])
+        jackknife = jackknife[np.isfinite(jackknife)]
+    elif method == "bca":
+        method = "percentile"
+
+    return estimate, _interval(replicates, estimate, jackknife, ci, method)
@@ -0,0 +1,205 @@
+import json
+import os
+import sys
+import time
+from json.decoder import scanstring
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported.
+    resource = None
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",}] \t\n\r"
+
+
+class _JsonStream:
+    """Buffered cursor over a JSON text that only keeps the unread tail of the file in memory."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} of the buffer, found '{found}'")
+        self.pos += 1
+
+    def read_string(self):
+        self.expect('"')
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def read_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A scalar ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        first = self.peek()
+        if first not in "{[":
+            if first == '"':
+                self.read_string()
+            else:
+                self._skip_scalar()
+            return
+
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            if self.pos >= len(self.buffer) and not self._fill():
+                raise ValueError("Unexpected end of file while skipping a value")
+            char = self.buffer[self.pos]
+            self.pos += 1
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_scalar(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] not in _DELIMITERS:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return
+
+    def iter_object(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' after the value of '{key}', found '{separator}'")
+
+
+def get_field(record, path):
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def iter_invocation_items(file_path, invocation_key=None, chunk_size=CHUNK_SIZE, stats=None):
+    """Yield (function, request_id, record) for every entry of `_invocations` without loading the file.
+
+    Sections other than `_invocations` are skipped token by token, and reading stops as soon as
+    `_invocations` has been consumed. If `stats` is a dict, it is filled with the number of
+    invocations read, the elapsed time and the throughput once the generator is exhausted.
+    """
+    start = time.perf_counter()
+    count = 0
+
+    with open(file_path, "r") as f:
+        stream = _JsonStream(f, chunk_size)
+        for section in stream.iter_object():
+            if section != "_invocations":
+                stream.skip_value()
+                continue
+
+            for function in stream.iter_object():
+                if invocation_key is not None and function != invocation_key:
+                    stream.skip_value()
+                    continue
+                for request_id in stream.iter_object():
+                    count += 1
+                    yield function, request_id, stream.read_value()
+            break
+
+    if stats is not None:
+        elapsed = time.perf_counter() - start
+        stats["invocations"] = count
+        stats["seconds"] = elapsed
+        stats["invocations_per_second"] = count / elapsed if elapsed > 0 else float("inf")
+
+
+def iter_invocations(file_path, invocation_key=None, fields=None, chunk_size=CHUNK_SIZE, stats=None):
+    """Yield invocation records, reduced to the dotted `fields` paths when given."""
+    for _, _, record in iter_invocation_items(file_path, invocation_key, chunk_size, stats):
+        if fields is None:
+            yield record
+        else:
+            yield {field: get_field(record, field) for field in fields}
+
+
+def main(file_paths):
+    for file_path in file_paths:
+        stats = {}
+        for _ in iter_invocations(file_path, fields=["billing._gb_seconds"], stats=stats):
+            pass
+        size_mb = os.path.getsize(file_path) / 1024 ** 2
+        print(f"{file_path}: {stats['invocations']} invocations, {size_mb:.1f} MB in {stats['seconds']:.3f} s "
+              f"({stats['invocations_per_second']:.0f} invocations/s)")
+
+    if resource is not None:
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"Peak RSS: {peak_rss_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
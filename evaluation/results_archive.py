@@ -0,0 +1,155 @@
+import io
+import json
+import os
+import re
+import sys
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from evaluation.invocation_cache import flatten_invocations
+from evaluation.invocation_table import ARCHITECTURES, RUN_TYPES, build_archive_invocation_table
+
+# Canonical benchmark names, used to repair truncated or differently cased directory names.
+ARCHIVE_BENCHMARKS = [
+    "110.dynamic-html", "120.uploader", "210.thumbnailer", "220.video-processing",
+    "311.compression", "501.graph-pagerank", "502.graph-mst", "503.graph-bfs"
+]
+
+MEMBER_KINDS = ("processed", "raw", "summary")
+
+ArchiveMember = namedtuple("ArchiveMember", ["name", "arch", "benchmark", "memory", "run_type", "kind"])
+
+_MEMBER_PATTERN = re.compile(r"(?:^|/)(?P<arch>arm|x86)/(?P<directory>[^/]+)/perf-cost/(?P<filename>[^/]+)$")
+_RESULTS_PATTERN = re.compile(r"^(?P<run_type>cold|warm)_results_(?P<memory>\d+)(?P<processed>-processed)?\.json$")
+
+_worker_archive = None
+
+
+def normalize_benchmark(directory):
+    name = re.sub(r"(-arm)?-result$", "", directory.lower())
+    number = name.split(".", 1)[0]
+    for benchmark in ARCHIVE_BENCHMARKS:
+        if benchmark == name or benchmark.split(".", 1)[0] == number:
+            return benchmark
+    return name
+
+
+def _is_junk(name):
+    basename = os.path.basename(name.rstrip("/"))
+    return name.startswith("__MACOSX/") or basename == ".DS_Store" or basename.startswith("._")
+
+
+def parse_member_name(name):
+    if _is_junk(name) or name.endswith("/"):
+        return None
+
+    match = _MEMBER_PATTERN.search(name)
+    if match is None:
+        return None
+
+    arch = match.group("arch")
+    benchmark = normalize_benchmark(match.group("directory"))
+    filename = match.group("filename")
+
+    if filename == "result.csv":
+        return ArchiveMember(name, arch, benchmark, None, None, "summary")
+
+    results = _RESULTS_PATTERN.match(filename)
+    if results is None:
+        return None
+    kind = "processed" if results.group("processed") else "raw"
+    return ArchiveMember(name, arch, benchmark, int(results.group("memory")), results.group("run_type"), kind)
+
+
+def index_archive(zip_path, kinds=MEMBER_KINDS, benchmarks=None):
+    with zipfile.ZipFile(zip_path) as archive:
+        names = archive.namelist()
+
+    members = [parse_member_name(name) for name in names]
+    return [
+        member for member in members
+        if member is not None and member.kind in kinds and (benchmarks is None or member.benchmark in benchmarks)
+    ]
+
+
+def _open_worker_archive(zip_path):
+    global _worker_archive
+    _worker_archive = zipfile.ZipFile(zip_path)
+
+
+def _decode_member(member):
+    data = _worker_archive.read(member.name)
+
+    if member.kind == "summary":
+        frame = pd.read_csv(io.BytesIO(data))
+        frame.columns = frame.columns.str.strip()
+        return member, frame
+
+    results = json.loads(data)
+    if member.kind == "raw":
+        return member, results
+    invocations = results.get("_invocations", {})
+    return member, {function: flatten_invocations(records.values()) for function, records in invocations.items()}
+
+
+def load_archive(zip_path, kinds=("processed", "summary"), benchmarks=None, max_workers=None):
+    """Decode archive members in parallel without extracting them.
+
+    Returns a dict with "invocations", mapping (arch, benchmark, memory, run_type) to flattened
+    invocation columns per function, "results", mapping (arch, benchmark) to the SeBS result.csv
+    frame, and "raw", mapping (arch, benchmark, memory, run_type) to the raw result documents.
+    """
+    members = index_archive(zip_path, kinds, benchmarks)
+    loaded = {"invocations": {}, "results": {}, "raw": {}}
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(members) // (4 * workers))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_archive,
+                             initargs=(zip_path,)) as executor:
+        for member, decoded in executor.map(_decode_member, members, chunksize=chunksize):
+            if member.kind == "summary":
+                loaded["results"][(member.arch, member.benchmark)] = decoded
+            elif member.kind == "processed":
+                loaded["invocations"][(member.arch, member.benchmark, member.memory, member.run_type)] = decoded
+            else:
+                loaded["raw"][(member.arch, member.benchmark, member.memory, member.run_type)] = decoded
+
+    return loaded
+
+
+def archive_invocation_table(zip_path, benchmarks=None, max_workers=None):
+    """The invocation table of the archive's SeBS results, built from the archive itself."""
+    loaded = load_archive(zip_path, benchmarks=benchmarks, max_workers=max_workers)
+    return build_archive_invocation_table(loaded, benchmarks)
+
+
+def missing_archive_members(zip_path, benchmarks, memory_sizes):
+    """The result.csv and processed members the evaluation needs that the archive lacks."""
+    present = {(member.arch, member.benchmark, member.memory, member.run_type, member.kind)
+               for member in index_archive(zip_path, ("processed", "summary"), benchmarks)}
+    missing = []
+    for benchmark in benchmarks:
+        for arch in ARCHITECTURES:
+            if (arch, benchmark, None, None, "summary") not in present:
+                missing.append(f"{arch}/{benchmark}/result.csv")
+            missing.extend(f"{arch}/{benchmark}/{run_type}_results_{memory}-processed.json"
+                           for memory in memory_sizes[benchmark] for run_type in RUN_TYPES
+                           if (arch, benchmark, memory, run_type, "processed") not in present)
+    return missing
+
+
+if __name__ == "__main__":
+    default_zip = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "results", "results.zip"))
+    zip_path = sys.argv[1] if len(sys.argv) > 1 else default_zip
+
+    loaded = load_archive(zip_path)
+    rows = sum(
+        len(next(iter(columns.values()), []))
+        for functions in loaded["invocations"].values()
+        for columns in functions.values()
+    )
+    print(f"Loaded {len(loaded['invocations'])} processed cells ({rows} invocations) and "
+          f"{len(loaded['results'])} result tables from {zip_path}")
@@ -0,0 +1,221 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is recorded as None.
+    resource = None
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+WORK_DIR = "scalability-runs"
+SCALABILITY_STAGES = ["ingest", "get_all_costs", "bootstrap", "summaries", "figures"]
+# A stage is reported as slower when it takes this much longer than in the last comparable run.
+SLOWDOWN_THRESHOLD = 1.25
+
+# Every stage takes (data_dir, output_dir, options) and returns how many items it processed, or
+# (items, seconds) when only part of its work should be timed.
+
+
+def _stage_ingest(data_dir, output_dir, options):
+    from evaluation.invocation_cache import CACHE_DIR_NAME, ingest_cost_results
+
+    for cache_dir in glob.glob(os.path.join(data_dir, "cost", "*", "*", CACHE_DIR_NAME)):
+        shutil.rmtree(cache_dir)
+    return len(ingest_cost_results(os.path.join(data_dir, "cost")))
+
+
+def _stage_get_all_costs(data_dir, output_dir, options):
+    from evaluation.invocation_table import invocation_key
+    from evaluation.utils import get_all_costs
+
+    priced = 0
+    for path in sorted(glob.glob(os.path.join(data_dir, "cost", "*", "*", "*-processed.json"))):
+        arch_dir = os.path.dirname(path)
+        benchmark = os.path.basename(os.path.dirname(arch_dir))
+        priced += len(get_all_costs(path, invocation_key(benchmark), os.path.basename(arch_dir) == "arm"))
+    return priced
+
+
+def _stage_bootstrap(data_dir, output_dir, options):
+    from evaluation.invocation_table import build_invocation_table
+    from evaluation.utils import calculate_bootstrap_ci
+
+    table = build_invocation_table(os.path.join(data_dir, "perf"), os.path.join(data_dir, "cost"))
+    start = time.perf_counter()
+    cells = table.groupby(["benchmark", "architecture", "memory", "type"], observed=True)["client_time"]
+    for _, values in cells:
+        calculate_bootstrap_ci(values.to_numpy())
+    # Building the table belongs to the summaries stage; only the resampling is timed here.
+    return cells.ngroups, time.perf_counter() - start
+
+
+def _stage_summaries(data_dir, output_dir, options):
+    from evaluation.invocation_table import build_invocation_table
+    from evaluation.summaries import write_summaries
+
+    benchmarks = options.get("benchmarks")
+    table = build_invocation_table(os.path.join(data_dir, "perf"), os.path.join(data_dir, "cost"), benchmarks)
+    return len(write_summaries(table, os.path.join(output_dir, "tables"), benchmarks))
+
+
+def _stage_figures(data_dir, output_dir, options):
+    from evaluation.render_figures import render_figures
+    return len(render_figures(os.path.join(output_dir, "figures"), options.get("figures"), options.get("workers"),
+                              data_dir, benchmarks=options.get("benchmarks")))
+
+
+STAGE_FUNCTIONS = {
+    "ingest": _stage_ingest,
+    "get_all_costs": _stage_get_all_costs,
+    "bootstrap": _stage_bootstrap,
+    "summaries": _stage_summaries,
+    "figures": _stage_figures,
+}
+
+
+def _measure_stage(name, data_dir, output_dir, options):
+    os.environ["MPLBACKEND"] = "Agg"
+    os.environ["EVALUATION_SHOW_FIGURES"] = "0"
+
+    start = time.perf_counter()
+    result = STAGE_FUNCTIONS[name](data_dir, output_dir, options)
+    seconds = time.perf_counter() - start
+    if isinstance(result, tuple):
+        result, seconds = result
+
+    peak_rss_mb = None
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux. Figure workers are child processes of the stage.
+        peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                      resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        peak_rss_mb = round(peak_kb / 1024, 1)
+    return {"seconds": round(seconds, 4), "peak_rss_mb": peak_rss_mb, "items": result}
+
+
+def run_stage(name, data_dir, output_dir, options=None):
+    """Run one stage in a fresh interpreter so that its peak memory is not shared with other stages."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_measure_stage, name, data_dir, output_dir, options or {}).result()
+
+
+def prepare_data(work_dir, invocations, benchmarks=None, seed=0):
+    from evaluation.synthetic import generate_results
+
+    # Each benchmark selection gets its own data, so a run never reuses another selection's subset.
+    name = f"data-{invocations}-seed{seed}"
+    if benchmarks is not None:
+        name += "-" + "+".join(sorted(benchmarks))
+    data_dir = os.path.join(work_dir, name)
+    marker = os.path.join(data_dir, "generated.json")
+    selection = None if benchmarks is None else sorted(benchmarks)
+    if not os.path.exists(marker) or _read_marker(marker).get("benchmarks") != selection:
+        shutil.rmtree(data_dir, ignore_errors=True)
+        start = time.perf_counter()
+        written = generate_results(data_dir, benchmarks, invocations=invocations, seed=seed)
+        with open(marker, "w") as f:
+            json.dump({"files": len(written), "benchmarks": selection,
+                       "seconds": round(time.perf_counter() - start, 3)}, f)
+    return data_dir
+
+
+def _read_marker(marker):
+    with open(marker, "r") as f:
+        return json.load(f)
+
+
+def _git_commit():
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=EVALUATION_DIR,
+                                   capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def load_history(history_path):
+    if not os.path.exists(history_path):
+        return []
+    with open(history_path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_to_history(entry, history):
+    """Per-stage time ratios against the most recent run with the same scale and stages."""
+    for previous in reversed(history):
+        if previous["scale"] == entry["scale"]:
+            return {
+                name: round(stage["seconds"] / previous["stages"][name]["seconds"], 3)
+                for name, stage in entry["stages"].items()
+                if name in previous["stages"] and previous["stages"][name]["seconds"] > 0
+            }
+    return {}
+
+
+def run_suite(work_dir=WORK_DIR, scales=(50,), stages=SCALABILITY_STAGES, benchmarks=None, figures=None,
+              workers=None, history_path=None, seed=0):
+    history_path = history_path or os.path.join(work_dir, "history.jsonl")
+    os.makedirs(work_dir, exist_ok=True)
+    entries = []
+
+    for invocations in scales:
+        data_dir = prepare_data(work_dir, invocations, benchmarks, seed)
+        output_dir = os.path.join(work_dir, f"output-{invocations}")
+        options = {"figures": figures, "workers": workers, "benchmarks": benchmarks}
+
+        entry = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "scale": {"invocations": invocations, "benchmarks": benchmarks, "figures": figures, "seed": seed},
+            "stages": {},
+        }
+        for name in stages:
+            entry["stages"][name] = run_stage(name, data_dir, output_dir, options)
+            peak_rss_mb = entry["stages"][name]["peak_rss_mb"]
+            print(f"[{invocations} invocations] {name}: {entry['stages'][name]['seconds']:.2f} s"
+                  + ("" if peak_rss_mb is None else f", {peak_rss_mb:.0f} MB peak"))
+
+        entry["relative_to_previous"] = compare_to_history(entry, load_history(history_path))
+        slower = {name: ratio for name, ratio in entry["relative_to_previous"].items() if ratio > SLOWDOWN_THRESHOLD}
+        for name, ratio in slower.items():
+            print(f"[{invocations} invocations] {name} is {ratio:.2f}x slower than the previous run")
+
+        with open(history_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        entries.append(entry)
+
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile the evaluation stages on synthetic results.")
+    parser.add_argument("--work-dir", default=WORK_DIR, help="Directory for generated data, outputs and history")
+    parser.add_argument("--invocations", nargs="+", type=int, default=[50],
+                        help="Invocations per memory size and run type, one run per value")
+    parser.add_argument("--stages", nargs="+", choices=SCALABILITY_STAGES, default=SCALABILITY_STAGES)
+    parser.add_argument("--benchmarks", nargs="+", help="Benchmarks to generate (default: all)")
+    parser.add_argument("--figures", nargs="+", help="Figure jobs rendered by the figures stage (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for the figures stage")
+    parser.add_argument("--history", default=None, help="JSON Lines history file (default: <work-dir>/history.jsonl)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    entries = run_suite(os.path.abspath(args.work_dir), args.invocations, args.stages, args.benchmarks, args.figures,
+                        args.workers, args.history, args.seed)
+    if any(ratio > SLOWDOWN_THRESHOLD for entry in entries for ratio in entry["relative_to_previous"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
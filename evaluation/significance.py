@@ -0,0 +1,140 @@
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from evaluation.invocation_table import get_invocation_table
+from evaluation.resampling import BOOTSTRAP_SEED, MAX_CHUNK_ELEMENTS, bootstrap_two_sample_ci
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+
+# ARM and x86 are compared within every (type, benchmark, memory) cell.
+PAIR_KEYS = ["type", "benchmark", "memory"]
+N_PERMUTATIONS = 9999
+ALPHA = 0.05
+# Thresholds on |Cliff's delta| for small, medium and large effects (Romano et al., 2006).
+EFFECT_SIZES = [(0.147, "negligible"), (0.33, "small"), (0.474, "medium"), (np.inf, "large")]
+NO_DIFFERENCE = "no significant difference"
+MISSING = "N/A"
+COMPARISON_COLUMNS = ["faster", "speedup", "speedup_ci_lower", "speedup_ci_upper", "cliffs_delta", "effect_size",
+                      "p_permutation", "p_mann_whitney", "p_permutation_holm", "p_permutation_bh",
+                      "p_mann_whitney_holm", "p_mann_whitney_bh", "significant"]
+
+
+def permutation_test(data1, data2, n_permutations=N_PERMUTATIONS, seed=BOOTSTRAP_SEED,
+                     max_chunk_elements=MAX_CHUNK_ELEMENTS):
+    """Two-sided p-value of the difference in means under random relabelling of the pooled sample.
+
+    Each chunk of permutations is one matrix of random sort keys, so no Python loop runs per
+    permutation. The observed labelling counts as one permutation, so p is never 0.
+    """
+    data1 = np.asarray(data1, dtype=float)
+    pooled = np.concatenate([data1, np.asarray(data2, dtype=float)])
+    n1, n = len(data1), len(pooled)
+    total = pooled.sum()
+    observed = abs(data1.mean() - (total - data1.sum()) / (n - n1))
+
+    rng = np.random.default_rng(seed)
+    rows_per_chunk = max(1, max_chunk_elements // n)
+    extreme = 0
+    for start in range(0, n_permutations, rows_per_chunk):
+        rows = min(rows_per_chunk, n_permutations - start)
+        first = np.argpartition(rng.random((rows, n)), n1 - 1, axis=1)[:, :n1]
+        sums = pooled[first].sum(axis=1)
+        differences = np.abs(sums / n1 - (total - sums) / (n - n1))
+        # Tolerate rounding so relabellings equal to the observed one count as extreme.
+        extreme += np.count_nonzero(differences >= observed * (1 - 1e-12))
+    return (extreme + 1) / (n_permutations + 1)
+
+
+def mann_whitney(data1, data2):
+    """Mann-Whitney U test: (U of data1, two-sided p-value).
+
+    U counts the pairs in which data1 is larger, ties counting half. The p-value uses the normal
+    approximation with tie and continuity corrections, which is accurate for samples of this size.
+    """
+    data1, data2 = np.asarray(data1, dtype=float), np.asarray(data2, dtype=float)
+    n1, n2 = len(data1), len(data2)
+    n = n1 + n2
+    ranks = pd.Series(np.concatenate([data1, data2])).rank().to_numpy()
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+
+    _, ties = np.unique(np.concatenate([data1, data2]), return_counts=True)
+    variance = n1 * n2 / 12 * ((n + 1) - np.sum(ties ** 3 - ties) / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    deviation = max(abs(u - n1 * n2 / 2) - 0.5, 0)
+    return u, min(1.0, 2 * (1 - NormalDist().cdf(deviation / np.sqrt(variance))))
+
+
+def holm(p_values):
+    """Holm step-down adjusted p-values; NaNs are left out of the family and stay NaN."""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full(len(p_values), np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    order = valid[np.argsort(p_values[valid], kind="stable")]
+    m = len(order)
+    steps = p_values[order] * (m - np.arange(m))
+    adjusted[order] = np.minimum(np.maximum.accumulate(steps), 1)
+    return adjusted
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini-Hochberg (false discovery rate) adjusted p-values; NaNs stay NaN."""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full(len(p_values), np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    order = valid[np.argsort(p_values[valid], kind="stable")]
+    m = len(order)
+    steps = p_values[order] * m / np.arange(1, m + 1)
+    adjusted[order] = np.minimum(np.minimum.accumulate(steps[::-1])[::-1], 1)
+    return adjusted
+
+
+def effect_size_label(delta):
+    if np.isnan(delta):
+        return MISSING
+    return next(label for threshold, label in EFFECT_SIZES if abs(delta) < threshold)
+
+
+def compare_architectures(table, metric, alpha=ALPHA):
+    """ARM vs x86 on `metric` for every (type, benchmark, memory) cell of `table`, one row per cell.
+
+    `speedup` is the x86 mean over the ARM mean with its bootstrap CI, so values above 1 mean ARM
+    is faster. `cliffs_delta` is P(ARM < x86) - P(ARM > x86) over all pairs of invocations. The
+    p-values are corrected with Holm and Benjamini-Hochberg across all cells of the table, and
+    `faster` names an architecture only when the Holm-corrected permutation test is significant.
+    Cells where one architecture has no invocations get "N/A" and NaNs.
+    """
+    rows = []
+    for key, cell in table.groupby(PAIR_KEYS, observed=True, sort=True):
+        arm = cell.loc[cell["architecture"] == "ARM", metric].to_numpy(dtype=float)
+        x86 = cell.loc[cell["architecture"] == "x86", metric].to_numpy(dtype=float)
+        row = dict(zip(PAIR_KEYS, key))
+        if len(arm) and len(x86):
+            speedup, (lower, upper) = bootstrap_two_sample_ci(x86, arm, statistic="ratio")
+            u, p_mann_whitney = mann_whitney(arm, x86)
+            row.update(speedup=speedup, speedup_ci_lower=lower, speedup_ci_upper=upper,
+                       cliffs_delta=1 - 2 * u / (len(arm) * len(x86)), p_permutation=permutation_test(arm, x86),
+                       p_mann_whitney=p_mann_whitney)
+        rows.append(row)
+
+    comparison = pd.DataFrame(rows).reindex(columns=PAIR_KEYS + COMPARISON_COLUMNS)
+    for test in ["permutation", "mann_whitney"]:
+        comparison[f"p_{test}_holm"] = holm(comparison[f"p_{test}"])
+        comparison[f"p_{test}_bh"] = benjamini_hochberg(comparison[f"p_{test}"])
+
+    comparison["significant"] = comparison["p_permutation_holm"] < alpha
+    comparison["effect_size"] = comparison["cliffs_delta"].map(effect_size_label)
+    comparison["faster"] = np.select(
+        [comparison["p_permutation"].isna(), ~comparison["significant"], comparison["speedup"] > 1],
+        [MISSING, NO_DIFFERENCE, "ARM"], default="x86")
+    return comparison
+
+
+if __name__ == "__main__":
+    table = get_invocation_table(PERF_DIR)
+    pd.set_option("display.width", 200)
+    print(compare_architectures(table[table["type"] == "warm"], "exec_time").to_string(index=False))
@@ -0,0 +1,191 @@
+import os
+
+import pandas as pd
+
+from evaluation.benchmarks import BENCHMARKS, MEMORY_SIZES
+from evaluation.concurrency import concurrency_summary
+from evaluation.decomposition import decomposition_summary, handshake_summary
+from evaluation.invocation_table import ARCHITECTURES, RUN_TYPES, get_invocation_table
+from evaluation.lifecycle import container_lifecycle, lifecycle_summary, mislabelled_invocations, mislabelled_mask
+from evaluation.outliers import annotate_outliers, noisy_cells, outlier_invocations, outlier_summary
+from evaluation.quantile_sketch import TAIL_QUANTILES, TailSketch, quantile_label
+from evaluation.significance import MISSING, PAIR_KEYS, compare_architectures
+from evaluation.throughput import io_throughput, memory_effect, throughput_summary
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+
+SUMMARY_QUANTILES = [0.25, 0.75]
+# Tail percentiles of these metrics are appended to every per-cell summary.
+TAIL_METRICS = ["client_time", "exec_time", "provider_time"]
+CELL_KEYS = ["type", "benchmark", "memory", "architecture"]
+
+
+def _select(table, benchmarks):
+    benchmarks = list(BENCHMARKS) if benchmarks is None else list(benchmarks)
+    selected = table[table["benchmark"].isin(benchmarks)].copy()
+    selected["benchmark"] = pd.Categorical(selected["benchmark"].astype(str), categories=benchmarks)
+    return selected
+
+
+def _all_cells(selected):
+    # Every configured cell of the selected benchmarks, plus any memory size only found in the data.
+    cells = []
+    for benchmark in selected["benchmark"].cat.categories:
+        observed = selected.loc[selected["benchmark"] == benchmark, "memory"].unique()
+        for memory in sorted(set(MEMORY_SIZES.get(benchmark, [])) | set(observed.tolist())):
+            for run_type in RUN_TYPES:
+                for architecture in ARCHITECTURES.values():
+                    cells.append((run_type, benchmark, memory, architecture))
+    return pd.MultiIndex.from_tuples(cells, names=CELL_KEYS)
+
+
+def tail_summary(table, benchmarks=None, metrics=TAIL_METRICS, quantiles=TAIL_QUANTILES):
+    """Tail percentiles of `metrics` with bootstrap CIs for every (type, benchmark, memory,
+    architecture) cell, e.g. p99_client_time, p99_client_time_ci_lower and p99_client_time_ci_upper.
+
+    The percentiles come from one TailSketch per metric holding every cell, so they are computed in
+    a single streaming pass rather than by resampling each cell.
+    """
+    selected = _select(table, benchmarks)
+    grouped = selected.groupby(CELL_KEYS, observed=True)
+    cells = grouped.ngroup().to_numpy()
+
+    columns = {}
+    for metric in metrics:
+        sketch = TailSketch(grouped.ngroups).add(selected[metric].to_numpy(), cells)
+        estimates, lower, upper = sketch.quantiles(quantiles)
+        for i, quantile in enumerate(quantiles):
+            name = f"{quantile_label(quantile)}_{metric}"
+            columns[name] = estimates[:, i]
+            columns[f"{name}_ci_lower"] = lower[:, i]
+            columns[f"{name}_ci_upper"] = upper[:, i]
+    return pd.DataFrame(columns, index=grouped.size().index)
+
+
+def summarize_metric(table, metric, benchmarks=None, tails=None):
+    """Mean, median, std and quantiles of `metric` for every (type, benchmark, memory, architecture)
+    cell, from a single groupby, followed by the ARM-vs-x86 comparison of compare_architectures and
+    the cell's tail_summary columns (pass `tails` to reuse an already computed one).
+
+    Every configured memory size, architecture and run type of the selected benchmarks gets a row;
+    cells without invocations have n = 0 and NaN statistics.
+
+    Multiple-testing corrections span every cell of `table`, so pass only the run types reported.
+    """
+    keys = CELL_KEYS
+    selected = _select(table, benchmarks)
+    grouped = selected.groupby(keys, observed=True)[metric]
+
+    summary = grouped.agg(["mean", "median", "std"])
+    summary.columns = [f"{statistic}_{metric}" for statistic in summary.columns]
+    quantiles = grouped.quantile(SUMMARY_QUANTILES).unstack()
+    quantiles.columns = [f"q{round(q * 100)}_{metric}" for q in quantiles.columns]
+    summary = grouped.size().rename("n").to_frame().join(summary).join(quantiles)
+    summary = summary.reset_index().astype({key: str for key in ["type", "benchmark", "architecture"]})
+    summary = summary.set_index(keys).reindex(_all_cells(selected))
+    summary["n"] = summary["n"].fillna(0).astype(int)
+
+    comparison = compare_architectures(selected, metric).set_index(PAIR_KEYS)
+    summary = summary.reset_index().join(comparison, on=PAIR_KEYS)
+    # Cells with no invocations on either architecture are not compared at all.
+    summary = summary.fillna({"faster": MISSING, "effect_size": MISSING, "significant": False})
+    summary["significant"] = summary["significant"].astype(bool)
+    summary = summary.join(tails if tails is not None else tail_summary(table, benchmarks), on=keys)
+    return summary
+
+
+def _per_run_type(summary, run_type):
+    selected = summary[summary["type"] == run_type].drop(columns="type")
+    return selected.reset_index(drop=True)
+
+
+def client_time_summaries(table, benchmarks=None, tails=None):
+    summary = summarize_metric(table, "client_time", benchmarks, tails)
+    return _per_run_type(summary, "cold"), _per_run_type(summary, "warm")
+
+
+def execution_time_summary(table, benchmarks=None, tails=None):
+    tails = tails if tails is not None else tail_summary(table, benchmarks)
+    return _per_run_type(summarize_metric(table[table["type"] == "warm"], "exec_time", benchmarks, tails), "warm")
+
+
+def cold_warm_ratio_summary(table, metric="client_time", benchmarks=None):
+    """Ratio of mean cold to mean warm `metric`, one row per benchmark and architecture with the
+    memory sizes in ascending order as "Memory Size 1..n". Missing cells stay NaN."""
+    selected = _select(table, benchmarks)
+    means = selected.groupby(["benchmark", "architecture", "memory", "type"], observed=True)[metric].mean()
+    means = means.unstack("type").reindex(columns=["cold", "warm"])
+    ratios = (means["cold"] / means["warm"]).rename("ratio").reset_index()
+
+    ratios["position"] = ratios.groupby("benchmark", observed=True)["memory"].rank(method="dense").astype(int)
+    wide = ratios.pivot_table(index=["benchmark", "architecture"], columns="position", values="ratio",
+                              observed=True, dropna=False)
+    wide.columns = [f"Memory Size {position}" for position in wide.columns]
+    wide = wide.reset_index().rename(columns={"benchmark": "Benchmark", "architecture": "Architecture"})
+    wide["Benchmark"] = wide["Benchmark"].astype(str)
+    wide["Architecture"] = wide["Architecture"].astype(str)
+    return wide.sort_values(["Benchmark", "Architecture"]).reset_index(drop=True)
+
+
+def write_summaries(table, perf_dir=PERF_DIR, benchmarks=None, include_mislabelled=False, exclude_outliers=False,
+                    outlier_method="mad"):
+    """Write every summary table under `perf_dir` and return their paths.
+
+    Invocations whose cold/warm label contradicts their container's lifecycle are listed in
+    perf/container_lifecycle and, unless `include_mislabelled` is set, left out of the summaries.
+    Concurrency is always reconstructed from every invocation, since each one occupied the provider.
+    Outliers within each cell are listed in perf/outliers and left out of the summaries when
+    `exclude_outliers` is set; noisy_cells.csv lists the cells whose summaries are still imprecise.
+    """
+    lifecycle = container_lifecycle(_select(table, benchmarks))
+    diagnostics = {
+        os.path.join(perf_dir, "container_lifecycle", "summary_container_lifecycle.csv"):
+            lifecycle_summary(lifecycle),
+        os.path.join(perf_dir, "container_lifecycle", "mislabelled_invocations.csv"):
+            mislabelled_invocations(lifecycle),
+        os.path.join(perf_dir, "concurrency", "summary_concurrency.csv"):
+            concurrency_summary(_select(table, benchmarks)),
+    }
+    if not include_mislabelled:
+        table = table[~mislabelled_mask(table, lifecycle)]
+
+    selected = _select(table, benchmarks)
+    annotations = annotate_outliers(selected, method=outlier_method)
+    diagnostics.update({
+        os.path.join(perf_dir, "outliers", "summary_outliers.csv"): outlier_summary(selected, annotations),
+        os.path.join(perf_dir, "outliers", "outlier_invocations.csv"): outlier_invocations(selected, annotations),
+    })
+    if exclude_outliers:
+        table = table.drop(index=annotations.index[annotations["outlier"]])
+    diagnostics[os.path.join(perf_dir, "outliers", "noisy_cells.csv")] = noisy_cells(_select(table, benchmarks))
+
+    tails = tail_summary(table, benchmarks)
+    summary_cold, summary_warm = client_time_summaries(table, benchmarks, tails)
+    decomposition = decomposition_summary(table, benchmarks)
+    throughput = io_throughput(table, benchmarks)
+    outputs = {
+        os.path.join(perf_dir, "client_times_combined", "summary_table_cold_runs.csv"): summary_cold,
+        os.path.join(perf_dir, "client_times_combined", "summary_table_warm_runs.csv"): summary_warm,
+        os.path.join(perf_dir, "exec_time_combined", "summary_execution_time_with_advantage.csv"):
+            execution_time_summary(table, benchmarks, tails),
+        os.path.join(perf_dir, "cold_start_ratios", "summary_cold_warm_ratio.csv"):
+            cold_warm_ratio_summary(table, benchmarks=benchmarks),
+        os.path.join(perf_dir, "latency_decomposition", "summary_latency_decomposition_cold.csv"):
+            _per_run_type(decomposition, "cold"),
+        os.path.join(perf_dir, "latency_decomposition", "summary_latency_decomposition_warm.csv"):
+            _per_run_type(decomposition, "warm"),
+        os.path.join(perf_dir, "latency_decomposition", "summary_handshake.csv"): handshake_summary(table, benchmarks),
+        os.path.join(perf_dir, "io_throughput", "summary_io_throughput.csv"): throughput_summary(throughput),
+        os.path.join(perf_dir, "io_throughput", "summary_io_memory_effect.csv"): memory_effect(throughput),
+        **diagnostics,
+    }
+    for path, summary in outputs.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        summary.to_csv(path, index=False)
+    return list(outputs)
+
+
+if __name__ == "__main__":
+    for path in write_summaries(get_invocation_table(PERF_DIR)):
+        print(f"Saved summary table: {path}")
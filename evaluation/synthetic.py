@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from evaluation.benchmarks import BENCHMARKS, MEMORY_SIZES
+from evaluation.invocation_table import ARCHITECTURES, RUN_TYPES, invocation_key
+
+SYNTHETIC_SEED = 0
+DEFAULT_INVOCATIONS = 50
+# Concurrent invocations per batch in config/*.json; warm invocations reuse this many containers.
+CONCURRENT_INVOCATIONS = 50
+# Start of the first generated experiment, in seconds since the epoch.
+EPOCH_START = 1730496900.0
+
+SEBS_ARCHITECTURES = {"arm": "arm64", "x86": "x86_64"}
+
+# Log-normal distribution given by its median and the standard deviation of its logarithm.
+Distribution = namedtuple("Distribution", ["median", "sigma"])
+
+# Value distributions of one benchmark at 1024 MB, warm, on x86. Times are in microseconds and
+# memory in MB. `benchmark_time` scales inversely with the memory size (Lambda assigns CPU in
+# proportion to memory), `cold_factor` multiplies it for cold starts and `arm_factor` for ARM.
+WorkloadProfile = namedtuple("WorkloadProfile", [
+    "benchmark_time", "provider_overhead", "client_overhead", "cold_init", "memory_used", "cold_factor",
+    "arm_factor"
+])
+
+DEFAULT_PROFILE = WorkloadProfile(
+    benchmark_time=Distribution(100000, 0.25),
+    provider_overhead=Distribution(2000, 0.5),
+    client_overhead=Distribution(250000, 0.3),
+    cold_init=Distribution(140000, 0.05),
+    memory_used=Distribution(50, 0.05),
+    cold_factor=4.0,
+    arm_factor=1.1,
+)
+
+# Fields of output.result.measurement reported by each benchmark, with object sizes in bytes.
+MEASUREMENTS = {
+    "120.uploader": {"download_size": 0, "upload_size": 235408},
+    "210.thumbnailer": {"download_size": 2907386, "upload_size": 3444},
+    "220.video-processing": {"download_size": 15350231, "upload_size": 592535},
+    "311.compression": {"download_size": 10063841, "upload_size": 9324800},
+    "501.graph-pagerank": {},
+}
+
+
+def _sample(rng, distribution, n, scale=1.0):
+    return rng.lognormal(np.log(distribution.median * scale), distribution.sigma, n)
+
+
+def _measurements(benchmark, benchmark_time, rng):
+    if benchmark not in MEASUREMENTS:
+        return [{} for _ in benchmark_time]
+
+    sizes = MEASUREMENTS[benchmark]
+    if not sizes:
+        generating = np.round(benchmark_time * rng.uniform(0.1, 0.3, len(benchmark_time)))
+        compute = np.round(benchmark_time * rng.uniform(0.02, 0.1, len(benchmark_time)))
+        return [{"measurement": {"compute_time": float(c), "graph_generating_time": float(g)}}
+                for c, g in zip(compute, generating)]
+
+    shares = rng.dirichlet([4, 2, 2], len(benchmark_time)) * benchmark_time[:, None]
+    return [
+        {"measurement": {
+            "compute_time": float(round(compute)),
+            "download_size": sizes["download_size"],
+            "download_time": float(round(download)) if sizes["download_size"] else 0,
+            "upload_size": sizes["upload_size"],
+            "upload_time": float(round(upload)),
+        }}
+        for compute, download, upload in shares
+    ]
+
+
+def generate_cell(benchmark, arch, memory, run_type, invocations, rng, profile=DEFAULT_PROFILE, start=EPOCH_START,
+                  warm_containers=None):
+    """SeBS processed records and result.csv rows for one (benchmark, arch, memory, run type) cell,
+    in the same order.
+
+    Warm invocations reuse `warm_containers` (the containers of the preceding cold run, as on a real
+    deployment) or, when not given, a fresh pool of CONCURRENT_INVOCATIONS containers.
+    """
+    cold = run_type == "cold"
+    scale = 1024 / memory * (profile.cold_factor if cold else 1.0) * (profile.arm_factor if arch == "arm" else 1.0)
+
+    benchmark_time = np.round(_sample(rng, profile.benchmark_time, invocations, scale))
+    initialization = np.round(_sample(rng, profile.cold_init, invocations)) if cold else np.zeros(invocations)
+    execution = benchmark_time + np.round(_sample(rng, profile.provider_overhead, invocations))
+    client = execution + initialization + np.round(_sample(rng, profile.client_overhead, invocations))
+    http_startup = _sample(rng, Distribution(0.3, 0.1), invocations)
+    memory_used = np.minimum(np.round(_sample(rng, profile.memory_used, invocations)), memory)
+    billed_time = np.ceil(execution / 1000).astype(int)
+
+    client_begin = start + np.cumsum(rng.uniform(0.0, 0.01, invocations))
+    function_begin = client_begin + http_startup
+    if cold:
+        containers = [rng.bytes(4).hex() for _ in range(invocations)]
+    else:
+        pool = warm_containers or [rng.bytes(4).hex() for _ in range(CONCURRENT_INVOCATIONS)]
+        containers = [pool[i] for i in rng.integers(0, len(pool), invocations)]
+
+    results = _measurements(benchmark, benchmark_time, rng)
+    request_ids = [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(invocations)]
+    # SeBS writes the records sorted by request id and result.csv in the same order.
+    order = sorted(range(invocations), key=request_ids.__getitem__)
+
+    records = {}
+    for i in order:
+        request_id = request_ids[i]
+        begin = function_begin[i] + initialization[i] / 1e6
+        records[request_id] = {
+            "billing": {"_billed_time": int(billed_time[i]), "_gb_seconds": int(billed_time[i]) * memory,
+                        "_memory": memory},
+            "output": {
+                "begin": f"{begin:.6f}",
+                "cold_start_var": "",
+                "container_id": containers[i],
+                "end": f"{begin + benchmark_time[i] / 1e6:.6f}",
+                "is_cold": cold,
+                "request_id": request_id,
+                "result": results[i],
+                "results_time": 0,
+            },
+            "provider_times": {"execution": int(execution[i]), "initialization": int(initialization[i])},
+            "request_id": request_id,
+            "stats": {"cold_start": cold, "failure": False, "memory_used": float(memory_used[i])},
+            "times": {
+                "benchmark": int(benchmark_time[i]),
+                "client": int(client[i]),
+                "client_begin": sebs_timestamp(client_begin[i]),
+                "client_end": sebs_timestamp(client_begin[i] + client[i] / 1e6),
+                "http_first_byte_return": round(float(client[i]) / 1e6, 6),
+                "http_startup": round(float(http_startup[i]), 6),
+                "initialization": 0,
+            },
+        }
+
+    rows = pd.DataFrame({
+        "memory": memory,
+        "type": run_type,
+        "is_cold": cold,
+        "exec_time": benchmark_time.astype(int),
+        "connection_time": np.round(http_startup, 6),
+        "client_time": client.astype(int),
+        "provider_time": execution.astype(int),
+        "mem_used": memory_used,
+    }).iloc[order]
+    return records, rows
+
+
+def sebs_timestamp(seconds):
+    """Format a Unix time like the client timestamps of SeBS results."""
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def sebs_experiment(benchmark, arch, records, begin_time, end_time):
+    """SeBS processed-results document holding `records` as the invocations of `benchmark` on `arch`."""
+    function = invocation_key(benchmark)
+    return {
+        "_invocations": {function: records},
+        "_metrics": {function: {}},
+        "begin_time": begin_time,
+        "config": {
+            "deployment": {"name": "aws", "region": "us-east-1"},
+            "experiments": {"architecture": SEBS_ARCHITECTURES[arch], "runtime": {"language": "python",
+                                                                                  "version": "3.8"}},
+        },
+        "end_time": end_time,
+        "result_bucket": None,
+        "statistics": {"cold_count": 0, "failures": [], "failures_count": 0, "incorrect": [], "incorrect_count": 0,
+                       "samples_generated": len(records)},
+    }
+
+
+def generate_results(output_root, benchmarks=None, memory_sizes=None, invocations=DEFAULT_INVOCATIONS,
+                     seed=SYNTHETIC_SEED, profiles=None):
+    """Write synthetic `cost/<benchmark>/<arch>/*-processed.json` and `perf/result_<arch>_<benchmark>.csv`
+    files under `output_root`, in the layout the evaluation scripts read.
+
+    `memory_sizes` maps benchmarks to the memory sizes to generate (default: MEMORY_SIZES), and
+    `profiles` maps benchmarks to their WorkloadProfile (default: DEFAULT_PROFILE).
+    """
+    benchmarks = list(BENCHMARKS) if benchmarks is None else list(benchmarks)
+    memory_sizes = memory_sizes or MEMORY_SIZES
+    profiles = profiles or {}
+    rng = np.random.default_rng(seed)
+    written = []
+
+    os.makedirs(os.path.join(output_root, "perf"), exist_ok=True)
+    for benchmark in benchmarks:
+        for arch in ARCHITECTURES:
+            cost_dir = os.path.join(output_root, "cost", benchmark, arch)
+            os.makedirs(cost_dir, exist_ok=True)
+            start = EPOCH_START
+            frames = []
+            for memory in memory_sizes[benchmark]:
+                containers = None
+                for run_type in RUN_TYPES:
+                    records, rows = generate_cell(benchmark, arch, memory, run_type, invocations, rng,
+                                                  profiles.get(benchmark, DEFAULT_PROFILE), start, containers)
+                    containers = [record["output"]["container_id"] for record in records.values()]
+                    end = start + invocations * 0.01 + 60
+                    path = os.path.join(cost_dir, f"{run_type}_results_{memory}-processed.json")
+                    with open(path, "w") as f:
+                        json.dump(sebs_experiment(benchmark, arch, records, start, end), f, indent=2, sort_keys=True)
+                    written.append(path)
+                    frames.append(rows)
+                    start = end
+
+            path = os.path.join(output_root, "perf", f"result_{arch}_{benchmark}.csv")
+            pd.concat(frames).to_csv(path, index=False)
+            written.append(path)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic SeBS perf-cost results.")
+    parser.add_argument("output_root", help="Directory the 'cost' and 'perf' results are written to")
+    parser.add_argument("--invocations", type=int, default=DEFAULT_INVOCATIONS,
+                        help="Invocations per memory size and run type")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to generate")
+    parser.add_argument("--memory-sizes", nargs="+", type=int,
+                        help="Memory sizes used for every benchmark instead of MEMORY_SIZES")
+    parser.add_argument("--seed", type=int, default=SYNTHETIC_SEED)
+    args = parser.parse_args()
+
+    memory_sizes = None
+    if args.memory_sizes:
+        memory_sizes = {benchmark: args.memory_sizes for benchmark in BENCHMARKS}
+    written = generate_results(args.output_root, args.benchmarks, memory_sizes, args.invocations, args.seed)
+    print(f"Wrote {len(written)} files under {args.output_root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation.benchmarks import MEMORY_SIZES
+from evaluation.invocation_table import get_invocation_table
+from evaluation.resampling import bootstrap_mean_ci, bootstrap_two_sample_ci
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(EVALUATION_DIR, "perf")
+
+# Benchmarks that move objects through storage and report their sizes and transfer times.
+IO_BENCHMARKS = ["120.uploader", "210.thumbnailer", "220.video-processing", "311.compression"]
+DIRECTIONS = ["download", "upload"]
+CELL_KEYS = ["benchmark", "architecture", "type", "memory", "direction"]
+SUMMARY_COLUMNS = CELL_KEYS + ["count", "mean_mbps", "ci_lower", "ci_upper", "median_mbps", "q25_mbps", "q75_mbps"]
+MEMORY_EFFECT_COLUMNS = ["benchmark", "architecture", "type", "direction", "smallest_memory", "largest_memory",
+                         "median_ratio", "ratio_ci_lower", "ratio_ci_upper", "spearman_rho", "memory_matters"]
+
+
+def io_throughput(table, benchmarks=None):
+    """One row per invocation and transfer direction with its throughput in MB/s (10^6 bytes per
+    second). Transfers without a size or time, such as 120.uploader's download, are left out."""
+    benchmarks = IO_BENCHMARKS if benchmarks is None else [b for b in IO_BENCHMARKS if b in benchmarks]
+    selected = table[table["benchmark"].isin(benchmarks)]
+
+    frames = []
+    for direction in DIRECTIONS:
+        size_column, time_column = f"measurement_{direction}_size", f"measurement_{direction}_time"
+        if size_column not in selected or time_column not in selected:
+            continue
+        size = selected[size_column].to_numpy(dtype=float)
+        seconds = selected[time_column].to_numpy(dtype=float) / 1e6
+        valid = (size > 0) & (seconds > 0)
+
+        frame = selected.loc[valid, ["benchmark", "architecture", "type", "memory"]].copy()
+        frame["direction"] = direction
+        frame["size_mb"] = size[valid] / 1e6
+        frame["throughput_mbps"] = size[valid] / 1e6 / seconds[valid]
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=CELL_KEYS + ["size_mb", "throughput_mbps"])
+    throughput = pd.concat(frames, ignore_index=True)
+    for column in ["benchmark", "architecture", "type"]:
+        throughput[column] = throughput[column].astype(str)
+    return throughput
+
+
+def throughput_summary(throughput):
+    """Mean (with bootstrap CI), median and quartiles of the throughput of every
+    (benchmark, architecture, type, memory, direction) cell."""
+    rows = []
+    for key, cell in throughput.groupby(CELL_KEYS, sort=True):
+        values = cell["throughput_mbps"].to_numpy()
+        mean, (lower, upper) = bootstrap_mean_ci(values)
+        q25, median, q75 = np.quantile(values, [0.25, 0.5, 0.75])
+        rows.append(dict(zip(CELL_KEYS, key), count=len(values), mean_mbps=mean, ci_lower=lower, ci_upper=upper,
+                         median_mbps=median, q25_mbps=q25, q75_mbps=q75))
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def memory_effect(throughput):
+    """Does the memory size change the achieved bandwidth? For every (benchmark, architecture,
+    type, direction), the ratio of median throughput at the largest to the smallest memory size
+    with its bootstrap CI, and the Spearman rank correlation of throughput with memory.
+
+    `memory_matters` is True when the ratio's CI excludes 1.
+    """
+    rows = []
+    for key, group in throughput.groupby(["benchmark", "architecture", "type", "direction"], sort=True):
+        memories = sorted(group["memory"].unique())
+        if len(memories) < 2:
+            continue
+        smallest = group.loc[group["memory"] == memories[0], "throughput_mbps"].to_numpy()
+        largest = group.loc[group["memory"] == memories[-1], "throughput_mbps"].to_numpy()
+        ratio, (lower, upper) = bootstrap_two_sample_ci(largest, smallest, center="median")
+        rows.append({
+            "benchmark": key[0], "architecture": key[1], "type": key[2], "direction": key[3],
+            "smallest_memory": memories[0], "largest_memory": memories[-1],
+            "median_ratio": ratio, "ratio_ci_lower": lower, "ratio_ci_upper": upper,
+            "spearman_rho": group["memory"].astype(float).corr(group["throughput_mbps"], method="spearman"),
+            "memory_matters": not lower <= 1 <= upper,
+        })
+    return pd.DataFrame(rows, columns=MEMORY_EFFECT_COLUMNS)
+
+
+def throughput_line_data(summary, benchmark, direction, architecture, run_type):
+    """Mean and CI per memory size of one line of the throughput figure, NaN where missing."""
+    selected = summary[(summary["benchmark"] == benchmark) & (summary["direction"] == direction) &
+                       (summary["architecture"] == architecture) & (summary["type"] == run_type)]
+    return selected.set_index("memory").reindex(MEMORY_SIZES[benchmark])
+
+
+if __name__ == "__main__":
+    pd.set_option("display.width", 200)
+    print(memory_effect(io_throughput(get_invocation_table(PERF_DIR))).to_string(index=False))
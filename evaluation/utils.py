@@ -1,5 +1,5 @@
-import json
 import os
+from functools import lru_cache
 
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
@@ -9,23 +9,13 @@ from matplotlib.offsetbox import AnchoredText
 from matplotlib.transforms import ScaledTranslation
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
-BENCHMARKS = {
-    "110.dynamic-html": "110_dynamic_html_python_3_8",
-    "120.uploader": "120_uploader_python_3_8",
-    "210.thumbnailer": "210_thumbnailer_python_3_8",
-    "220.video-processing": "220_video_processing_python_3_8",
-    "311.compression": "311_compression_python_3_8",
-    "501.graph-pagerank": "501_graph_pagerank_python_3_8"
-}
-
-MEMORY_SIZES = {
-    "110.dynamic-html": [128, 256, 512, 1024],
-    "120.uploader": [128, 256, 512, 1024],
-    "210.thumbnailer": [128, 256, 512, 1024],
-    "220.video-processing": [512, 1024, 2048, 4096],
-    "311.compression": [256, 512, 1024, 2048],
-    "501.graph-pagerank": [128, 256, 512, 1024]
-}
+from evaluation.benchmarks import BENCHMARKS, MEMORY_SIZES
+from evaluation.invocation_cache import load_invocation_columns
+from evaluation.invocation_table import get_invocation_table
+from evaluation.outliers import annotate_outliers
+from evaluation.pricing import compute_cost, default_pricing, total_cost
+from evaluation.resampling import BOOTSTRAP_SEED, CI_LEVEL, N_BOOTSTRAPS, bootstrap_mean_ci
+from evaluation.result_stream import iter_invocations
 
 LINE_COLORS = {
     "ARM cold": "#1f77b4",
@@ -34,12 +24,21 @@ LINE_COLORS = {
     "x86 warm": "#ffbb78"
 }
 
-ALPHABET_LABELS = [f"{chr(97 + i)})" for i in range(len(BENCHMARKS))]
+# Panel labels a) to z); figures can have more panels than benchmarks.
+ALPHABET_LABELS = [f"{chr(97 + i)})" for i in range(26)]
+
+STYLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scientific.mplstyle")
+
+# Cleared by batch renderers so that figures are only written to disk.
+SHOW_FIGURES = os.environ.get("EVALUATION_SHOW_FIGURES", "1") != "0"
 
-COST_MULTIPLIER_ARM = 0.0000133334
-COST_MULTIPLIER_X86 = 0.0000166667
-REQUEST_COST_TOTAL = 0.2048
+# Figures keep their .pdf names in the scripts; save_and_show_figure swaps in this format.
+FIGURE_FORMAT = os.environ.get("EVALUATION_FIGURE_FORMAT", "pdf")
+FIGURE_DPI = int(os.environ.get("EVALUATION_FIGURE_DPI", "300"))
 
+# Set together with --exclude-outliers, so that the figures leave out the outliers the summaries leave out.
+EXCLUDE_OUTLIERS = os.environ.get("EVALUATION_EXCLUDE_OUTLIERS", "0") != "0"
+OUTLIER_METHOD = os.environ.get("EVALUATION_OUTLIER_METHOD", "mad")
 
 def set_scientific_notation(ax, scilimits=(0, 0), dx=-70, dy=20):
     ax.yaxis.set_major_formatter(mticker.ScalarFormatter(useMathText=True))
@@ -75,20 +74,20 @@ def add_ggplot_title(ax, title, color="#d3d3d3", fontsize=20):
     return cax
 
 
-def calculate_cost_arm(gb_seconds):
-    return gb_seconds * COST_MULTIPLIER_ARM
+def calculate_cost_arm(gb_seconds, pricing=None):
+    return compute_cost(pricing or default_pricing(), "arm", gb_seconds)
 
 
-def calculate_cost_x86(gb_seconds):
-    return gb_seconds * COST_MULTIPLIER_X86
+def calculate_cost_x86(gb_seconds, pricing=None):
+    return compute_cost(pricing or default_pricing(), "x86", gb_seconds)
 
 
-def calculate_total_cost_arm(gb_seconds):
-    return gb_seconds * COST_MULTIPLIER_ARM + REQUEST_COST_TOTAL
+def calculate_total_cost_arm(gb_seconds, pricing=None):
+    return total_cost(pricing or default_pricing(), "arm", gb_seconds)
 
 
-def calculate_total_cost_x86(gb_seconds):
-    return gb_seconds * COST_MULTIPLIER_X86 + REQUEST_COST_TOTAL
+def calculate_total_cost_x86(gb_seconds, pricing=None):
+    return total_cost(pricing or default_pricing(), "x86", gb_seconds)
 
 
 def get_benchmark_files(benchmark_name, memory_sizes):
@@ -105,61 +104,83 @@ def get_benchmark_files(benchmark_name, memory_sizes):
     }
 
 
-def get_all_costs(file_path, invocation_key, is_arm, use_total_cost=False):
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+def get_all_costs(file_path, invocation_key, is_arm, use_total_cost=False, streaming=False, pricing=None,
+                  exclude_outliers=None):
+    """Price of every billed invocation in a processed results file. With `exclude_outliers` (by default
+    EXCLUDE_OUTLIERS), the invocations the figure invocation table flags as outliers are left out, matched
+    by request id."""
+    fields = ["billing._gb_seconds", "request_id"]
+    if streaming:
+        records = list(iter_invocations(file_path, invocation_key, fields=fields))
+        gb_seconds = np.fromiter((record["billing._gb_seconds"] for record in records), dtype=np.float64)
+        request_ids = np.array([record["request_id"] for record in records], dtype=object)
+    else:
+        columns = load_invocation_columns(file_path, invocation_key, fields)
+        gb_seconds = columns.get("billing._gb_seconds", np.empty(0))
+        request_ids = columns.get("request_id", np.empty(0, dtype=object))
+    billed = np.asarray(gb_seconds) > 0
+    if EXCLUDE_OUTLIERS if exclude_outliers is None else exclude_outliers:
+        # The processed files sit in <cost_dir>/<benchmark>/<arch>/, next to the result CSVs in <perf_dir>.
+        cost_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(file_path))))
+        outliers = _outlier_request_ids(os.path.join(os.path.dirname(cost_dir), "perf"), cost_dir, OUTLIER_METHOD)
+        billed &= ~np.isin(np.asarray(request_ids, dtype=object), list(outliers))
+    gb_seconds = np.asarray(gb_seconds[billed])
+
+    price = total_cost if use_total_cost else compute_cost
+    return price(pricing or default_pricing(), "arm" if is_arm else "x86", gb_seconds).tolist()
+
+
+def calculate_bootstrap_ci(data, n_bootstraps=N_BOOTSTRAPS, ci=CI_LEVEL, method="percentile", seed=BOOTSTRAP_SEED):
+    if not hasattr(data, '__len__') or len(data) < 2:
+        mean_val = np.mean(data) if hasattr(data, '__len__') and len(data) > 0 else 0
+        return mean_val, (mean_val, mean_val)
 
-    invocations = data['_invocations'].get(invocation_key, {})
-    costs = []
+    return bootstrap_mean_ci(data, n_bootstraps=n_bootstraps, ci=ci, method=method, seed=seed)
 
-    for invocation in invocations.values():
-        gb_seconds = invocation['billing']['_gb_seconds']
-        if gb_seconds > 0:
-            if use_total_cost:
-                cost = calculate_total_cost_arm(gb_seconds) if is_arm else calculate_total_cost_x86(gb_seconds)
-            else:
-                cost = calculate_cost_arm(gb_seconds) if is_arm else calculate_cost_x86(gb_seconds)
-            costs.append(cost)
-    return costs
 
+def setup_subplots(rows, cols):
+    fig, axes = plt.subplots(nrows=rows, ncols=cols)
+    return fig, axes.flatten()
 
-def calculate_bootstrap_ci(data, n_bootstraps=1000, ci=95):
-    if not hasattr(data, '__len__') or len(data) < 2:
-        mean_val = np.mean(data) if hasattr(data, '__len__') and len(data) > 0 else 0
-        return mean_val, (mean_val, mean_val)
 
-    data = np.asarray(data)
-    bootstrapped_means = np.array([
-        np.mean(np.random.choice(data, size=len(data), replace=True))
-        for _ in range(n_bootstraps)
-    ])
+@lru_cache(maxsize=None)
+def _outliers(perf_dir, cost_dir, outlier_method):
+    return annotate_outliers(get_invocation_table(perf_dir, cost_dir), method=outlier_method)["outlier"]
 
-    mean = np.mean(data)
-    lower_percentile = (100 - ci) / 2
-    upper_percentile = 100 - lower_percentile
 
-    ci_lower = np.percentile(bootstrapped_means, lower_percentile)
-    ci_upper = np.percentile(bootstrapped_means, upper_percentile)
+@lru_cache(maxsize=None)
+def _outlier_request_ids(perf_dir, cost_dir, outlier_method):
+    table = get_invocation_table(perf_dir, cost_dir)
+    return frozenset(table.loc[_outliers(perf_dir, cost_dir, outlier_method), "request_id"].dropna())
 
-    return mean, (ci_lower, ci_upper)
 
+@lru_cache(maxsize=None)
+def _figure_invocation_table(perf_dir, cost_dir, exclude_outliers, outlier_method):
+    table = get_invocation_table(perf_dir, cost_dir)
+    if not exclude_outliers:
+        return table
+    return table[~_outliers(perf_dir, cost_dir, outlier_method)]
 
-def setup_subplots(rows, cols):
-    fig, axes = plt.subplots(nrows=rows, ncols=cols)
-    return fig, axes.flatten()
 
+def figure_invocation_table(results_dir, cost_dir=None):
+    """The invocation table the figures are drawn from, without outliers when EXCLUDE_OUTLIERS is set.
 
-def load_benchmark_data(results_dir, benchmark):
-    data_arm = pd.read_csv(os.path.join(results_dir, f"result_arm_{benchmark}.csv"))
-    data_x86 = pd.read_csv(os.path.join(results_dir, f"result_x86_{benchmark}.csv"))
+    Callers must treat the returned frame as read-only.
+    """
+    # The processed SeBS results sit in the "cost" directory next to the result CSVs.
+    cost_dir = cost_dir or os.path.join(os.path.dirname(os.path.abspath(results_dir)), "cost")
+    return _figure_invocation_table(os.path.abspath(results_dir), os.path.abspath(cost_dir), EXCLUDE_OUTLIERS,
+                                    OUTLIER_METHOD)
 
-    data_arm.columns = data_arm.columns.str.strip()
-    data_x86.columns = data_x86.columns.str.strip()
 
-    data_arm["architecture"] = "ARM"
-    data_x86["architecture"] = "x86"
+def load_benchmark_data(results_dir, benchmark, cost_dir=None):
+    table = figure_invocation_table(results_dir, cost_dir)
+    data_combined = table[table["benchmark"] == benchmark].copy()
+    for column in ["benchmark", "architecture", "type"]:
+        data_combined[column] = data_combined[column].astype(str)
+    # Aggregate in double precision, as the scripts did when reading the CSVs directly.
+    data_combined["mem_used"] = data_combined["mem_used"].astype("float64")
 
-    data_combined = pd.concat([data_arm, data_x86])
     data_combined["label"] = data_combined["architecture"] + " " + data_combined["type"]
 
     return data_combined
@@ -192,7 +213,9 @@ def load_csv_data(file_path, data_type):
 
 
 def save_and_show_figure(fig, filename):
+    filename = f"{os.path.splitext(filename)[0]}.{FIGURE_FORMAT}"
     fig.tight_layout()
-    fig.savefig(filename, dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.savefig(filename, dpi=FIGURE_DPI, bbox_inches='tight')
+    if SHOW_FIGURES:
+        plt.show()
     plt.close(fig)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from evaluation.pricing import MB_MS_PER_GB_SECOND, PricingModel, compute_cost, total_cost
+
+# One reported invocation per MB-millisecond makes each _gb_seconds value one GB-second of the month.
+MODEL = PricingModel(
+    region="test",
+    tiers={"arm": (np.array([100.0, 300.0, np.inf]), np.array([3.0, 2.0, 1.0]))},
+    request_price=0.5,
+    reported_invocations=MB_MS_PER_GB_SECOND,
+)
+
+
+def test_first_tier():
+    assert compute_cost(MODEL, "arm", 40.0) == pytest.approx(120.0)
+    assert compute_cost(MODEL, "arm", 100.0) == pytest.approx(300.0)
+
+
+def test_usage_at_a_bound_is_billed_in_the_next_tier():
+    assert compute_cost(MODEL, "arm", 10.0, monthly_gb_seconds=100.0) == pytest.approx(20.0)
+    assert compute_cost(MODEL, "arm", 10.0, monthly_gb_seconds=300.0) == pytest.approx(10.0)
+
+
+def test_block_straddling_tiers():
+    # 50 GB-seconds at 3, 200 at 2 and 50 at 1.
+    costs = compute_cost(MODEL, "arm", np.array([100.0, 200.0]), monthly_gb_seconds=50.0)
+    assert costs.sum() == pytest.approx(600.0)
+    assert costs[1] == pytest.approx(2 * costs[0])
+
+
+def test_costs_do_not_depend_on_order():
+    gb_seconds = np.array([250.0, 10.0, 60.0, 5.0])
+    costs = compute_cost(MODEL, "arm", gb_seconds, monthly_gb_seconds=20.0)
+    np.testing.assert_allclose(compute_cost(MODEL, "arm", gb_seconds[::-1], monthly_gb_seconds=20.0), costs[::-1])
+
+
+def test_shape_is_kept():
+    assert np.ndim(compute_cost(MODEL, "arm", 40.0)) == 0
+    costs = compute_cost(MODEL, "arm", np.full((2, 3), 50.0))
+    assert costs.shape == (2, 3)
+    assert costs.sum() == pytest.approx(100 * 3 + 200 * 2)
+    assert compute_cost(MODEL, "arm", np.array([])).shape == (0,)
+
+
+def test_total_cost_adds_request_fee_of_reported_invocations():
+    assert total_cost(MODEL, "arm", 40.0) == pytest.approx(120.0 + 0.5 * MB_MS_PER_GB_SECOND)
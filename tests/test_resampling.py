@@ -0,0 +1,43 @@
+import numpy as np
+
+from evaluation.resampling import bootstrap_mean_ci, bootstrap_two_sample_ci
+
+SAMPLE = np.random.default_rng(0).lognormal(size=200)
+OTHER = np.random.default_rng(1).lognormal(size=150)
+
+
+def test_same_seed_gives_same_interval():
+    assert bootstrap_mean_ci(SAMPLE, seed=7) == bootstrap_mean_ci(SAMPLE, seed=7)
+    assert bootstrap_two_sample_ci(SAMPLE, OTHER, seed=7) == bootstrap_two_sample_ci(SAMPLE, OTHER, seed=7)
+
+
+def test_different_seeds_give_different_intervals():
+    assert bootstrap_mean_ci(SAMPLE, seed=7)[1] != bootstrap_mean_ci(SAMPLE, seed=8)[1]
+
+
+def test_interval_does_not_depend_on_chunk_size():
+    expected = bootstrap_mean_ci(SAMPLE, method="bca")
+    for max_chunk_elements in [1, len(SAMPLE) - 1, 3 * len(SAMPLE) + 1]:
+        assert bootstrap_mean_ci(SAMPLE, method="bca", max_chunk_elements=max_chunk_elements) == expected
+
+    expected = bootstrap_two_sample_ci(SAMPLE, OTHER, center="median")
+    assert bootstrap_two_sample_ci(SAMPLE, OTHER, center="median", max_chunk_elements=1) == expected
+
+
+def test_interval_contains_estimate():
+    mean, (lower, upper) = bootstrap_mean_ci(SAMPLE)
+    assert mean == SAMPLE.mean()
+    assert lower < mean < upper
+
+    ratio, (lower, upper) = bootstrap_two_sample_ci(SAMPLE, OTHER)
+    assert ratio == SAMPLE.mean() / OTHER.mean()
+    assert lower < ratio < upper
+
+
+def test_empty_sample_gives_nan():
+    mean, (lower, upper) = bootstrap_mean_ci([])
+    assert np.isnan([mean, lower, upper]).all()
+
+    for data1, data2 in [([], OTHER), (SAMPLE, [])]:
+        estimate, (lower, upper) = bootstrap_two_sample_ci(data1, data2)
+        assert np.isnan([estimate, lower, upper]).all()
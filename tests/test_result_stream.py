@@ -0,0 +1,35 @@
+import json
+import os
+
+import pytest
+
+from evaluation.result_stream import iter_invocation_items, iter_invocations
+
+EVALUATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "evaluation")
+PROCESSED = os.path.join(EVALUATION_DIR, "cost", "110.dynamic-html", "arm", "warm_results_128-processed.json")
+
+
+def _loaded():
+    with open(PROCESSED, "r") as f:
+        return json.load(f)["_invocations"]
+
+
+@pytest.mark.parametrize("chunk_size", [7, 4096, 1 << 16])
+def test_items_match_json_load(chunk_size):
+    expected = [(function, request_id, record) for function, records in _loaded().items()
+                for request_id, record in records.items()]
+    assert list(iter_invocation_items(PROCESSED, chunk_size=chunk_size)) == expected
+
+
+def test_fields_and_invocation_key():
+    invocations = _loaded()
+    function = next(iter(invocations))
+    fields = ["billing._gb_seconds", "times.client", "output.missing"]
+
+    stats = {}
+    streamed = list(iter_invocations(PROCESSED, function, fields, stats=stats))
+    assert streamed == [{"billing._gb_seconds": record["billing"]["_gb_seconds"],
+                         "times.client": record["times"]["client"], "output.missing": None}
+                        for record in invocations[function].values()]
+    assert stats["invocations"] == len(streamed)
+    assert list(iter_invocations(PROCESSED, "no-such-function")) == []
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from evaluation.significance import benjamini_hochberg, holm, mann_whitney, permutation_test
+
+
+def test_mann_whitney_matches_reference():
+    # Reference values from scipy.stats.mannwhitneyu(..., method="asymptotic").
+    assert mann_whitney([1, 2, 3], [4, 5, 6]) == pytest.approx((0.0, 0.08085559837005224))
+    assert mann_whitney([1, 2, 2, 5, 7], [2, 3, 4, 6, 8, 9]) == pytest.approx((8.0, 0.23104548827151294))
+
+
+def test_mann_whitney_identical_samples():
+    assert mann_whitney([3, 3, 3], [3, 3]) == (3.0, 1.0)
+
+
+def test_permutation_test_approximates_exact_p_value():
+    # Two of the six labellings of {1, 2, 3, 4} into pairs are as extreme as the observed one.
+    assert permutation_test([1, 2], [3, 4]) == pytest.approx(1 / 3, abs=0.02)
+
+
+def test_permutation_test_bounds():
+    assert permutation_test([5, 5, 5], [5, 5, 5]) == 1.0
+    p = permutation_test(np.arange(20), np.arange(100, 120), n_permutations=999)
+    assert p == 1 / 1000
+
+
+def test_holm():
+    np.testing.assert_allclose(holm([0.01, 0.04, 0.03]), [0.03, 0.06, 0.06])
+    np.testing.assert_allclose(holm([0.01, np.nan, 0.04]), [0.02, np.nan, 0.04])
+    np.testing.assert_allclose(holm([0.6, 0.5]), [1.0, 1.0])
+
+
+def test_benjamini_hochberg():
+    np.testing.assert_allclose(benjamini_hochberg([0.01, 0.04, 0.03]), [0.03, 0.04, 0.04])
+    np.testing.assert_allclose(benjamini_hochberg([0.01, np.nan, 0.04]), [0.02, np.nan, 0.04])